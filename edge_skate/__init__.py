@@ -1,5 +1,5 @@
 """EdgeSkate package implementing README-described pipeline."""
 
-from .pipeline import EdgeSkatePipeline, PipelineConfig, SessionArtifacts
+from .pipeline import BatchReport, EdgeSkatePipeline, PipelineConfig, SessionArtifacts, SourceResult
 
-__all__ = ["EdgeSkatePipeline", "PipelineConfig", "SessionArtifacts"]
+__all__ = ["BatchReport", "EdgeSkatePipeline", "PipelineConfig", "SessionArtifacts", "SourceResult"]
@@ -0,0 +1,267 @@
+"""Reproducible stage benchmarks over synthetic frames.
+
+Run ``python -m edge_skate.benchmark --output bench.json`` to time every
+pipeline stage on generated gradients, noise, line art and photo-like frames,
+then ``--compare bench.json`` on a later run to flag slowdowns beyond a
+threshold.  Frames are generated from fixed seeds so runs are comparable.
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import math
+import platform
+import random
+import sys
+import tempfile
+import time
+from array import array
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from . import export, physics, rendering
+from .media import FrameBuffer
+from .pipeline import BACKENDS, EdgeSkatePipeline, PipelineConfig, as_rows
+
+SIZES: Dict[str, Tuple[int, int]] = {
+    "128": (128, 128),
+    "256": (256, 256),
+    "512": (512, 512),
+    "720p": (720, 1280),
+    "1080p": (1080, 1920),
+    "4k": (2160, 3840),
+}
+DEFAULT_SIZES = ("128", "512", "1080p")
+
+
+def gradient_frame(height: int, width: int, *, seed: int = 0) -> FrameBuffer:
+    """Diagonal ramp: smooth everywhere, so few edges survive."""
+
+    span = max(1, height + width - 2)
+    return _frame(height, width, lambda y, x: (x + y) / span)
+
+
+def noise_frame(height: int, width: int, *, seed: int = 0) -> FrameBuffer:
+    """Uniform white noise: the worst case for edge and component counts."""
+
+    rng = random.Random(seed)
+    data = array("f", (rng.random() for _ in range(height * width)))
+    return FrameBuffer(data, (height, width))
+
+
+def line_art_frame(height: int, width: int, *, seed: int = 0) -> FrameBuffer:
+    """Thin random lines and circles on a blank background."""
+
+    rng = random.Random(seed)
+    data = array("f", bytes(4 * height * width))
+    scale = max(height, width)
+    for _ in range(12):
+        x0, y0 = rng.uniform(0, width - 1), rng.uniform(0, height - 1)
+        x1, y1 = rng.uniform(0, width - 1), rng.uniform(0, height - 1)
+        steps = int(max(abs(x1 - x0), abs(y1 - y0))) + 1
+        for step in range(steps + 1):
+            t = step / steps
+            data[int(y0 + (y1 - y0) * t) * width + int(x0 + (x1 - x0) * t)] = 1.0
+    for _ in range(4):
+        cx, cy = rng.uniform(0, width - 1), rng.uniform(0, height - 1)
+        radius = rng.uniform(0.05, 0.2) * scale
+        steps = int(2 * math.pi * radius) + 1
+        for step in range(steps):
+            angle = 2 * math.pi * step / steps
+            x = int(cx + radius * math.cos(angle))
+            y = int(cy + radius * math.sin(angle))
+            if 0 <= x < width and 0 <= y < height:
+                data[y * width + x] = 1.0
+    return FrameBuffer(data, (height, width))
+
+
+def photo_frame(height: int, width: int, *, seed: int = 0) -> FrameBuffer:
+    """Smooth blobs with mild sensor noise, standing in for a large photo."""
+
+    rng = random.Random(seed)
+    waves = [(rng.uniform(1, 6), rng.uniform(1, 6), rng.uniform(0, math.tau)) for _ in range(4)]
+    column_terms = [[math.sin(fx * x / width * math.tau + phase) for x in range(width)] for fx, _, phase in waves]
+    row_terms = [[math.cos(fy * y / height * math.tau) for y in range(height)] for _, fy, _ in waves]
+    data = array("f")
+    for y in range(height):
+        rows = [(cols, terms[y]) for cols, terms in zip(column_terms, row_terms)]
+        data.extend(
+            sum(cols[x] * weight for cols, weight in rows) + rng.gauss(0.0, 0.05) for x in range(width)
+        )
+    return FrameBuffer(data, (height, width))
+
+
+def _frame(height: int, width: int, sample: Callable[[int, int], float]) -> FrameBuffer:
+    data = array("f", (sample(y, x) for y in range(height) for x in range(width)))
+    return FrameBuffer(data, (height, width))
+
+
+GENERATORS: Dict[str, Callable[..., FrameBuffer]] = {
+    "gradient": gradient_frame,
+    "noise": noise_frame,
+    "line_art": line_art_frame,
+    "photo": photo_frame,
+}
+
+
+@dataclass
+class BenchmarkResult:
+    case: str
+    stage: str
+    best: float
+    mean: float
+    repeat: int
+
+
+@dataclass
+class Regression:
+    case: str
+    stage: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else math.inf
+
+
+def run_benchmarks(
+    *,
+    generators: Sequence[str] = tuple(GENERATORS),
+    sizes: Sequence[str] = DEFAULT_SIZES,
+    config: PipelineConfig | None = None,
+    repeat: int = 3,
+    seed: int = 0,
+) -> List[BenchmarkResult]:
+    """Time each stage and the end-to-end pipeline on every generated frame."""
+
+    results: List[BenchmarkResult] = []
+    with tempfile.TemporaryDirectory() as scratch:
+        config = dataclasses.replace(config or PipelineConfig(), output_dir=Path(scratch))
+        pipeline = EdgeSkatePipeline(config)
+        writer = export.DirectoryWriter(Path(scratch))
+        for generator in generators:
+            for size in sizes:
+                height, width = SIZES[size]
+                frame = GENERATORS[generator](height, width, seed=seed)
+                case = f"{generator}-{size}"
+                for stage, func in _stage_calls(frame, config, pipeline, writer):
+                    results.append(_time(case, stage, func, repeat))
+    return results
+
+
+def compare(
+    current: Iterable[BenchmarkResult], baseline: Iterable[BenchmarkResult], *, threshold: float
+) -> List[Regression]:
+    """Return the stages whose best time grew by more than ``threshold`` (a fraction)."""
+
+    reference = {(result.case, result.stage): result.best for result in baseline}
+    regressions = []
+    for result in current:
+        before = reference.get((result.case, result.stage))
+        if before is not None and result.best > before * (1.0 + threshold):
+            regressions.append(Regression(result.case, result.stage, before, result.best))
+    return regressions
+
+
+def write_results(path: Path, results: Sequence[BenchmarkResult], *, repeat: int) -> None:
+    payload = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "repeat": repeat,
+        },
+        "results": [asdict(result) for result in results],
+    }
+    Path(path).write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
+def read_results(path: Path) -> List[BenchmarkResult]:
+    payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    return [BenchmarkResult(**entry) for entry in payload["results"]]
+
+
+def _stage_calls(
+    frame: FrameBuffer,
+    config: PipelineConfig,
+    pipeline: EdgeSkatePipeline,
+    writer: export.DirectoryWriter,
+) -> Iterable[Tuple[str, Callable[[], object]]]:
+    # Each stage is timed on the output of the previous one, computed once
+    # outside the timed region, using the configured backend.
+    preprocessed = pipeline.preprocess(frame)
+    detected = pipeline.detect_edges(preprocessed)
+    processed, edges = as_rows(preprocessed), as_rows(detected)
+    course = pipeline.build_course(edges)
+    simulation = physics.simulate_run(
+        course, base_speed=config.base_speed, trick_interval=config.trick_interval, frame_rate=config.frame_rate
+    )
+    overlay = rendering.render_overlay(processed, simulation.path)
+    yield "preprocess", lambda: pipeline.preprocess(frame)
+    yield "edges", lambda: pipeline.detect_edges(preprocessed)
+    yield "course", lambda: pipeline.build_course(edges)
+    yield "simulate", lambda: physics.simulate_run(
+        course, base_speed=config.base_speed, trick_interval=config.trick_interval, frame_rate=config.frame_rate
+    )
+    # A fresh copy of the frame defeats the renderer's background cache.
+    yield "render", lambda: rendering.render_overlay([list(row) for row in processed], simulation.path)
+    yield "export", lambda: export.export_session(
+        writer, "bench", processed, edges, course, simulation, overlay, format=config.export_format
+    )
+    yield "end_to_end", lambda: pipeline.export_session(pipeline.process_frame(frame), "bench_e2e")
+
+
+def _time(case: str, stage: str, func: Callable[[], object], repeat: int) -> BenchmarkResult:
+    timings = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return BenchmarkResult(
+        case=case, stage=stage, best=min(timings), mean=sum(timings) / len(timings), repeat=len(timings)
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark EdgeSkate pipeline stages on synthetic frames")
+    parser.add_argument("--generators", nargs="+", choices=tuple(GENERATORS), default=list(GENERATORS))
+    parser.add_argument("--sizes", nargs="+", choices=tuple(SIZES), default=list(DEFAULT_SIZES))
+    parser.add_argument("--resolution", type=int, nargs=2, metavar=("H", "W"), default=(128, 128))
+    parser.add_argument("--backend", choices=BACKENDS, default="python")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None, help="Write results as JSON")
+    parser.add_argument("--compare", type=Path, default=None, help="Baseline JSON to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="Allowed slowdown as a fraction (0.1 = 10%%)"
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    config = PipelineConfig(target_resolution=(args.resolution[0], args.resolution[1]), backend=args.backend)
+    results = run_benchmarks(
+        generators=args.generators, sizes=args.sizes, config=config, repeat=args.repeat, seed=args.seed
+    )
+    for result in results:
+        print(f"{result.case:<18}{result.stage:<12}{result.best:>10.4f}s")
+    if args.output is not None:
+        write_results(args.output, results, repeat=args.repeat)
+    if args.compare is None:
+        return 0
+    regressions = compare(results, read_results(args.compare), threshold=args.threshold)
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression.case} {regression.stage}: "
+            f"{regression.baseline:.4f}s -> {regression.current:.4f}s ({regression.ratio:.2f}x)",
+            file=sys.stderr,
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
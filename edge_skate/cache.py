@@ -0,0 +1,124 @@
+"""Content-addressed cache for intermediate pipeline stage outputs."""
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple, TypeVar
+
+T = TypeVar("T")
+
+_CHUNK_SIZE = 1 << 20
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for one pipeline stage."""
+
+    hits: int = 0
+    misses: int = 0
+
+
+def source_key(path: Path) -> str:
+    """Hash the bytes of a media source."""
+
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as handle:
+        for chunk in iter(lambda: handle.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def stage_key(parent: str, stage: str, *fields: Any) -> str:
+    """Derive a stage key from its upstream key and the config fields it reads."""
+
+    digest = hashlib.sha256()
+    digest.update(parent.encode("utf-8"))
+    digest.update(stage.encode("utf-8"))
+    digest.update(repr(fields).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class StageCache:
+    """LRU cache of stage outputs, optionally backed by a directory on disk.
+
+    Entries are addressed by ``(stage, key)`` where keys come from
+    :func:`source_key` and :func:`stage_key`, so a changed config field only
+    invalidates the stages that depend on it.  Cached values are shared, not
+    copied; callers must not mutate them.
+    """
+
+    def __init__(self, *, max_entries: int = 64, directory: Path | None = None) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.directory = Path(directory) if directory is not None else None
+        self._entries: OrderedDict[Tuple[str, str], Any] = OrderedDict()
+        self._stats: Dict[str, CacheStats] = {}
+
+    def fetch(self, stage: str, key: str, compute: Callable[[], T]) -> T:
+        """Return the cached value for ``(stage, key)``, computing it on a miss."""
+
+        stats = self._stats.setdefault(stage, CacheStats())
+        entry = (stage, key)
+        if entry in self._entries:
+            self._entries.move_to_end(entry)
+            stats.hits += 1
+            return self._entries[entry]
+        found, value = self._load(stage, key)
+        if found:
+            stats.hits += 1
+        else:
+            stats.misses += 1
+            value = compute()
+            self._store(stage, key, value)
+        self._remember(entry, value)
+        return value
+
+    def stats(self) -> Dict[str, CacheStats]:
+        return {stage: CacheStats(stats.hits, stats.misses) for stage, stats in self._stats.items()}
+
+    def clear(self) -> None:
+        """Drop in-memory entries; on-disk entries are kept."""
+
+        self._entries.clear()
+
+    def _remember(self, entry: Tuple[str, str], value: Any) -> None:
+        self._entries[entry] = value
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, stage: str, key: str) -> Path:
+        assert self.directory is not None
+        return self.directory / stage / f"{key}.pickle"
+
+    def _load(self, stage: str, key: str) -> Tuple[bool, Any]:
+        if self.directory is None:
+            return False, None
+        path = self._path(stage, key)
+        try:
+            with path.open("rb") as handle:
+                return True, pickle.load(handle)
+        except FileNotFoundError:
+            return False, None
+        except (OSError, pickle.UnpicklingError, EOFError):
+            # A corrupt entry is treated as a miss and overwritten.
+            return False, None
+
+    def _store(self, stage: str, key: str, value: Any) -> None:
+        if self.directory is None:
+            return
+        path = self._path(stage, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                pickle.dump(value, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
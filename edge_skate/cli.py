@@ -2,39 +2,152 @@
 from __future__ import annotations
 
 import argparse
+import sys
 from pathlib import Path
 
-from .pipeline import EdgeSkatePipeline, PipelineConfig
+from .course_graph import COURSE_STRATEGIES
+from .edge_detection import EDGE_MODES
+from .export import EXPORT_FORMATS
+from .pipeline import BACKENDS, BatchReport, EdgeSkatePipeline, PipelineConfig
+from .preprocessing import RESAMPLE_MODES
+from .profiling import STAGES, format_summary
+from .service import main as serve_main
+from .sweep import main as sweep_main
+
+# Recognised only as the first argument; a source with one of these names is
+# given after "--" (or as ./sweep).
+SUBCOMMANDS = {"sweep": sweep_main, "serve": serve_main}
 
 
 def build_parser() -> argparse.ArgumentParser:
-    parser = argparse.ArgumentParser(description="Run the EdgeSkate prototype pipeline")
+    parser = argparse.ArgumentParser(
+        description="Run the EdgeSkate prototype pipeline",
+        epilog=(
+            "Run 'sweep --help' for parameter sweeps over preprocessing, edge and course settings, "
+            "or 'serve --help' for a long-running job service.  A source named like a "
+            "subcommand must follow '--'."
+        ),
+    )
     parser.add_argument("sources", nargs="+", type=Path, help="JSON files describing grayscale frames")
     parser.add_argument("--output", type=Path, default=PipelineConfig.output_dir, help="Directory for exports")
     parser.add_argument("--resolution", type=int, nargs=2, metavar=("H", "W"), default=(128, 128))
     parser.add_argument("--denoise", type=float, default=0.25)
+    parser.add_argument(
+        "--resample", choices=RESAMPLE_MODES, default="nearest", help="Downscaling method"
+    )
+    parser.add_argument(
+        "--edge-mode",
+        choices=EDGE_MODES,
+        default="sobel",
+        help="'canny' thins edges and picks its own thresholds (--threshold applies to sobel only)",
+    )
     parser.add_argument("--threshold", type=float, default=0.25)
     parser.add_argument("--smoothing", type=float, default=0.5)
-    parser.add_argument("--speed", type=float, default=2.0)
-    parser.add_argument("--trick-interval", type=int, default=15)
+    parser.add_argument(
+        "--spacing", type=float, default=None, help="Resample the course to this arc-length spacing in pixels"
+    )
+    parser.add_argument(
+        "--course-strategy",
+        choices=COURSE_STRATEGIES,
+        default="largest",
+        help="Follow the largest edge component or route across all of them",
+    )
+    parser.add_argument(
+        "--speed", type=float, default=PipelineConfig.base_speed, help="Base rider speed in pixels per second"
+    )
+    parser.add_argument("--trick-interval", type=int, default=15, help="Samples between trick events")
+    parser.add_argument(
+        "--frame-rate", type=float, default=PipelineConfig.frame_rate, help="Simulation samples per second"
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Treat each source as a frame sequence (directory or .jsonl) and export every frame",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="With --stream, reuse edge and component work between consecutive frames",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Process pool size for batch runs")
+    parser.add_argument(
+        "--edge-workers", type=int, default=1, help="Pool size for tiled edge detection, shared by every frame"
+    )
+    parser.add_argument(
+        "--cache-dir", type=Path, default=None, help="Persist preprocessing, edge and course results between runs"
+    )
+    parser.add_argument(
+        "--export-format", choices=EXPORT_FORMATS, default="binary", help="Session layout written to disk"
+    )
+    parser.add_argument(
+        "--export-queue",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Write sessions in the background with up to N pending (0 writes synchronously)",
+    )
+    parser.add_argument("--profile", action="store_true", help="Print a per-stage timing summary")
+    parser.add_argument(
+        "--profile-memory", action="store_true", help="Also trace peak memory per stage (slower)"
+    )
+    parser.add_argument("--cprofile", choices=STAGES, default=None, help="Run one stage under cProfile")
+    parser.add_argument(
+        "--cprofile-output", type=Path, default=None, help="cProfile stats file (default: OUTPUT/STAGE.prof)"
+    )
+    parser.add_argument("--backend", choices=BACKENDS, default="python", help="Frame-processing backend")
     return parser
 
 
 def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in SUBCOMMANDS:
+        return SUBCOMMANDS[argv[0]](argv[1:])
     parser = build_parser()
     args = parser.parse_args(argv)
     config = PipelineConfig(
         target_resolution=(args.resolution[0], args.resolution[1]),
         denoise_strength=args.denoise,
+        resample=args.resample,
+        edge_mode=args.edge_mode,
         edge_threshold=args.threshold,
         smoothing_factor=args.smoothing,
+        course_spacing=args.spacing,
+        course_strategy=args.course_strategy,
         base_speed=args.speed,
         trick_interval=args.trick_interval,
+        frame_rate=args.frame_rate,
         output_dir=args.output,
+        backend=args.backend,
+        edge_workers=args.edge_workers,
+        cache_dir=args.cache_dir,
+        export_format=args.export_format,
+        export_queue=args.export_queue,
+        profile=args.profile,
+        profile_memory=args.profile_memory,
+        cprofile_stage=args.cprofile,
+        cprofile_output=args.cprofile_output,
     )
-    pipeline = EdgeSkatePipeline(config)
-    pipeline.batch_run(args.sources)
-    return 0
+    with EdgeSkatePipeline(config) as pipeline:
+        if args.stream:
+            clips = [
+                pipeline.stream_run(source, export_name=f"session_{idx:02d}", incremental=args.incremental)
+                for idx, source in enumerate(args.sources)
+            ]
+            for source, clip in zip(args.sources, clips):
+                reuse = clip.mean_reuse()
+                if reuse is not None:
+                    print(
+                        f"{source}: {len(clip)} frames, skipped {reuse.edge_tiles_skipped:.1%} of edge tiles "
+                        f"and {reuse.component_pixels_skipped:.1%} of component pixels"
+                    )
+            report = BatchReport(results=[result for clip in clips for result in clip.results])
+        else:
+            report = pipeline.batch_run(args.sources, workers=args.workers)
+    for failure in report.failures:
+        print(f"{failure.source}: {failure.error}", file=sys.stderr)
+    if args.profile or args.profile_memory:
+        print(format_summary(report.stage_totals()))
+    return 1 if report.failures else 0
 
 
 if __name__ == "__main__":
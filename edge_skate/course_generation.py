@@ -1,8 +1,11 @@
 """Generate a rideable course from extracted edges."""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Sequence, Tuple
+import math
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Set, Tuple, overload
 
 Matrix = List[List[float]]
 Point = Tuple[float, float]
@@ -12,78 +15,705 @@ def _distance(a: Point, b: Point) -> float:
     return ((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2) ** 0.5
 
 
+class PointBuffer(Sequence[Point]):
+    """Points stored as interleaved ``float32`` x/y pairs.
+
+    Indexing and iteration produce ``(x, y)`` tuples and slices produce new
+    buffers, so a buffer stands in for a list of points at 8 bytes per point
+    instead of a tuple and two float objects.  Any buffer of ``float32``
+    samples can be wrapped without copying (see :meth:`wrap`).  Comparing
+    with a list or tuple of points rounds those points to ``float32`` first,
+    so a buffer equals the points it was built from even when they are not
+    exactly representable.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, points: Iterable[Point] = ()) -> None:
+        self.data: Any = array("f", (value for point in points for value in point))
+
+    @classmethod
+    def wrap(cls, data: Any) -> PointBuffer:
+        """Use ``data`` (an ``array('f')`` or a memoryview cast to ``'f'``) directly."""
+
+        if len(data) % 2:
+            raise ValueError("interleaved point data must have an even length")
+        buffer = cls.__new__(cls)
+        buffer.data = data
+        return buffer
+
+    def __len__(self) -> int:
+        return len(self.data) // 2
+
+    @overload
+    def __getitem__(self, index: int) -> Point: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> PointBuffer: ...
+
+    def __getitem__(self, index: int | slice) -> Point | PointBuffer:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return PointBuffer.wrap(array("f", self.data[2 * start : 2 * max(start, stop)]))
+            return PointBuffer(self[idx] for idx in range(start, stop, step))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("point index out of range")
+        return (self.data[2 * index], self.data[2 * index + 1])
+
+    def __iter__(self) -> Iterator[Point]:
+        data = self.data
+        return zip(data[0::2], data[1::2])
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PointBuffer):
+            return self.data == other.data
+        if isinstance(other, (list, tuple)):
+            if len(self) != len(other):
+                return False
+            try:
+                rounded = array("f", (value for point in other for value in point))
+            except TypeError:
+                return False
+            return len(rounded) == len(self.data) and self.data == rounded
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"PointBuffer({list(self)!r})"
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (PointBuffer.wrap, (array("f", self.data),))
+
+    def tolist(self) -> List[Point]:
+        return list(self)
+
+
+def _as_point_buffer(points: Iterable[Point]) -> PointBuffer:
+    return points if isinstance(points, PointBuffer) else PointBuffer(points)
+
+
+def _polyline_length(points: PointBuffer) -> float:
+    data = points.data
+    xs, ys = data[0::2], data[1::2]
+    return sum(math.hypot(x1 - x0, y1 - y0) for x0, y0, x1, y1 in zip(xs, ys, xs[1:], ys[1:]))
+
+
 @dataclass
 class Course:
-    points: List[Point]
+    """A course polyline; ``points`` may be given as any iterable of points."""
+
+    points: PointBuffer
+    _index: PointGrid | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.points = _as_point_buffer(self.points)
 
     def length(self) -> float:
-        if len(self.points) < 2:
-            return 0.0
-        return sum(_distance(a, b) for a, b in zip(self.points[:-1], self.points[1:]))
+        return _polyline_length(self.points)
+
+    def index(self) -> PointGrid:
+        """Spatial index over the course, built on first use.
+
+        The index is cached on the course, so ``points`` must not be
+        mutated afterwards.
+        """
+
+        if self._index is None:
+            self._index = PointGrid(self.points)
+        return self._index
+
+
+class PointGrid:
+    """Uniform grid over a polyline's points and segments.
+
+    Point ``i`` is stored in the cell containing it and segment ``i`` (from
+    point ``i`` to ``i + 1``) in every cell its bounding box overlaps.  With
+    the default cell size, about one point lands in each occupied cell, so
+    nearest-point, radius and segment queries only visit the cells near the
+    query instead of scanning the whole course.
+    """
+
+    def __init__(self, points: Sequence[Point], *, cell_size: float | None = None) -> None:
+        self.points = points if isinstance(points, (list, PointBuffer)) else list(points)
+        if cell_size is None:
+            cell_size = _default_cell_size(self.points)
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        self._segment_cells: Dict[Tuple[int, int], List[int]] = {}
+        xs = [x for x, _ in self.points] or [0.0]
+        ys = [y for _, y in self.points] or [0.0]
+        self._bounds = (min(xs), min(ys), max(xs), max(ys))
+        for idx, point in enumerate(self.points):
+            self._cells.setdefault(self._cell(point), []).append(idx)
+        for idx, (a, b) in enumerate(zip(self.points[:-1], self.points[1:])):
+            for cell in self._cells_between(a, b):
+                self._segment_cells.setdefault(cell, []).append(idx)
+
+    def nearest(self, point: Point) -> int | None:
+        """Index of the point closest to ``point`` (lowest index on ties)."""
 
+        if not self.points:
+            return None
+        # Rings are searched around the query clamped into the bounding box;
+        # no point inside the box is closer to the query than to its clamp.
+        min_x, min_y, max_x, max_y = self._bounds
+        clamped = (min(max(point[0], min_x), max_x), min(max(point[1], min_y), max_y))
+        cx, cy = self._cell(clamped)
+        max_ring = max(
+            self._cell((max_x, max_y))[0] - self._cell((min_x, min_y))[0],
+            self._cell((max_x, max_y))[1] - self._cell((min_x, min_y))[1],
+        )
+        offset = _distance(point, clamped) ** 2
+        best, best_distance = len(self.points), math.inf
+        for ring in range(max_ring + 1):
+            for cell in _ring(cx, cy, ring):
+                for idx in self._cells.get(cell, ()):
+                    distance = _distance(point, self.points[idx])
+                    if (distance, idx) < (best_distance, best):
+                        best, best_distance = idx, distance
+            # Points beyond this ring are at least ``ring`` cells from the clamp.
+            if best_distance**2 < (ring * self.cell_size) ** 2 + offset:
+                break
+        return best
 
-def generate_course(edge_map: Matrix, *, smoothing: float) -> Course:
-    candidates = _largest_component(edge_map)
-    if not candidates:
+    def within(self, point: Point, radius: float) -> List[int]:
+        """Indices of points within ``radius`` of ``point``, in course order."""
+
+        x, y = point
+        cells = self._cells_between((x - radius, y - radius), (x + radius, y + radius))
+        return sorted(
+            idx for cell in cells for idx in self._cells.get(cell, ()) if _distance(point, self.points[idx]) <= radius
+        )
+
+    def crossing(self, a: Point, b: Point) -> List[int]:
+        """Indices of course segments that intersect the segment ``a``-``b``."""
+
+        hits: Set[int] = set()
+        for cell in self._cells_between(a, b):
+            for idx in self._segment_cells.get(cell, ()):
+                if idx not in hits and _segments_intersect(a, b, self.points[idx], self.points[idx + 1]):
+                    hits.add(idx)
+        return sorted(hits)
+
+    def _cell(self, point: Point) -> Tuple[int, int]:
+        return (math.floor(point[0] / self.cell_size), math.floor(point[1] / self.cell_size))
+
+    def _cells_between(self, a: Point, b: Point) -> Iterator[Tuple[int, int]]:
+        """Cells overlapping the bounding box of ``a`` and ``b``, clipped to the course."""
+
+        min_x, min_y, max_x, max_y = self._bounds
+        x0, y0 = self._cell((max(min(a[0], b[0]), min_x), max(min(a[1], b[1]), min_y)))
+        x1, y1 = self._cell((min(max(a[0], b[0]), max_x), min(max(a[1], b[1]), max_y)))
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                yield (cx, cy)
+
+
+def _default_cell_size(points: Sequence[Point]) -> float:
+    if len(points) < 2:
+        return 1.0
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    area = (max(xs) - min(xs)) * (max(ys) - min(ys))
+    mean_step = sum(_distance(a, b) for a, b in zip(points[:-1], points[1:])) / (len(points) - 1)
+    return max(mean_step, math.sqrt(area / len(points)), 1e-6)
+
+
+def _ring(cx: int, cy: int, ring: int) -> Iterator[Tuple[int, int]]:
+    if ring == 0:
+        yield (cx, cy)
+        return
+    for dx in range(-ring, ring + 1):
+        yield (cx + dx, cy - ring)
+        yield (cx + dx, cy + ring)
+    for dy in range(-ring + 1, ring):
+        yield (cx - ring, cy + dy)
+        yield (cx + ring, cy + dy)
+
+
+def _segments_intersect(a: Point, b: Point, c: Point, d: Point) -> bool:
+    d1, d2 = _orientation(c, d, a), _orientation(c, d, b)
+    d3, d4 = _orientation(a, b, c), _orientation(a, b, d)
+    if ((d1 > 0 > d2) or (d1 < 0 < d2)) and ((d3 > 0 > d4) or (d3 < 0 < d4)):
+        return True
+    return (
+        (d1 == 0 and _in_box(c, d, a))
+        or (d2 == 0 and _in_box(c, d, b))
+        or (d3 == 0 and _in_box(a, b, c))
+        or (d4 == 0 and _in_box(a, b, d))
+    )
+
+
+def _orientation(p: Point, q: Point, r: Point) -> float:
+    return (q[0] - p[0]) * (r[1] - p[1]) - (q[1] - p[1]) * (r[0] - p[0])
+
+
+def _in_box(p: Point, q: Point, r: Point) -> bool:
+    return min(p[0], q[0]) <= r[0] <= max(p[0], q[0]) and min(p[1], q[1]) <= r[1] <= max(p[1], q[1])
+
+
+def generate_course(
+    edge_map: Matrix,
+    *,
+    smoothing: float,
+    spacing: float | None = None,
+    components: ComponentTable | None = None,
+) -> Course:
+    """Build a course from the largest edge component.
+
+    Pass ``components`` to reuse a table from :func:`label_components`
+    instead of labelling ``edge_map`` again, and ``spacing`` to normalize
+    point density with :func:`resample_path`.
+    """
+
+    table = components if components is not None else label_components(edge_map)
+    candidates = table.largest.points() if table.largest is not None else []
+    return course_from_component(candidates, smoothing=smoothing, spacing=spacing)
+
+
+def course_from_component(
+    candidates: Sequence[Point], *, smoothing: float, spacing: float | None = None
+) -> Course:
+    return course_from_path(order_points(candidates), smoothing=smoothing, spacing=spacing)
+
+
+def course_from_path(ordered: Sequence[Point], *, smoothing: float, spacing: float | None = None) -> Course:
+    """Smooth an ordered polyline (and resample it when ``spacing`` is set) into a course."""
+
+    if not ordered:
         return Course(points=[])
-    ordered = _order_points(candidates)
     smoothed = _smooth_path(ordered, smoothing)
+    if spacing:
+        smoothed = resample_path(smoothed, spacing)
     return Course(points=smoothed)
 
 
+Run = Tuple[int, int, int]
+
+
+@dataclass
+class Component:
+    """An 8-connected edge component stored as row runs ``(y, x_start, x_end)``."""
+
+    label: int
+    size: int
+    bbox: Tuple[int, int, int, int]
+    runs: List[Run]
+
+    def points(self) -> List[Point]:
+        return [(float(x), float(y)) for y, x0, x1 in self.runs for x in range(x0, x1)]
+
+
+@dataclass
+class ComponentTable:
+    """All components of an edge map in scan order, plus the largest one."""
+
+    components: List[Component]
+    largest: Component | None
+
+
+def label_components(edge_map: Matrix) -> ComponentTable:
+    """Label 8-connected components with a two-pass run-length union-find.
+
+    The first pass splits each row into runs of edge pixels and unions runs
+    that touch a run on the previous row.  The second pass folds runs into
+    their root component, accumulating size and bounding box (min x, min y,
+    max x, max y) and picking the largest component as it goes.  Roots are
+    the smallest label in each set, so components come out in the order a
+    row-major scan first meets them and ties for largest go to the earliest.
+    """
+
+    parent: List[int] = []
+    runs: List[Run] = []
+    previous: List[Tuple[int, int, int]] = []
+    for y, row in enumerate(edge_map):
+        current: List[Tuple[int, int, int]] = []
+        for x0, x1 in _row_runs(row):
+            label = len(parent)
+            parent.append(label)
+            runs.append((y, x0, x1))
+            current.append((x0, x1, label))
+        _union_touching(parent, previous, current)
+        previous = current
+
+    grouped: Dict[int, Component] = {}
+    for label, (y, x0, x1) in enumerate(runs):
+        root = find_root(parent, label)
+        component = grouped.get(root)
+        if component is None:
+            grouped[root] = Component(label=root, size=x1 - x0, bbox=(x0, y, x1 - 1, y), runs=[(y, x0, x1)])
+            continue
+        min_x, min_y, max_x, _ = component.bbox
+        component.size += x1 - x0
+        component.bbox = (min(min_x, x0), min_y, max(max_x, x1 - 1), y)
+        component.runs.append((y, x0, x1))
+
+    largest: Component | None = None
+    for component in grouped.values():
+        if largest is None or component.size > largest.size:
+            largest = component
+    return ComponentTable(components=list(grouped.values()), largest=largest)
+
+
+def _row_runs(row: Sequence[float]) -> List[Tuple[int, int]]:
+    result: List[Tuple[int, int]] = []
+    start = -1
+    for x, value in enumerate(row):
+        if value > 0:
+            if start < 0:
+                start = x
+        elif start >= 0:
+            result.append((start, x))
+            start = -1
+    if start >= 0:
+        result.append((start, len(row)))
+    return result
+
+
+def _union_touching(
+    parent: List[int], previous: List[Tuple[int, int, int]], current: List[Tuple[int, int, int]]
+) -> None:
+    # Runs are sorted, so a two-pointer sweep finds every 8-connected pair:
+    # runs touch when they overlap after widening by one pixel.
+    i = j = 0
+    while i < len(previous) and j < len(current):
+        px0, px1, plabel = previous[i]
+        cx0, cx1, clabel = current[j]
+        if px0 <= cx1 and cx0 <= px1:
+            _union(parent, plabel, clabel)
+        if px1 < cx1:
+            i += 1
+        else:
+            j += 1
+
+
+def find_root(parent: List[int], label: int) -> int:
+    while parent[label] != label:
+        parent[label] = parent[parent[label]]
+        label = parent[label]
+    return label
+
+
+def _union(parent: List[int], a: int, b: int) -> None:
+    root_a = find_root(parent, a)
+    root_b = find_root(parent, b)
+    if root_a < root_b:
+        parent[root_b] = root_a
+    elif root_b < root_a:
+        parent[root_a] = root_b
+
+
 def _largest_component(edge_map: Matrix) -> List[Point]:
-    rows = len(edge_map)
-    cols = len(edge_map[0]) if edge_map else 0
-    visited = [[False for _ in range(cols)] for _ in range(rows)]
-    best: List[Point] = []
-    for y in range(rows):
-        for x in range(cols):
-            if edge_map[y][x] <= 0 or visited[y][x]:
+    largest = label_components(edge_map).largest
+    return largest.points() if largest is not None else []
+
+
+class IncrementalComponentTracker:
+    """Track 8-connected edge components across consecutive edge maps.
+
+    Only components touching pixels that changed since the previous map are
+    relabelled; the rest keep their labels.  :meth:`update` returns the same
+    component as :func:`_largest_component`.
+    """
+
+    def __init__(self) -> None:
+        self.pixels_total = 0
+        self.pixels_relabelled = 0
+        self._edge_map: Matrix | None = None
+        self._labels: List[List[int]] = []
+        self._components: Dict[int, List[Tuple[int, int]]] = {}
+        self._next_label = 1
+
+    @property
+    def skipped_fraction(self) -> float:
+        """Fraction of edge pixels whose labels were reused in the last update."""
+
+        if not self.pixels_total:
+            return 0.0
+        return 1.0 - self.pixels_relabelled / self.pixels_total
+
+    def update(self, edge_map: Matrix) -> List[Point]:
+        rows = len(edge_map)
+        cols = len(edge_map[0]) if edge_map else 0
+        previous = self._edge_map
+        self._edge_map = edge_map
+        if previous is None or len(previous) != rows or (previous and len(previous[0]) != cols):
+            self._labels = [[0] * cols for _ in range(rows)]
+            self._components = {}
+            seeds = [(y, x) for y in range(rows) for x in range(cols)]
+        else:
+            changed = [
+                (y, x)
+                for y in range(rows)
+                if previous[y] is not edge_map[y] and previous[y] != edge_map[y]
+                for x in range(cols)
+                if previous[y][x] != edge_map[y][x]
+            ]
+            seeds = self._release(changed, rows, cols)
+        self.pixels_relabelled = self._relabel(edge_map, seeds)
+        self.pixels_total = sum(len(pixels) for pixels in self._components.values())
+        return self._largest()
+
+    def _release(self, changed: List[Tuple[int, int]], rows: int, cols: int) -> List[Tuple[int, int]]:
+        affected: Set[int] = set()
+        for cy, cx in changed:
+            for ny in range(max(0, cy - 1), min(rows - 1, cy + 1) + 1):
+                for nx in range(max(0, cx - 1), min(cols - 1, cx + 1) + 1):
+                    label = self._labels[ny][nx]
+                    if label:
+                        affected.add(label)
+        seeds = list(changed)
+        for label in affected:
+            for y, x in self._components.pop(label):
+                self._labels[y][x] = 0
+                seeds.append((y, x))
+        return seeds
+
+    def _relabel(self, edge_map: Matrix, seeds: List[Tuple[int, int]]) -> int:
+        rows = len(edge_map)
+        cols = len(edge_map[0]) if edge_map else 0
+        labels = self._labels
+        relabelled = 0
+        for sy, sx in seeds:
+            if edge_map[sy][sx] <= 0 or labels[sy][sx]:
                 continue
-            stack = [(y, x)]
-            visited[y][x] = True
-            component: List[Point] = []
+            label = self._next_label
+            self._next_label += 1
+            labels[sy][sx] = label
+            stack = [(sy, sx)]
+            pixels: List[Tuple[int, int]] = []
             while stack:
                 cy, cx = stack.pop()
-                component.append((float(cx), float(cy)))
+                pixels.append((cy, cx))
                 for ny in range(max(0, cy - 1), min(rows - 1, cy + 1) + 1):
                     for nx in range(max(0, cx - 1), min(cols - 1, cx + 1) + 1):
-                        if visited[ny][nx] or edge_map[ny][nx] <= 0:
+                        if labels[ny][nx] or edge_map[ny][nx] <= 0:
                             continue
-                        visited[ny][nx] = True
+                        labels[ny][nx] = label
                         stack.append((ny, nx))
-            if len(component) > len(best):
-                best = component
-    return best
+            self._components[label] = pixels
+            relabelled += len(pixels)
+        return relabelled
+
+    def _largest(self) -> List[Point]:
+        if not self._components:
+            return []
+        # Ties go to the component found first in row-major order, as in the
+        # full scan.  Point order does not matter: order_points walks the
+        # component from its first pixel regardless.
+        best = max(self._components.values(), key=lambda pixels: (len(pixels), _negated(min(pixels))))
+        return [(float(x), float(y)) for y, x in best]
 
 
-def _order_points(points: Sequence[Point]) -> List[Point]:
+def _negated(pixel: Tuple[int, int]) -> Tuple[int, int]:
+    return (-pixel[0], -pixel[1])
+
+
+def order_points(points: Sequence[Point]) -> List[Point]:
+    """Order a component's pixels into a polyline along its longest walk.
+
+    Two breadth-first passes over the 8-connected pixels find the
+    component's geodesic diameter; the path between its ends is the
+    skeleton-like spine returned.  Off-spine pixels are dropped, so the
+    polyline is both shorter and free of the zig-zags an angular sort
+    produces on non-convex shapes.  The walk starts from the first pixel in
+    row-major order, making the result independent of the input order.
+
+    A component enclosing a hole (a closed contour) has no two ends to walk
+    between, and its diameter covers only half of the loop.  If the loop
+    around its largest hole is longer than the spine, that loop is traced
+    once around instead and returned closed, ending on its first point.
+    """
+
     if not points:
         return []
-    cx = sum(p[0] for p in points) / len(points)
-    cy = sum(p[1] for p in points) / len(points)
-    points_with_angle = [((p[0], p[1]), _angle(p[0] - cx, p[1] - cy)) for p in points]
-    points_with_angle.sort(key=lambda item: item[1])
-    return [point for point, _ in points_with_angle]
+    pixels = {(int(p[1]), int(p[0])) for p in points}
+    far_end, _ = _farthest_pixel(pixels, min(pixels))
+    start, parents = _farthest_pixel(pixels, far_end)
+    spine: List[Point] = []
+    node: Tuple[int, int] | None = start
+    while node is not None:
+        spine.append((float(node[1]), float(node[0])))
+        node = parents[node]
+    if _hole_count(pixels) == 0:
+        return spine
+    loop = _trace_loop(pixels)
+    return loop if _path_length(loop) > _path_length(spine) else spine
+
+
+# Clockwise 8-neighbourhood (y down) starting west, for boundary tracing.
+_CLOCKWISE = ((0, -1), (-1, -1), (-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1))
+
+
+def _hole_count(pixels: Set[Tuple[int, int]]) -> int:
+    """Holes in an 8-connected component, from its Euler number.
+
+    Counting the 2x2 windows that touch the component gives the Euler
+    number (components minus holes) in time linear in its size.
+    """
+
+    windows = {(y + dy, x + dx) for y, x in pixels for dy in (-1, 0) for dx in (-1, 0)}
+    singles = triples = diagonals = 0
+    for y, x in windows:
+        corners = ((y, x) in pixels, (y, x + 1) in pixels, (y + 1, x) in pixels, (y + 1, x + 1) in pixels)
+        count = sum(corners)
+        if count == 1:
+            singles += 1
+        elif count == 3:
+            triples += 1
+        elif count == 2 and corners[0] == corners[3]:
+            diagonals += 1
+    return 1 - (singles - triples - 2 * diagonals) // 4
+
+
+def _trace_loop(pixels: Set[Tuple[int, int]]) -> List[Point]:
+    """Component pixels bordering its largest hole, in one walk around it."""
+
+    ys = [y for y, _ in pixels]
+    xs = [x for _, x in pixels]
+    top, bottom, left, right = min(ys) - 1, max(ys) + 1, min(xs) - 1, max(xs) + 1
+    outside = _fill_background(pixels, (top, left), (top, bottom, left, right))
+    holes: List[Set[Tuple[int, int]]] = []
+    seen = set(outside)
+    for y in range(top, bottom + 1):
+        for x in range(left, right + 1):
+            if (y, x) not in pixels and (y, x) not in seen:
+                hole = _fill_background(pixels, (y, x), (top, bottom, left, right))
+                seen |= hole
+                holes.append(hole)
+    rim = [(float(x), float(y)) for y, x in _trace_boundary(max(holes, key=len), pixels)]
+    return rim + rim[:1]
+
 
+def _fill_background(
+    pixels: Set[Tuple[int, int]], seed: Tuple[int, int], bounds: Tuple[int, int, int, int]
+) -> Set[Tuple[int, int]]:
+    """4-connected background region containing ``seed`` within ``bounds``."""
 
-def _angle(x: float, y: float) -> float:
-    import math
+    top, bottom, left, right = bounds
+    region = {seed}
+    queue = deque([seed])
+    while queue:
+        cy, cx = queue.popleft()
+        for dy, dx in _NEIGHBOURS[:4]:
+            neighbour = (cy + dy, cx + dx)
+            if (
+                top <= neighbour[0] <= bottom
+                and left <= neighbour[1] <= right
+                and neighbour not in pixels
+                and neighbour not in region
+            ):
+                region.add(neighbour)
+                queue.append(neighbour)
+    return region
 
-    return math.atan2(y, x)
+
+def _trace_boundary(region: Set[Tuple[int, int]], rim: Set[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Pixels of ``rim`` around a region, in one clockwise Moore-neighbour trace.
+
+    The trace walks the region's boundary from its first pixel; the
+    edge-adjacent neighbours each step sweeps past on the outside are the
+    bordering pixels, collected in the order they are passed.
+    """
+
+    start = min(region)
+    current, back = start, 0
+    passed: List[Tuple[int, int]] = []
+    seen: Set[Tuple[int, int]] = set()
+    # Jacob's criterion: stop on re-entering the start from the same side.
+    for _ in range(8 * len(region) + 8):
+        for turn in range(1, 9):
+            side = (back + turn - 1) % 8
+            outside = (current[0] + _CLOCKWISE[side][0], current[1] + _CLOCKWISE[side][1])
+            # Only edge-adjacent neighbours, so the rim steps diagonally round corners.
+            if side % 2 == 0 and outside in rim and outside not in seen:
+                seen.add(outside)
+                passed.append(outside)
+            dy, dx = _CLOCKWISE[(back + turn) % 8]
+            following = (current[0] + dy, current[1] + dx)
+            if following in region:
+                break
+        else:
+            return passed
+        py, px = _CLOCKWISE[(back + turn - 1) % 8]
+        back = _CLOCKWISE.index((current[0] + py - following[0], current[1] + px - following[1]))
+        current = following
+        if current == start and back == 0:
+            break
+    return passed
+
+
+def _path_length(points: Sequence[Point]) -> float:
+    return sum(_distance(a, b) for a, b in zip(points[:-1], points[1:]))
+
+
+_NEIGHBOURS = ((0, 1), (1, 0), (0, -1), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+def _farthest_pixel(
+    pixels: Set[Tuple[int, int]], start: Tuple[int, int]
+) -> Tuple[Tuple[int, int], Dict[Tuple[int, int], Tuple[int, int] | None]]:
+    parents: Dict[Tuple[int, int], Tuple[int, int] | None] = {start: None}
+    queue = deque([start])
+    last = start
+    while queue:
+        last = queue.popleft()
+        cy, cx = last
+        for dy, dx in _NEIGHBOURS:
+            neighbour = (cy + dy, cx + dx)
+            if neighbour in pixels and neighbour not in parents:
+                parents[neighbour] = last
+                queue.append(neighbour)
+    return last, parents
 
 
 def _smooth_path(points: Sequence[Point], smoothing: float) -> List[Point]:
+    """Moving-average smoothing in O(n) using prefix sums; endpoints stay fixed."""
+
     if len(points) < 3:
         return list(points)
     window = max(2, int(round(3 * smoothing)))
+    prefix_x = [0.0]
+    prefix_y = [0.0]
+    for x, y in points:
+        prefix_x.append(prefix_x[-1] + x)
+        prefix_y.append(prefix_y[-1] + y)
     smoothed: List[Point] = [points[0]]
     for idx in range(1, len(points) - 1):
         start = max(0, idx - window)
         end = min(len(points), idx + window + 1)
-        segment = points[start:end]
-        avg_x = sum(p[0] for p in segment) / len(segment)
-        avg_y = sum(p[1] for p in segment) / len(segment)
-        smoothed.append((avg_x, avg_y))
+        count = end - start
+        smoothed.append(((prefix_x[end] - prefix_x[start]) / count, (prefix_y[end] - prefix_y[start]) / count))
     smoothed.append(points[-1])
     return smoothed
+
+
+def resample_path(points: Sequence[Point], spacing: float) -> List[Point]:
+    """Resample a polyline at a fixed arc-length ``spacing``.
+
+    Points are placed every ``spacing`` units along the path by linear
+    interpolation, and the final point is always kept, so the output size
+    depends on the path length rather than on how many pixels produced it.
+    """
+
+    if spacing <= 0:
+        raise ValueError("spacing must be positive")
+    if len(points) < 2:
+        return list(points)
+    resampled: List[Point] = [points[0]]
+    travelled = 0.0
+    target = spacing
+    for a, b in zip(points[:-1], points[1:]):
+        segment = _distance(a, b)
+        while segment > 0 and target <= travelled + segment:
+            t = (target - travelled) / segment
+            resampled.append((a[0] + (b[0] - a[0]) * t, a[1] + (b[1] - a[1]) * t))
+            target += spacing
+        travelled += segment
+    if _distance(resampled[-1], points[-1]) > 1e-9:
+        resampled.append(points[-1])
+    return resampled
@@ -0,0 +1,228 @@
+"""Course graph over every edge component, with linear-time route selection.
+
+Each component large enough to ride is reduced to its spine (see
+:func:`course_generation.order_points`), which becomes a graph edge between
+two endpoint nodes.  Endpoints of different spines that lie within
+``bridge_distance`` of each other are found through a :class:`PointGrid` and
+joined shortest-first, Kruskal style, only when they connect separate
+trees.  The graph therefore stays a forest, and the best route is a
+weighted tree diameter found with two depth-first passes per tree.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+from .course_generation import (
+    ComponentTable,
+    Course,
+    Matrix,
+    Point,
+    PointGrid,
+    course_from_path,
+    find_root,
+    generate_course,
+    label_components,
+    order_points,
+)
+
+COURSE_STRATEGIES = ("largest", "longest", "smoothest")
+
+
+@dataclass
+class GraphEdge:
+    """A spine (``spine`` is its index) or a bridge (``spine`` is ``None``).
+
+    ``length`` is the ridden distance and ``smooth_weight`` the length
+    discounted by how much the spine turns; bridges count as length only.
+    """
+
+    a: int
+    b: int
+    length: float
+    smooth_weight: float
+    spine: int | None = None
+
+
+@dataclass
+class CourseGraph:
+    """Spines and bridges; node ``2 * k`` and ``2 * k + 1`` are the ends of spine ``k``."""
+
+    spines: List[List[Point]]
+    edges: List[GraphEdge]
+
+    def node_point(self, node: int) -> Point:
+        spine = self.spines[node // 2]
+        return spine[0] if node % 2 == 0 else spine[-1]
+
+    def route(self, strategy: str = "longest") -> List[Point]:
+        """Polyline of the heaviest path in the graph.
+
+        ``longest`` maximises ridden length; ``smoothest`` favours long,
+        straight spines and treats bridges as free jumps.
+        """
+
+        if strategy not in ("longest", "smoothest"):
+            raise ValueError(f"Unknown route strategy {strategy!r}")
+        if not self.spines:
+            return []
+        adjacency: List[List[Tuple[int, float, GraphEdge]]] = [[] for _ in range(2 * len(self.spines))]
+        for edge in self.edges:
+            weight = edge.length if strategy == "longest" else edge.smooth_weight
+            adjacency[edge.a].append((edge.b, weight, edge))
+            adjacency[edge.b].append((edge.a, weight, edge))
+        best: Tuple[float, List[Tuple[int, GraphEdge | None]]] = (-1.0, [])
+        visited = [False] * len(adjacency)
+        for root in range(len(adjacency)):
+            if visited[root]:
+                continue
+            far, _, _ = _farthest(adjacency, root, visited)
+            end, distance, parents = _farthest(adjacency, far, None)
+            if distance > best[0]:
+                best = (distance, _walk(parents, end))
+        return self._polyline(best[1])
+
+    def _polyline(self, steps: List[Tuple[int, GraphEdge | None]]) -> List[Point]:
+        start = steps[0][0]
+        points = [self.node_point(start)]
+        previous = start
+        for node, edge in steps[1:]:
+            assert edge is not None
+            if edge.spine is None:
+                points.append(self.node_point(node))
+            else:
+                spine = self.spines[edge.spine]
+                points.extend(spine[1:] if previous % 2 == 0 else spine[-2::-1])
+            previous = node
+        return points
+
+
+def build_course_graph(
+    components: ComponentTable, *, bridge_distance: float = 4.0, min_size: int = 4
+) -> CourseGraph:
+    """Graph the spines of every component with at least ``min_size`` pixels.
+
+    The largest component is always included, so a non-empty table never
+    yields an empty graph.
+    """
+
+    spines = [
+        order_points(component.points())
+        for component in components.components
+        if component.size >= min_size or component is components.largest
+    ]
+    edges = [
+        GraphEdge(
+            a=2 * idx, b=2 * idx + 1, length=_length(spine), smooth_weight=_smooth_weight(spine), spine=idx
+        )
+        for idx, spine in enumerate(spines)
+    ]
+    parent = list(range(2 * len(spines)))
+    for edge in edges:
+        parent[find_root(parent, edge.b)] = find_root(parent, edge.a)
+    graph = CourseGraph(spines=spines, edges=edges)
+    for gap, a, b in _bridge_candidates(graph, bridge_distance):
+        root_a, root_b = find_root(parent, a), find_root(parent, b)
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+            edges.append(GraphEdge(a=a, b=b, length=gap, smooth_weight=0.0))
+    return graph
+
+
+def build_course(
+    edge_map: Matrix,
+    *,
+    strategy: str = "largest",
+    smoothing: float,
+    spacing: float | None = None,
+    components: ComponentTable | None = None,
+    bridge_distance: float = 4.0,
+) -> Course:
+    """Build a course with one of :data:`COURSE_STRATEGIES`.
+
+    ``largest`` keeps the spine of the largest component; the graph
+    strategies route across every component via :func:`build_course_graph`.
+    """
+
+    if strategy not in COURSE_STRATEGIES:
+        raise ValueError(f"Unknown course strategy {strategy!r}; expected one of {COURSE_STRATEGIES}")
+    if strategy == "largest":
+        return generate_course(edge_map, smoothing=smoothing, spacing=spacing, components=components)
+    table = components if components is not None else label_components(edge_map)
+    route = build_course_graph(table, bridge_distance=bridge_distance).route(strategy)
+    return course_from_path(route, smoothing=smoothing, spacing=spacing)
+
+
+def _bridge_candidates(graph: CourseGraph, bridge_distance: float) -> List[Tuple[float, int, int]]:
+    """Endpoint pairs on different spines within ``bridge_distance``, shortest first."""
+
+    if bridge_distance <= 0:
+        return []
+    endpoints = [graph.node_point(node) for node in range(2 * len(graph.spines))]
+    grid = PointGrid(endpoints, cell_size=bridge_distance)
+    candidates = [
+        (math.dist(point, endpoints[other]), node, other)
+        for node, point in enumerate(endpoints)
+        for other in grid.within(point, bridge_distance)
+        if other > node and other // 2 != node // 2
+    ]
+    candidates.sort()
+    return candidates
+
+
+def _farthest(
+    adjacency: List[List[Tuple[int, float, GraphEdge]]], start: int, visited: List[bool] | None
+) -> Tuple[int, float, Dict[int, Tuple[int, GraphEdge] | None]]:
+    # Iterative DFS over a tree; ties keep the first node reached.
+    parents: Dict[int, Tuple[int, GraphEdge] | None] = {start: None}
+    distances = {start: 0.0}
+    far, far_distance = start, 0.0
+    stack = [start]
+    while stack:
+        node = stack.pop()
+        if visited is not None:
+            visited[node] = True
+        for neighbour, weight, edge in adjacency[node]:
+            if neighbour in parents:
+                continue
+            parents[neighbour] = (node, edge)
+            distances[neighbour] = distances[node] + weight
+            if distances[neighbour] > far_distance:
+                far, far_distance = neighbour, distances[neighbour]
+            stack.append(neighbour)
+    return far, far_distance, parents
+
+
+def _walk(parents: Dict[int, Tuple[int, GraphEdge] | None], end: int) -> List[Tuple[int, GraphEdge | None]]:
+    """Nodes from ``end`` back to the search root, each with the edge leading to it."""
+
+    steps: List[Tuple[int, GraphEdge | None]] = [(end, None)]
+    link = parents[end]
+    while link is not None:
+        node, edge = link
+        steps.append((node, edge))
+        link = parents[node]
+    return steps
+
+
+def _length(points: Sequence[Point]) -> float:
+    return sum(math.dist(a, b) for a, b in zip(points[:-1], points[1:]))
+
+
+def _smooth_weight(spine: Sequence[Point], stride: int = 4) -> float:
+    """Spine length divided by ``1 + turning / pi``.
+
+    Turning is measured between points ``stride`` pixels apart so the
+    45-degree steps of a pixel staircase do not count as curvature.
+    """
+
+    coarse = list(spine[::stride])
+    if coarse[-1] != spine[-1]:
+        coarse.append(spine[-1])
+    turning = 0.0
+    for a, b, c in zip(coarse, coarse[1:], coarse[2:]):
+        heading = math.atan2(b[1] - a[1], b[0] - a[0])
+        following = math.atan2(c[1] - b[1], c[0] - b[0])
+        turning += abs((following - heading + math.pi) % (2 * math.pi) - math.pi)
+    return _length(spine) / (1.0 + turning / math.pi)
@@ -1,13 +1,33 @@
-"""Edge detection approximating Sobel behavior using pure Python."""
+"""Edge detection approximating Sobel behavior using pure Python.
+
+Besides the thresholded Sobel magnitude, :func:`detect_edges_canny` thins
+edges to single pixels with non-maximum suppression and links them with
+hysteresis, picking its thresholds from a histogram filled while the
+gradients are computed.
+"""
 from __future__ import annotations
 
-from typing import List
+import math
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Sequence, Tuple
 
 Matrix = List[List[float]]
 
+EDGE_MODES = ("sobel", "canny")
+
 _SOBEL_X = ((1, 0, -1), (2, 0, -2), (1, 0, -1))
 _SOBEL_Y = ((1, 2, 1), (0, 0, 0), (-1, -2, -1))
 
+# Sobel magnitudes of frames normalized to [0, 1] cannot exceed this, which
+# lets the Canny histogram use fixed bins instead of a max pass.
+MAX_SOBEL_MAGNITUDE = 4 * math.sqrt(2)
+_HISTOGRAM_BINS = 256
+# Floor for the low hysteresis threshold so flat, noisy frames stay empty.
+_MIN_RIDGE = 0.05
+_TAN_22_5 = math.tan(math.pi / 8)
+_TAN_67_5 = math.tan(3 * math.pi / 8)
+
 
 def detect_edges(frame: Matrix, *, threshold: float) -> Matrix:
     height = len(frame)
@@ -15,9 +35,7 @@ def detect_edges(frame: Matrix, *, threshold: float) -> Matrix:
     magnitude = [[0.0 for _ in range(width)] for _ in range(height)]
     for y in range(height):
         for x in range(width):
-            gx = _apply_kernel(frame, _SOBEL_X, x, y)
-            gy = _apply_kernel(frame, _SOBEL_Y, x, y)
-            magnitude[y][x] = (gx ** 2 + gy ** 2) ** 0.5
+            magnitude[y][x] = _magnitude_at(frame, x, y)
     max_val = max((value for row in magnitude for value in row), default=1.0)
     if max_val == 0:
         max_val = 1.0
@@ -25,6 +43,121 @@ def detect_edges(frame: Matrix, *, threshold: float) -> Matrix:
     return [[1.0 if value >= threshold else 0.0 for value in row] for row in normalized]
 
 
+def detect_edges_canny(frame: Matrix, *, low_ratio: float = 0.5) -> Matrix:
+    """Thin, hysteresis-linked edges with automatically chosen thresholds.
+
+    Gradients are computed row by row and each row is non-maximum
+    suppressed as soon as the row below it is available.  Surviving ridge
+    magnitudes fill a fixed-range histogram whose Otsu split becomes the
+    high threshold (``low_ratio`` times it the low one), so only the sparse
+    ridge pixels are revisited for hysteresis.
+    """
+
+    height = len(frame)
+    width = len(frame[0]) if frame else 0
+    if not height or not width:
+        return [[] for _ in range(height)]
+    histogram = [0] * _HISTOGRAM_BINS
+    ridges: Dict[Tuple[int, int], float] = {}
+    rows = (_gradient_row(frame, y, width) for y in range(height))
+    current = next(rows)
+    previous = current
+    for y in range(height):
+        following = next(rows) if y + 1 < height else current
+        magnitude, gx, gy = current
+        above, below = previous[0], following[0]
+        for x, value in enumerate(magnitude):
+            if value <= 0:
+                continue
+            left, right = max(0, x - 1), min(width - 1, x + 1)
+            ax, ay = abs(gx[x]), abs(gy[x])
+            if ay <= ax * _TAN_22_5:
+                a, b = magnitude[left], magnitude[right]
+            elif ay >= ax * _TAN_67_5:
+                a, b = above[x], below[x]
+            elif gx[x] * gy[x] > 0:
+                a, b = above[left], below[right]
+            else:
+                a, b = above[right], below[left]
+            if value > a and value >= b:
+                ridges[(y, x)] = value
+                histogram[_histogram_bin(value)] += 1
+        previous, current = current, following
+    low, high = _auto_thresholds(histogram, low_ratio)
+    return _hysteresis(ridges, low, high, height, width)
+
+
+def detect_edges_tiled(
+    frame: Matrix,
+    *,
+    threshold: float,
+    tile_size: int = 64,
+    workers: int | None = None,
+    executor: str | Executor = "process",
+) -> Matrix:
+    """Tiled, multi-core variant of :func:`detect_edges` with identical output.
+
+    The frame is split into ``tile_size`` squares, each shipped with a
+    one-pixel halo so border clamping matches :func:`_apply_kernel`.  The
+    first pass computes per-tile magnitudes and maxima on a thread or
+    process pool; the second reduces the maxima and thresholds while
+    stitching the tiles back together.  ``executor`` names the kind of pool
+    to create for this call, or is an existing executor to reuse (and leave
+    running) across frames.
+    """
+
+    if tile_size <= 0:
+        raise ValueError("tile_size must be positive")
+    if isinstance(executor, str) and executor not in ("thread", "process"):
+        raise ValueError("executor must be 'thread', 'process' or an Executor")
+    height = len(frame)
+    width = len(frame[0]) if frame else 0
+    if not height or not width:
+        return [[] for _ in range(height)]
+    tiles = [
+        (y0, x0, min(height, y0 + tile_size), min(width, x0 + tile_size))
+        for y0 in range(0, height, tile_size)
+        for x0 in range(0, width, tile_size)
+    ]
+    if isinstance(executor, Executor):
+        results = _map_tiles(executor, frame, tiles)
+    else:
+        pool_type = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+        with pool_type(max_workers=workers) as pool:
+            results = _map_tiles(pool, frame, tiles)
+    max_val = _nonzero_max(max(tile_max for _, tile_max in results))
+    edges: Matrix = [[0.0] * width for _ in range(height)]
+    for (y0, x0, _, x1), (magnitude, _) in zip(tiles, results):
+        for offset, row in enumerate(magnitude):
+            edges[y0 + offset][x0:x1] = [1.0 if value / max_val >= threshold else 0.0 for value in row]
+    return edges
+
+
+def _map_tiles(
+    pool: Executor, frame: Matrix, tiles: List[Tuple[int, int, int, int]]
+) -> List[Tuple[Matrix, float]]:
+    height = len(frame)
+    width = len(frame[0])
+    futures = []
+    for y0, x0, y1, x1 in tiles:
+        py0, py1 = max(0, y0 - 1), min(height, y1 + 1)
+        px0, px1 = max(0, x0 - 1), min(width, x1 + 1)
+        patch = [row[px0:px1] for row in frame[py0:py1]]
+        futures.append(pool.submit(_tile_magnitude, patch, y0 - py0, x0 - px0, y1 - y0, x1 - x0))
+    return [future.result() for future in futures]
+
+
+def _tile_magnitude(patch: Matrix, top: int, left: int, rows: int, cols: int) -> Tuple[Matrix, float]:
+    # Inside the halo the patch holds the real neighbours, and on the frame
+    # border its edge is the frame edge, so clamping behaves exactly as on
+    # the full frame.
+    magnitude = [
+        [_magnitude_at(patch, x, y) for x in range(left, left + cols)]
+        for y in range(top, top + rows)
+    ]
+    return magnitude, max(max(row) for row in magnitude)
+
+
 def _apply_kernel(frame: Matrix, kernel: tuple[tuple[int, ...], ...], x: int, y: int) -> float:
     height = len(frame)
     width = len(frame[0]) if frame else 0
@@ -38,3 +171,181 @@ def _apply_kernel(frame: Matrix, kernel: tuple[tuple[int, ...], ...], x: int, y:
             src_y = min(height - 1, max(0, y + ky - radius))
             accum += frame[src_y][src_x] * weight
     return accum
+
+
+class IncrementalEdgeDetector:
+    """Sobel edge detection that reuses work between consecutive frames.
+
+    Each update diffs the frame against the previous one tile by tile and
+    re-runs the kernels only on dirty tiles (plus their one-pixel halo).
+    The resulting edge map is identical to :func:`detect_edges`.
+    """
+
+    def __init__(self, *, threshold: float, tile_size: int = 16) -> None:
+        if tile_size <= 0:
+            raise ValueError("tile_size must be positive")
+        self.threshold = threshold
+        self.tile_size = tile_size
+        self.tiles_total = 0
+        self.tiles_recomputed = 0
+        self._frame: Matrix | None = None
+        self._magnitude: Matrix = []
+        self._tile_max: List[List[float]] = []
+        self._max_val = 1.0
+        self._edges: Matrix = []
+
+    @property
+    def skipped_fraction(self) -> float:
+        """Fraction of tiles whose Sobel pass was skipped in the last update."""
+
+        if not self.tiles_total:
+            return 0.0
+        return 1.0 - self.tiles_recomputed / self.tiles_total
+
+    def update(self, frame: Matrix) -> Matrix:
+        height = len(frame)
+        width = len(frame[0]) if frame else 0
+        previous = self._frame
+        self._frame = frame
+        tiles_y = -(-height // self.tile_size)
+        tiles_x = -(-width // self.tile_size)
+        self.tiles_total = tiles_y * tiles_x
+        if previous is None or len(previous) != height or (previous and len(previous[0]) != width):
+            return self._full_update(frame, tiles_y, tiles_x)
+
+        dirty = self._dirty_tiles(previous, frame, tiles_y, tiles_x)
+        self.tiles_recomputed = len(dirty)
+        if not dirty:
+            return list(self._edges)
+        touched = set()
+        for ty, tx in dirty:
+            y0, y1, x0, x1 = self._tile_bounds(ty, tx, height, width)
+            y0, y1 = max(0, y0 - 1), min(height, y1 + 1)
+            x0, x1 = max(0, x0 - 1), min(width, x1 + 1)
+            for y in range(y0, y1):
+                row = self._magnitude[y]
+                for x in range(x0, x1):
+                    row[x] = _magnitude_at(frame, x, y)
+            for ny in range(y0 // self.tile_size, (y1 - 1) // self.tile_size + 1):
+                for nx in range(x0 // self.tile_size, (x1 - 1) // self.tile_size + 1):
+                    touched.add((ny, nx))
+        for ty, tx in touched:
+            self._tile_max[ty][tx] = self._max_in_tile(ty, tx, height, width)
+        max_val = _nonzero_max(max((value for row in self._tile_max for value in row), default=1.0))
+        if max_val != self._max_val:
+            self._max_val = max_val
+            self._edges = _threshold_rows(self._magnitude, max_val, self.threshold)
+            return list(self._edges)
+        rows = sorted({y for ty, _ in touched for y in self._tile_rows(ty, height)})
+        for y in rows:
+            self._edges[y] = [1.0 if value / max_val >= self.threshold else 0.0 for value in self._magnitude[y]]
+        return list(self._edges)
+
+    def _full_update(self, frame: Matrix, tiles_y: int, tiles_x: int) -> Matrix:
+        height = len(frame)
+        width = len(frame[0]) if frame else 0
+        self.tiles_recomputed = self.tiles_total
+        self._magnitude = [[_magnitude_at(frame, x, y) for x in range(width)] for y in range(height)]
+        self._tile_max = [
+            [self._max_in_tile(ty, tx, height, width) for tx in range(tiles_x)] for ty in range(tiles_y)
+        ]
+        self._max_val = _nonzero_max(max((value for row in self._tile_max for value in row), default=1.0))
+        self._edges = _threshold_rows(self._magnitude, self._max_val, self.threshold)
+        return list(self._edges)
+
+    def _dirty_tiles(self, previous: Matrix, frame: Matrix, tiles_y: int, tiles_x: int) -> List[tuple[int, int]]:
+        height = len(frame)
+        width = len(frame[0]) if frame else 0
+        dirty: List[tuple[int, int]] = []
+        for ty in range(tiles_y):
+            rows = [y for y in self._tile_rows(ty, height) if previous[y] != frame[y]]
+            if not rows:
+                continue
+            for tx in range(tiles_x):
+                x0 = tx * self.tile_size
+                x1 = min(width, x0 + self.tile_size)
+                if any(previous[y][x0:x1] != frame[y][x0:x1] for y in rows):
+                    dirty.append((ty, tx))
+        return dirty
+
+    def _tile_rows(self, ty: int, height: int) -> range:
+        return range(ty * self.tile_size, min(height, (ty + 1) * self.tile_size))
+
+    def _tile_bounds(self, ty: int, tx: int, height: int, width: int) -> tuple[int, int, int, int]:
+        y0 = ty * self.tile_size
+        x0 = tx * self.tile_size
+        return y0, min(height, y0 + self.tile_size), x0, min(width, x0 + self.tile_size)
+
+    def _max_in_tile(self, ty: int, tx: int, height: int, width: int) -> float:
+        y0, y1, x0, x1 = self._tile_bounds(ty, tx, height, width)
+        return max((max(self._magnitude[y][x0:x1]) for y in range(y0, y1)), default=0.0)
+
+
+def _magnitude_at(frame: Matrix, x: int, y: int) -> float:
+    gx = _apply_kernel(frame, _SOBEL_X, x, y)
+    gy = _apply_kernel(frame, _SOBEL_Y, x, y)
+    return (gx ** 2 + gy ** 2) ** 0.5
+
+
+def _gradient_row(frame: Matrix, y: int, width: int) -> Tuple[List[float], List[float], List[float]]:
+    gx = [_apply_kernel(frame, _SOBEL_X, x, y) for x in range(width)]
+    gy = [_apply_kernel(frame, _SOBEL_Y, x, y) for x in range(width)]
+    return [(a * a + b * b) ** 0.5 for a, b in zip(gx, gy)], gx, gy
+
+
+def _histogram_bin(value: float) -> int:
+    return min(_HISTOGRAM_BINS - 1, int(value / MAX_SOBEL_MAGNITUDE * _HISTOGRAM_BINS))
+
+
+def _auto_thresholds(histogram: Sequence[int], low_ratio: float) -> Tuple[float, float]:
+    """Hysteresis thresholds from Otsu's split of a ridge-magnitude histogram."""
+
+    if not 0 < low_ratio <= 1:
+        raise ValueError("low_ratio must be in (0, 1]")
+    total = sum(histogram)
+    weighted_total = sum(idx * count for idx, count in enumerate(histogram))
+    best_split, best_variance = 0, -1.0
+    below = 0
+    weighted_below = 0.0
+    for idx, count in enumerate(histogram[:-1]):
+        below += count
+        weighted_below += idx * count
+        above = total - below
+        if not below or not above:
+            continue
+        mean_gap = weighted_below / below - (weighted_total - weighted_below) / above
+        variance = below * above * mean_gap * mean_gap
+        if variance > best_variance:
+            best_split, best_variance = idx, variance
+    high = (best_split + 1) * MAX_SOBEL_MAGNITUDE / _HISTOGRAM_BINS
+    low = max(_MIN_RIDGE, high * low_ratio)
+    return low, max(low, high)
+
+
+def _hysteresis(
+    ridges: Dict[Tuple[int, int], float], low: float, high: float, height: int, width: int
+) -> Matrix:
+    """Keep ridges above ``high`` plus weaker ridges 8-connected to them."""
+
+    edges: Matrix = [[0.0] * width for _ in range(height)]
+    queue = deque(pixel for pixel, value in ridges.items() if value >= high)
+    for y, x in queue:
+        edges[y][x] = 1.0
+    while queue:
+        y, x = queue.popleft()
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                neighbour = (y + dy, x + dx)
+                value = ridges.get(neighbour)
+                if value is not None and value >= low and not edges[neighbour[0]][neighbour[1]]:
+                    edges[neighbour[0]][neighbour[1]] = 1.0
+                    queue.append(neighbour)
+    return edges
+
+
+def _nonzero_max(value: float) -> float:
+    return 1.0 if value == 0 else value
+
+
+def _threshold_rows(magnitude: Matrix, max_val: float, threshold: float) -> Matrix:
+    return [[1.0 if value / max_val >= threshold else 0.0 for value in row] for row in magnitude]
@@ -1,24 +1,87 @@
-"""Export helpers writing pipeline artifacts to disk."""
+"""Export helpers writing pipeline artifacts to disk.
+
+Sessions are written in a compact binary layout by default: a small
+``header.json`` describing raw little-endian ``float32`` arrays for the frame,
+course points, path, velocities and sample times, plus a bit-packed edge map.  The raw files
+can be memory-mapped by readers (see :func:`load_session`, or ``numpy.memmap``
+with the dtypes recorded in the header).  The original pretty-printed JSON
+layout remains available with ``format="json"``.
+
+Sessions are written into a hidden staging directory and renamed into place
+once complete, so readers never see a half-written session.
+:class:`ExportQueue` moves those writes onto a background thread.
+"""
 from __future__ import annotations
 
 import json
-from dataclasses import asdict
+import mmap
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Dict, Iterable, List, Sequence, TypeVar
 
-from .course_generation import Course
+from .course_generation import Course, PointBuffer
 from .physics import SimulationResult
 
+EXPORT_FORMATS = ("binary", "json")
+BINARY_FORMAT = "edge-skate-binary"
+BINARY_VERSION = 2
+
+T = TypeVar("T")
+
 
 class DirectoryWriter:
     def __init__(self, base_dir: Path) -> None:
         self.base_dir = base_dir
 
     def prepare(self, name: str) -> Path:
+        """Create (or reuse) the directory for session ``name`` and return it.
+
+        Files written here are visible to readers as they are written; use
+        :meth:`stage` and :meth:`publish` to replace a session atomically.
+        """
+
         target = self.base_dir / name
         target.mkdir(parents=True, exist_ok=True)
         return target
 
+    def stage(self, name: str) -> Path:
+        """Create an empty hidden directory to write session ``name`` into."""
+
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".{name}.", suffix=".tmp", dir=self.base_dir))
+        staging.chmod(0o755)
+        return staging
+
+    def publish(self, staging: Path, name: str) -> Path:
+        """Rename a completed staging directory to its final name.
+
+        An existing session of the same name is moved aside first (a
+        directory cannot be replaced by ``os.replace`` while it has files), so
+        the name briefly disappears but never refers to a partial session.
+        If the rename fails the staging directory is removed.
+        """
+
+        target = self.base_dir / name
+        try:
+            if not target.exists():
+                os.replace(staging, target)
+                return target
+            retired = Path(tempfile.mkdtemp(prefix=f".{name}.", suffix=".old", dir=self.base_dir))
+            os.replace(target, retired / name)
+            os.replace(staging, target)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        shutil.rmtree(retired, ignore_errors=True)
+        return target
+
 
 def export_session(
     writer: DirectoryWriter,
@@ -28,8 +91,185 @@ def export_session(
     course: Course,
     simulation: SimulationResult,
     overlay: str,
+    *,
+    format: str = "binary",
 ) -> Path:
-    target = writer.prepare(name)
+    """Write a session and publish it as ``name`` under the writer's directory."""
+
+    staging = stage_session(writer, name, frame, edges, course, simulation, overlay, format=format)
+    return writer.publish(staging, name)
+
+
+def stage_session(
+    writer: DirectoryWriter,
+    name: str,
+    frame: Any,
+    edges: Any,
+    course: Course,
+    simulation: SimulationResult,
+    overlay: str,
+    *,
+    format: str = "binary",
+) -> Path:
+    """Write a session into a new staging directory without publishing it.
+
+    Callers may add files to the returned directory before handing it to
+    :meth:`DirectoryWriter.publish`.
+    """
+
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {format!r}; expected one of {EXPORT_FORMATS}")
+    staging = writer.stage(name)
+    try:
+        if format == "json":
+            _export_json(staging, frame, edges, course, simulation)
+        else:
+            _export_binary(staging, frame, edges, course, simulation)
+        (staging / "overlay.txt").write_text(overlay, encoding="utf-8")
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return staging
+
+
+class ExportQueue:
+    """Run session writes on a background thread so I/O overlaps compute.
+
+    At most ``max_pending`` writes are queued or running; :meth:`submit`
+    blocks once that many are in flight, which bounds the artifacts held in
+    memory when the disk is slower than the pipeline.  Each submission
+    returns a future carrying that session's result or error.  Use as a
+    context manager, or call :meth:`close`, to wait for every write.
+    """
+
+    def __init__(self, *, max_pending: int = 2) -> None:
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        self.max_pending = max_pending
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="edge-skate-export")
+        self._futures: List[Future] = []
+
+    def submit(self, write: Callable[[], T]) -> Future[T]:
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(write)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures = [pending for pending in self._futures if not pending.done()]
+        self._futures.append(future)
+        return future
+
+    def flush(self) -> None:
+        """Block until every submitted write has finished (or failed)."""
+
+        for future in list(self._futures):
+            future.exception()
+        self._futures = []
+
+    def close(self) -> None:
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> ExportQueue:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+@dataclass
+class BinarySession:
+    """Memory-mapped view of a session written in the binary format."""
+
+    header: Dict[str, Any]
+    frame: memoryview
+    edge_bits: memoryview
+    course_points: memoryview
+    path: memoryview
+    velocities: memoryview
+    times: memoryview
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        height, width = self.header["frame"]["shape"]
+        return height, width
+
+    def frame_rows(self) -> List[memoryview]:
+        height, width = self.shape
+        return [self.frame[y * width : (y + 1) * width] for y in range(height)]
+
+    def edge_map(self) -> List[List[float]]:
+        height, width = self.shape
+        bits = _unpack_bits(self.edge_bits, height * width)
+        return [bits[y * width : (y + 1) * width] for y in range(height)]
+
+    def points(self, name: str = "course_points") -> PointBuffer:
+        """``course_points`` or ``path`` as a zero-copy point view."""
+
+        return PointBuffer.wrap(getattr(self, name))
+
+
+def load_session(target: Path) -> BinarySession:
+    """Open a binary session; arrays are zero-copy views over mapped files."""
+
+    target = Path(target)
+    header = json.loads((target / "header.json").read_text(encoding="utf-8"))
+    if header.get("format") != BINARY_FORMAT:
+        raise ValueError(f"{target} is not a binary EdgeSkate session")
+    files = header["files"]
+    return BinarySession(
+        header=header,
+        frame=_map_floats(target / files["frame"]),
+        edge_bits=_map_bytes(target / files["edges"]),
+        course_points=_map_floats(target / files["course"]),
+        path=_map_floats(target / files["path"]),
+        velocities=_map_floats(target / files["velocities"]),
+        # Version 1 sessions predate fixed-timestep sample times.
+        times=_map_floats(target / files["times"]) if "times" in files else memoryview(b"").cast("f"),
+    )
+
+
+def _export_binary(
+    target: Path, frame: Any, edges: Any, course: Course, simulation: SimulationResult
+) -> None:
+    height = len(frame)
+    width = len(frame[0]) if height else 0
+    files = {
+        "frame": "frame.f32",
+        "edges": "edges.bits",
+        "course": "course.f32",
+        "path": "path.f32",
+        "velocities": "velocities.f32",
+        "times": "times.f32",
+    }
+    _write_floats(target / files["frame"], (value for row in frame for value in row))
+    (target / files["edges"]).write_bytes(_pack_bits(edges))
+    _write_floats(target / files["course"], course.points.data)
+    _write_floats(target / files["path"], simulation.path.data)
+    _write_floats(target / files["velocities"], simulation.velocities)
+    _write_floats(target / files["times"], simulation.times)
+    header = {
+        "format": BINARY_FORMAT,
+        "version": BINARY_VERSION,
+        "byteorder": "little",
+        "files": files,
+        "frame": {"shape": [height, width], "dtype": "<f4"},
+        "edges": {"shape": [height, width], "dtype": "bits", "bitorder": "big"},
+        "course": {"count": len(course.points), "dtype": "<f4", "layout": "xy", "length": course.length()},
+        "path": {"count": len(simulation.path), "dtype": "<f4", "layout": "xy"},
+        "velocities": {"count": len(simulation.velocities), "dtype": "<f4"},
+        "times": {"count": len(simulation.times), "dtype": "<f4", "unit": "s"},
+        "trick_events": [asdict(event) for event in simulation.trick_events],
+    }
+    _write_json(target / "header.json", header, indent=None)
+
+
+def _export_json(
+    target: Path, frame: Any, edges: Any, course: Course, simulation: SimulationResult
+) -> None:
     _write_json(target / "frame.json", frame)
     _write_json(target / "edges.json", edges)
     _write_json(target / "course.json", {"points": course.points, "length": course.length()})
@@ -38,17 +278,66 @@ def export_session(
         {
             "path": simulation.path,
             "velocities": simulation.velocities,
+            "times": simulation.times,
             "trick_events": [asdict(event) for event in simulation.trick_events],
         },
     )
-    (target / "overlay.txt").write_text(overlay, encoding="utf-8")
-    return target
 
 
-def _write_json(path: Path, data: Any) -> None:
+def _write_floats(path: Path, values: Iterable[float]) -> None:
+    data = array("f", values)
+    if sys.byteorder != "little":
+        data.byteswap()
+    with Path(path).open("wb") as handle:
+        data.tofile(handle)
+
+
+# Eight 0/1 flag bytes read as one native-endian integer -> the packed byte.
+_FLAGS_TO_BYTE = {
+    int.from_bytes(bytes((byte >> (7 - bit)) & 1 for bit in range(8)), sys.byteorder): byte for byte in range(256)
+}
+
+
+def _pack_bits(edges: Any) -> bytes:
+    """One bit per pixel (set where the edge is positive), most significant bit first."""
+
+    if hasattr(edges, "dtype"):
+        import numpy as np  # only numpy arrays reach this branch
+
+        return np.packbits(np.asarray(edges) > 0, axis=None).tobytes()
+    positive = (0.0).__lt__
+    flags = b"".join(bytes(map(positive, row)) for row in edges)
+    flags += bytes(-len(flags) % 8)
+    return bytes(map(_FLAGS_TO_BYTE.__getitem__, memoryview(flags).cast("Q")))
+
+
+def _unpack_bits(packed: Sequence[int], count: int) -> List[float]:
+    bits: List[float] = []
+    for byte in packed:
+        bits.extend(1.0 if byte & (0x80 >> bit) else 0.0 for bit in range(8))
+    return bits[:count]
+
+
+def _map_bytes(path: Path) -> memoryview:
+    with Path(path).open("rb") as handle:
+        if not path.stat().st_size:
+            return memoryview(b"")
+        return memoryview(mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def _map_floats(path: Path) -> memoryview:
+    raw = _map_bytes(path)
+    if sys.byteorder != "little":
+        data = array("f", raw.tobytes())
+        data.byteswap()
+        return memoryview(data)
+    return raw.cast("f")
+
+
+def _write_json(path: Path, data: Any, *, indent: int | None = 2) -> None:
     serializable = _to_serializable(data)
     with Path(path).open("w", encoding="utf-8") as handle:
-        json.dump(serializable, handle, ensure_ascii=False, indent=2)
+        json.dump(serializable, handle, ensure_ascii=False, indent=indent)
 
 
 def _to_serializable(data: Any) -> Any:
@@ -56,4 +345,6 @@ def _to_serializable(data: Any) -> Any:
         return {key: _to_serializable(value) for key, value in data.items()}
     if isinstance(data, (list, tuple)):
         return [_to_serializable(item) for item in data]
+    if hasattr(data, "tolist"):
+        return data.tolist()
     return data
@@ -1,26 +1,241 @@
-"""Media loading utilities for the Edge Skate prototype."""
+"""Media loading utilities for the Edge Skate prototype.
+
+Besides the JSON matrices used for prototyping, frames can be read from
+compact binary formats: headered raw grayscale buffers (``.raw``, see
+:func:`write_raw_frame`), binary or ASCII PGM/PPM, and ``.npy`` arrays.
+Binary formats whose samples are already in native byte order are
+memory-mapped and exposed as a zero-copy :class:`FrameBuffer`.
+"""
 from __future__ import annotations
 
+import ast
 import json
+import mmap
+import struct
+import sys
+from array import array
 from pathlib import Path
-from typing import Any, List
+from typing import Any, Iterator, List, Sequence, Tuple, Union
 
 Matrix = List[List[float]]
 
+FRAME_SUFFIXES = (".json", ".raw", ".pgm", ".ppm", ".pnm", ".npy")
+
+RAW_MAGIC = b"ESRAW"
+RAW_VERSION = 1
+_RAW_HEADER = struct.Struct("<5sBcxII")
+_NPY_MAGIC = b"\x93NUMPY"
+# numpy dtype descriptors mapped to array typecodes with the same item size.
+_NPY_TYPECODES = {"u1": "B", "i1": "b", "u2": "H", "i2": "h", "f4": "f", "f8": "d"}
+_FRAME_TYPECODES = ("B", "b", "H", "h", "f", "d")
+
+
+class FrameBuffer:
+    """Read-only 2D frame backed by a flat buffer such as a memory-mapped file.
+
+    Rows are memoryview slices, so indexing ``frame[y][x]`` and iterating rows
+    behaves like the list-of-lists frames without copying any samples.
+    """
+
+    def __init__(self, buffer: memoryview | array, shape: Tuple[int, int]) -> None:
+        height, width = shape
+        view = memoryview(buffer)
+        if view.format not in _FRAME_TYPECODES:
+            raise ValueError(f"Unsupported frame sample format {view.format!r}")
+        if height <= 0 or width <= 0 or len(view) != height * width:
+            raise ValueError(f"Frame buffer of {len(view)} samples does not match shape {shape}")
+        self.buffer = view
+        self.shape = (height, width)
+
+    @property
+    def typecode(self) -> str:
+        return self.buffer.format
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return [self[y] for y in range(*index.indices(self.shape[0]))]
+        height, width = self.shape
+        if index < 0:
+            index += height
+        if not 0 <= index < height:
+            raise IndexError("frame row out of range")
+        return self.buffer[index * width : (index + 1) * width]
+
+    def __iter__(self) -> Iterator[memoryview]:
+        for y in range(self.shape[0]):
+            yield self[y]
+
+    def tolist(self) -> Matrix:
+        return [[float(value) for value in row] for row in self]
+
+
+Frame = Union[Matrix, FrameBuffer]
+
+
+def write_raw_frame(path: Path, frame: Sequence[Sequence[float]], *, typecode: str = "f") -> None:
+    """Write a frame as a headered raw buffer readable by :class:`MediaLoader`."""
+
+    if typecode not in _FRAME_TYPECODES:
+        raise ValueError(f"Unsupported typecode {typecode!r}")
+    height = len(frame)
+    width = len(frame[0]) if height else 0
+    data = array(typecode, (value for row in frame for value in row))
+    if sys.byteorder != "little":
+        data.byteswap()
+    with Path(path).open("wb") as handle:
+        handle.write(_RAW_HEADER.pack(RAW_MAGIC, RAW_VERSION, typecode.encode("ascii"), height, width))
+        data.tofile(handle)
+
 
 class MediaLoader:
-    """Load frames from simple JSON matrices used for prototyping."""
+    """Load frames from JSON matrices or compact binary images.
+
+    The format is chosen by file extension, falling back to sniffing the
+    first bytes.  Binary formats are validated by shape and sample type
+    only; JSON frames are still copied through ``float()`` for
+    compatibility.
+    """
 
-    def load_frame(self, source: Path) -> Matrix:
-        data = self._read_json(source)
+    def load_frame(self, source: Path) -> Frame:
+        path = Path(source)
+        kind = self._detect_format(path)
+        if kind == "raw":
+            return self._load_raw(path)
+        if kind == "pnm":
+            return self._load_pnm(path)
+        if kind == "npy":
+            return self._load_npy(path)
+        data = self._read_json(path)
         frame = self._validate_frame(data)
         return frame
 
+    def iter_frames(self, source: Path) -> Iterator[Frame]:
+        """Yield frames lazily from a frame sequence.
+
+        ``source`` may be a directory of frame files (read in name order), a
+        ``.jsonl`` container holding one frame per line, or a JSON file with
+        either a single frame or a list of frames.  Directories and ``.jsonl``
+        containers are read one frame at a time.
+        """
+
+        path = Path(source)
+        if path.is_dir():
+            for child in sorted(path.iterdir()):
+                if child.is_file() and child.suffix.lower() in FRAME_SUFFIXES:
+                    yield self.load_frame(child)
+            return
+        if self._detect_format(path) != "json":
+            yield self.load_frame(path)
+            return
+        if path.suffix.lower() == ".jsonl":
+            with path.open("r", encoding="utf-8") as handle:
+                for line in handle:
+                    if line.strip():
+                        yield self._validate_frame(json.loads(line))
+            return
+        data = self._read_json(path)
+        if self._is_frame_list(data):
+            for frame in data:
+                yield self._validate_frame(frame)
+            return
+        yield self._validate_frame(data)
+
+    @staticmethod
+    def _detect_format(path: Path) -> str:
+        suffix = path.suffix.lower()
+        if suffix == ".raw":
+            return "raw"
+        if suffix in (".pgm", ".ppm", ".pnm"):
+            return "pnm"
+        if suffix == ".npy":
+            return "npy"
+        if suffix in (".json", ".jsonl"):
+            return "json"
+        with path.open("rb") as handle:
+            head = handle.read(len(_NPY_MAGIC))
+        if head.startswith(RAW_MAGIC):
+            return "raw"
+        if head.startswith(_NPY_MAGIC):
+            return "npy"
+        if head[:1] == b"P" and head[1:2] in (b"2", b"3", b"5", b"6"):
+            return "pnm"
+        return "json"
+
+    @staticmethod
+    def _load_raw(path: Path) -> FrameBuffer:
+        mapped = _map_file(path)
+        if len(mapped) < _RAW_HEADER.size:
+            raise ValueError(f"{path} is too short for a raw frame header")
+        magic, version, code, height, width = _RAW_HEADER.unpack_from(mapped)
+        if magic != RAW_MAGIC or version != RAW_VERSION:
+            raise ValueError(f"{path} is not a version {RAW_VERSION} raw frame")
+        typecode = code.decode("ascii")
+        return _frame_from_bytes(mapped[_RAW_HEADER.size :], typecode, (height, width), little_endian=True)
+
+    @staticmethod
+    def _load_npy(path: Path) -> FrameBuffer:
+        mapped = _map_file(path)
+        if bytes(mapped[:6]) != _NPY_MAGIC:
+            raise ValueError(f"{path} is not a .npy file")
+        major = mapped[6]
+        if major == 1:
+            (header_len,) = struct.unpack_from("<H", mapped, 8)
+            offset = 10
+        else:
+            (header_len,) = struct.unpack_from("<I", mapped, 8)
+            offset = 12
+        header = ast.literal_eval(bytes(mapped[offset : offset + header_len]).decode("latin1"))
+        descr = header["descr"]
+        shape = tuple(header["shape"])
+        if not isinstance(descr, str) or descr[1:] not in _NPY_TYPECODES:
+            raise ValueError(f"Unsupported .npy dtype {descr!r}")
+        if header.get("fortran_order") or len(shape) != 2:
+            raise ValueError(".npy frames must be C-ordered 2D arrays")
+        typecode = _NPY_TYPECODES[descr[1:]]
+        data = mapped[offset + header_len :]
+        return _frame_from_bytes(data, typecode, (shape[0], shape[1]), little_endian=descr[0] != ">")
+
+    @staticmethod
+    def _load_pnm(path: Path) -> FrameBuffer:
+        mapped = _map_file(path)
+        magic = bytes(mapped[:2])
+        fields, offset = _pnm_header(mapped, 3)
+        width, height, maxval = fields
+        channels = 3 if magic in (b"P3", b"P6") else 1
+        if magic in (b"P2", b"P3"):
+            tokens = bytes(mapped[offset:]).split()
+            samples = array("H" if maxval > 255 else "B", (int(token) for token in tokens))
+        else:
+            count = width * height * channels
+            if maxval > 255:
+                # 16-bit PNM samples are big-endian.
+                samples = array("H", bytes(mapped[offset : offset + 2 * count]))
+                if sys.byteorder == "little":
+                    samples.byteswap()
+            else:
+                samples = mapped[offset : offset + count]
+        if channels == 3:
+            samples = _luminance(samples)
+        return FrameBuffer(samples, (height, width))
+
     @staticmethod
     def _read_json(path: Path) -> Any:
         with Path(path).open("r", encoding="utf-8") as handle:
             return json.load(handle)
 
+    @staticmethod
+    def _is_frame_list(data: Any) -> bool:
+        return bool(
+            isinstance(data, list)
+            and data
+            and isinstance(data[0], list)
+            and data[0]
+            and isinstance(data[0][0], list)
+        )
+
     @staticmethod
     def _validate_frame(data: Any) -> Matrix:
         if not isinstance(data, list) or not data:
@@ -36,3 +251,60 @@ class MediaLoader:
                 raise ValueError("Frame rows must have consistent lengths")
             frame.append([float(value) for value in row])
         return frame
+
+
+def _map_file(path: Path) -> memoryview:
+    with Path(path).open("rb") as handle:
+        if not path.stat().st_size:
+            raise ValueError(f"{path} is empty")
+        return memoryview(mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def _frame_from_bytes(
+    data: memoryview, typecode: str, shape: Tuple[int, int], *, little_endian: bool
+) -> FrameBuffer:
+    if typecode not in _FRAME_TYPECODES:
+        raise ValueError(f"Unsupported frame sample format {typecode!r}")
+    itemsize = array(typecode).itemsize
+    nbytes = shape[0] * shape[1] * itemsize
+    if len(data) < nbytes:
+        raise ValueError(f"Frame data holds {len(data)} bytes, expected {nbytes}")
+    data = data[:nbytes]
+    if itemsize == 1 or little_endian == (sys.byteorder == "little"):
+        return FrameBuffer(data.cast(typecode), shape)
+    swapped = array(typecode, bytes(data))
+    swapped.byteswap()
+    return FrameBuffer(swapped, shape)
+
+
+def _pnm_header(data: memoryview, count: int) -> Tuple[List[int], int]:
+    """Parse ``count`` integers after the magic number, skipping comments."""
+
+    fields: List[int] = []
+    offset = 2
+    while len(fields) < count:
+        char = data[offset : offset + 1].tobytes()
+        if not char:
+            raise ValueError("Truncated PNM header")
+        if char == b"#":
+            while data[offset : offset + 1].tobytes() not in (b"\n", b""):
+                offset += 1
+        elif char.isspace():
+            offset += 1
+        else:
+            start = offset
+            while data[offset : offset + 1].tobytes().isdigit():
+                offset += 1
+            if start == offset:
+                raise ValueError("Malformed PNM header")
+            fields.append(int(bytes(data[start:offset])))
+    # Exactly one whitespace byte separates the header from binary samples.
+    return fields, offset + 1
+
+
+def _luminance(samples: Sequence[int]) -> array:
+    gray = array("f", bytes(4 * (len(samples) // 3)))
+    for idx in range(len(gray)):
+        base = 3 * idx
+        gray[idx] = 0.299 * samples[base] + 0.587 * samples[base + 1] + 0.114 * samples[base + 2]
+    return gray
@@ -1,23 +1,158 @@
-"""Simple physics approximation for the skateboard run."""
+"""Simple physics approximation for the skateboard run.
+
+The rider moves along the course's cumulative arc length with a constant
+speed on each course segment.  A :class:`Trajectory` answers position and
+velocity queries at arbitrary times by bisecting its cumulative time table,
+and :func:`simulate_run` samples it at a fixed timestep, so the number of
+samples follows the run's duration and frame rate rather than the course's
+pixel count.
+
+Speeds along a course are ``base_speed`` times a per-segment factor that
+depends only on the course, so :class:`CourseGeometry` computes that once
+and :class:`RiderBatch` evaluates many ``base_speed``/``trick_interval``
+combinations by rescaling its time table.
+"""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Iterator, List, Sequence
 
-from .course_generation import Course, Point, _distance
+from .course_generation import Course, Point, PointBuffer, _as_point_buffer, _distance
 
 
-@dataclass
+@dataclass(slots=True)
 class TrickEvent:
+    """A trick at sample ``frame``, snapped to the nearest course point."""
+
     frame: int
     name: str
+    course_index: int | None = None
+
+
+@dataclass
+class Trajectory:
+    """Piecewise-linear motion along course points.
+
+    ``arc_lengths`` and ``times`` are cumulative per point; ``speeds`` holds
+    the constant speed (pixels per second) of each segment.
+    """
+
+    points: PointBuffer
+    arc_lengths: array
+    times: array
+    speeds: array
+
+    @property
+    def duration(self) -> float:
+        return self.times[-1] if self.times else 0.0
+
+    def position_at(self, t: float) -> Point | None:
+        """Position at time ``t`` seconds, clamped to the run.
+
+        An empty trajectory has no position and returns ``None``, just as
+        :func:`simulate_run` samples no points for an empty course.
+        """
+
+        if not self.points:
+            return None
+        if len(self.points) < 2:
+            return self.points[0]
+        segment = self._segment_at(t)
+        return self._position_in(segment, t)
+
+    def velocity_at(self, t: float) -> float:
+        if not self.speeds:
+            return 0.0
+        return self.speeds[self._segment_at(t)]
+
+    def _segment_at(self, t: float) -> int:
+        return min(len(self.speeds) - 1, max(0, bisect_right(self.times, t) - 1))
+
+    def _position_in(self, segment: int, t: float) -> Point:
+        start = self.times[segment]
+        span = self.times[segment + 1] - start
+        frac = min(1.0, max(0.0, (t - start) / span)) if span > 0 else 1.0
+        (x0, y0), (x1, y1) = self.points[segment], self.points[segment + 1]
+        return (x0 + (x1 - x0) * frac, y0 + (y1 - y0) * frac)
 
 
 @dataclass
 class SimulationResult:
-    path: List[Point]
-    velocities: List[float]
+    """Samples of the run at a fixed timestep.
+
+    ``path``, ``velocities`` and ``times`` have one entry per sample; the
+    last sample lands on the end of the course.  ``path`` is a
+    :class:`PointBuffer`; any iterable of points given is converted.
+    """
+
+    path: PointBuffer
+    velocities: array
     trick_events: List[TrickEvent]
+    times: array = field(default_factory=lambda: array("d"))
+    trajectory: Trajectory | None = None
+
+    def __post_init__(self) -> None:
+        self.path = _as_point_buffer(self.path)
+
+
+@dataclass
+class CourseGeometry:
+    """Course quantities shared by every rider.
+
+    ``unit_times`` are cumulative per point for a ``base_speed`` of 1, and
+    ``factors`` are the per-segment speed multipliers.
+    """
+
+    points: PointBuffer
+    arc_lengths: array
+    unit_times: array
+    factors: array
+
+    @classmethod
+    def from_course(cls, course: Course) -> CourseGeometry:
+        points = course.points
+        distances = [_distance(a, b) for a, b in zip(points, points[1:])]
+        factors = array("d", _speed_factors(distances))
+        arc_lengths = array("d", [0.0] * len(points))
+        unit_times = array("d", [0.0] * len(points))
+        for idx, (distance, factor) in enumerate(zip(distances, factors), start=1):
+            arc_lengths[idx] = arc_lengths[idx - 1] + distance
+            unit_times[idx] = unit_times[idx - 1] + distance / factor
+        return cls(points=points, arc_lengths=arc_lengths, unit_times=unit_times, factors=factors)
+
+    @property
+    def length(self) -> float:
+        return self.arc_lengths[-1] if self.arc_lengths else 0.0
+
+    def trajectory(self, base_speed: float) -> Trajectory:
+        if base_speed <= 0:
+            raise ValueError("base_speed must be positive")
+        return Trajectory(
+            points=self.points,
+            arc_lengths=self.arc_lengths,
+            times=array("d", (unit / base_speed for unit in self.unit_times)),
+            speeds=array("d", (factor * base_speed for factor in self.factors)),
+        )
+
+
+@dataclass
+class Rider:
+    base_speed: float
+    trick_interval: int
+
+
+@dataclass
+class RiderResult:
+    """Summary of one rider's run, without per-sample arrays."""
+
+    rider: Rider
+    duration: float
+    sample_count: int
+    trick_count: int
+    mean_speed: float
+    top_speed: float
 
 
 def simulate_run(
@@ -25,49 +160,171 @@ def simulate_run(
     *,
     base_speed: float,
     trick_interval: int,
+    frame_rate: float = 30.0,
 ) -> SimulationResult:
-    if len(course.points) < 2:
-        return SimulationResult(path=course.points, velocities=[], trick_events=[])
-    distances = _segment_lengths(course.points)
-    velocities = _simulate_velocities(distances, base_speed)
-    path = _interpolate_path(course.points, distances)
-    tricks = _generate_tricks(path, trick_interval)
-    return SimulationResult(path=path, velocities=velocities, trick_events=tricks)
+    if frame_rate <= 0:
+        raise ValueError("frame_rate must be positive")
+    trajectory = build_trajectory(course, base_speed=base_speed)
+    path, velocities, times = _sample(trajectory, 1.0 / frame_rate)
+    tricks = _generate_tricks(len(path), trick_interval)
+    if tricks:
+        index = course.index()
+        for event in tricks:
+            event.course_index = index.nearest(path[event.frame])
+    return SimulationResult(
+        path=path, velocities=velocities, trick_events=tricks, times=times, trajectory=trajectory
+    )
+
+
+def build_trajectory(course: Course, *, base_speed: float) -> Trajectory:
+    """Assign a speed to each course segment and accumulate arc length and time."""
+
+    return CourseGeometry.from_course(course).trajectory(base_speed)
+
+
+class RiderBatch:
+    """Many riders on one course, sharing its precomputed geometry.
 
+    Because a rider's time table is the unit table divided by its
+    ``base_speed``, per-rider summaries cost O(1) and positions at a common
+    time are looked up on the shared table at ``t * base_speed``.
+    """
 
-def _segment_lengths(points: List[Point]) -> List[float]:
-    return [_distance(a, b) for a, b in zip(points[:-1], points[1:])]
+    def __init__(self, course: Course | CourseGeometry, riders: Sequence[Rider]) -> None:
+        for rider in riders:
+            if rider.base_speed <= 0:
+                raise ValueError("base_speed must be positive")
+        self.geometry = course if isinstance(course, CourseGeometry) else CourseGeometry.from_course(course)
+        self.riders = list(riders)
+        # Positions are looked up on the base_speed=1 trajectory at t * speed.
+        self._unit = self.geometry.trajectory(1.0)
 
+    def results(self, *, frame_rate: float = 30.0) -> List[RiderResult]:
+        """Summaries matching what :func:`simulate_run` would produce per rider."""
 
-def _simulate_velocities(distances: List[float], base_speed: float) -> List[float]:
+        if frame_rate <= 0:
+            raise ValueError("frame_rate must be positive")
+        geometry = self.geometry
+        unit_duration = geometry.unit_times[-1] if geometry.unit_times else 0.0
+        top_factor = max(geometry.factors, default=0.0)
+        results: List[RiderResult] = []
+        for rider in self.riders:
+            duration = unit_duration / rider.base_speed
+            if len(geometry.points) > 1:
+                count = _sample_count(duration, 1.0 / frame_rate)
+            else:
+                count = len(geometry.points)
+            interval = rider.trick_interval
+            results.append(
+                RiderResult(
+                    rider=rider,
+                    duration=duration,
+                    sample_count=count,
+                    trick_count=len(range(interval, count, interval)) if interval > 0 else 0,
+                    mean_speed=geometry.length / duration if duration > 0 else 0.0,
+                    top_speed=top_factor * rider.base_speed,
+                )
+            )
+        return results
+
+    def positions_at(self, t: float) -> List[Point]:
+        """Every rider's position ``t`` seconds after a common start; empty on an empty course."""
+
+        if not self.geometry.points:
+            return []
+        return [self._unit.position_at(t * rider.base_speed) for rider in self.riders]
+
+    def iter_positions(self, *, frame_rate: float = 30.0) -> Iterator[List[Point]]:
+        """Advance all riders together, yielding their positions each timestep.
+
+        Riders that have finished stay at the end of the course; iteration
+        stops once the slowest rider arrives.
+        """
+
+        if frame_rate <= 0:
+            raise ValueError("frame_rate must be positive")
+        geometry = self.geometry
+        if not self.riders or not geometry.points:
+            return
+        if len(geometry.points) < 2:
+            yield [geometry.points[0]] * len(self.riders)
+            return
+        timestep = 1.0 / frame_rate
+        unit_duration = geometry.unit_times[-1]
+        last = len(geometry.factors) - 1
+        cursors = [0] * len(self.riders)
+        speeds = [rider.base_speed for rider in self.riders]
+        slowest = unit_duration / min(speeds)
+        count = _sample_count(slowest, timestep)
+        for idx in range(count):
+            t = slowest if idx == count - 1 else idx * timestep
+            positions: List[Point] = []
+            for rider_idx, speed in enumerate(speeds):
+                u = min(unit_duration, t * speed)
+                segment = cursors[rider_idx]
+                while segment < last and geometry.unit_times[segment + 1] <= u:
+                    segment += 1
+                cursors[rider_idx] = segment
+                positions.append(self._unit._position_in(segment, u))
+            yield positions
+
+
+def _speed_factors(distances: List[float]) -> List[float]:
+    # Longer-than-average segments stand in for downhill stretches: the
+    # speed factor eases towards them and never drops below a quarter.
     if not distances:
         return []
     mean_distance = sum(distances) / len(distances)
-    velocity = base_speed
-    velocities: List[float] = []
+    factor = 1.0
+    factors: List[float] = []
     for distance in distances:
         slope_factor = 1.0 + 0.3 * (distance - mean_distance)
-        velocity = max(0.5, velocity * 0.9 + slope_factor * 0.1)
-        velocities.append(float(velocity))
-    return velocities
+        factor = max(0.25, factor * 0.9 + slope_factor * 0.1)
+        factors.append(factor)
+    return factors
+
+
+def _sample_count(duration: float, timestep: float) -> int:
+    """Samples every ``timestep`` up to ``duration``, plus the end if it falls between."""
+
+    count = int(duration / timestep)
+    if duration - count * timestep > timestep * 1e-6:
+        return count + 2
+    return count + 1
+
+
+def _sample(trajectory: Trajectory, timestep: float) -> tuple[PointBuffer, array, array]:
+    """Sample every ``timestep`` seconds plus the end of the run.
 
+    Sample times only increase, so the current segment is advanced in step
+    with them instead of being searched for each sample.
+    """
 
-def _interpolate_path(points: List[Point], distances: List[float]) -> List[Point]:
-    interpolated: List[Point] = [points[0]]
-    for (x0, y0), (x1, y1), dist in zip(points[:-1], points[1:], distances):
-        steps = max(1, int(round(dist)))
-        for step in range(1, steps + 1):
-            t = step / (steps + 1)
-            interpolated.append((x0 + (x1 - x0) * t, y0 + (y1 - y0) * t))
-    interpolated.append(points[-1])
-    return interpolated
+    points = trajectory.points
+    if len(points) < 2:
+        return points[:], array("d", [0.0] * len(points)), array("d", [0.0] * len(points))
+    duration = trajectory.duration
+    count = _sample_count(duration, timestep)
+    sample_times = array("d", (idx * timestep for idx in range(count - 1)))
+    sample_times.append(duration)
+    times, speeds = trajectory.times, trajectory.speeds
+    last = len(speeds) - 1
+    segment = 0
+    coordinates = array("f")
+    velocities = array("d")
+    for t in sample_times:
+        while segment < last and times[segment + 1] <= t:
+            segment += 1
+        coordinates.extend(trajectory._position_in(segment, t))
+        velocities.append(speeds[segment])
+    return PointBuffer.wrap(coordinates), velocities, sample_times
 
 
-def _generate_tricks(path: List[Point], trick_interval: int) -> List[TrickEvent]:
+def _generate_tricks(sample_count: int, trick_interval: int) -> List[TrickEvent]:
     if trick_interval <= 0:
         return []
     events: List[TrickEvent] = []
-    for idx in range(trick_interval, len(path), trick_interval):
+    for idx in range(trick_interval, sample_count, trick_interval):
         name = "kickflip" if idx % (2 * trick_interval) == 0 else "ollie"
         events.append(TrickEvent(frame=idx, name=name))
     return events
@@ -1,11 +1,25 @@
 """High level orchestration for the Edge Skate prototype pipeline."""
 from __future__ import annotations
 
-from dataclasses import dataclass
+import dataclasses
+import functools
+import multiprocessing.util
+import os
+import shutil
+import time
+import weakref
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable, List
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar
 
-from . import media, preprocessing, edge_detection, course_generation, physics, rendering, export
+from . import cache as stage_cache
+from . import media, preprocessing, edge_detection, course_generation, course_graph, physics, rendering, export, profiling
+
+T = TypeVar("T")
+
+
+BACKENDS = ("python", "numpy")
 
 
 @dataclass
@@ -14,11 +28,62 @@ class PipelineConfig:
 
     target_resolution: tuple[int, int] = (128, 128)
     denoise_strength: float = 0.25
+    resample: str = "nearest"
+    edge_mode: str = "sobel"
     edge_threshold: float = 0.25
     smoothing_factor: float = 0.5
-    base_speed: float = 2.0
+    course_spacing: float | None = None
+    course_strategy: str = "largest"
+    base_speed: float = 60.0
     trick_interval: int = 15
+    frame_rate: float = 30.0
     output_dir: Path = Path("output")
+    backend: str = "python"
+    edge_workers: int = 1
+    cache_entries: int = 0
+    cache_dir: Path | None = None
+    export_format: str = "binary"
+    export_queue: int = 0
+    profile: bool = False
+    profile_memory: bool = False
+    cprofile_stage: str | None = None
+    cprofile_output: Path | None = None
+
+    def __post_init__(self) -> None:
+        if self.backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {self.backend!r}; expected one of {BACKENDS}")
+        if self.resample not in preprocessing.RESAMPLE_MODES:
+            raise ValueError(
+                f"Unknown resample mode {self.resample!r}; expected one of {preprocessing.RESAMPLE_MODES}"
+            )
+        if self.edge_mode not in edge_detection.EDGE_MODES:
+            raise ValueError(
+                f"Unknown edge mode {self.edge_mode!r}; expected one of {edge_detection.EDGE_MODES}"
+            )
+        if self.course_strategy not in course_graph.COURSE_STRATEGIES:
+            raise ValueError(
+                f"Unknown course strategy {self.course_strategy!r}; expected one of {course_graph.COURSE_STRATEGIES}"
+            )
+        if self.cprofile_stage is not None and self.cprofile_stage not in profiling.STAGES:
+            raise ValueError(
+                f"Unknown stage {self.cprofile_stage!r}; expected one of {profiling.STAGES}"
+            )
+        if self.base_speed <= 0 or self.frame_rate <= 0:
+            raise ValueError("base_speed and frame_rate must be positive")
+        if self.export_queue < 0:
+            raise ValueError("export_queue must be zero (synchronous) or a positive session count")
+        if self.export_format not in export.EXPORT_FORMATS:
+            raise ValueError(
+                f"Unknown export format {self.export_format!r}; expected one of {export.EXPORT_FORMATS}"
+            )
+
+
+@dataclass
+class ReuseStats:
+    """Fraction of work skipped by incremental processing for one frame."""
+
+    edge_tiles_skipped: float
+    component_pixels_skipped: float
 
 
 @dataclass
@@ -30,60 +95,550 @@ class SessionArtifacts:
     course: course_generation.Course
     simulation: physics.SimulationResult
     overlay: str
+    reuse: ReuseStats | None = None
+    profile: profiling.SessionProfile | None = None
+
+
+@dataclass
+class SourceResult:
+    """Outcome of one source in a batch run."""
+
+    index: int
+    source: Path
+    output: Path | None = None
+    error: str | None = None
+    profile: profiling.SessionProfile | None = None
+    reuse: ReuseStats | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BatchReport:
+    """Per-source outcomes of :meth:`EdgeSkatePipeline.batch_run`, in input order.
+
+    :meth:`EdgeSkatePipeline.stream_run` reports one result per frame the
+    same way, with ``index`` counting frames of its single source.
+
+    ``batch_run`` used to return a list of output paths.  Iterating, indexing
+    and ``len()`` still act on that list (:attr:`outputs`), but failed sources
+    are now left out of it instead of raising; check :attr:`failures`.
+    """
+
+    results: List[SourceResult] = field(default_factory=list)
+
+    def __iter__(self) -> Iterator[Path]:
+        return iter(self.outputs)
+
+    def __len__(self) -> int:
+        return len(self.outputs)
+
+    def __getitem__(self, index: int) -> Path:
+        return self.outputs[index]
+
+    @property
+    def outputs(self) -> List[Path]:
+        return [result.output for result in self.results if result.output is not None]
+
+    @property
+    def failures(self) -> List[SourceResult]:
+        return [result for result in self.results if not result.ok]
+
+    def stage_totals(self) -> List[profiling.StageTiming]:
+        """Stage timings summed over every profiled session in the batch."""
+
+        return profiling.aggregate(result.profile for result in self.results if result.profile is not None)
+
+    def mean_reuse(self) -> ReuseStats | None:
+        """Work skipped by incremental streaming, averaged over frames (``None`` if not incremental)."""
+
+        stats = [result.reuse for result in self.results if result.reuse is not None]
+        if not stats:
+            return None
+        return ReuseStats(
+            edge_tiles_skipped=sum(item.edge_tiles_skipped for item in stats) / len(stats),
+            component_pixels_skipped=sum(item.component_pixels_skipped for item in stats) / len(stats),
+        )
+
+
+@dataclass
+class _TemporalState:
+    # Canny thresholds depend on the whole frame, so it is always recomputed.
+    edges: edge_detection.IncrementalEdgeDetector | None
+    # Only the "largest" course strategy can follow a single tracked component.
+    components: course_generation.IncrementalComponentTracker | None
 
 
 class EdgeSkatePipeline:
-    """Glues all pipeline steps together to mirror the README flow."""
+    """Glues all pipeline steps together to mirror the README flow.
+
+    ``tile_executor`` (``"process"`` or ``"thread"``) picks the pool used for
+    tiled edge detection; pipelines that themselves run inside a process
+    pool worker should use threads.
+    """
 
-    def __init__(self, config: PipelineConfig | None = None) -> None:
+    def __init__(
+        self,
+        config: PipelineConfig | None = None,
+        *,
+        cache: stage_cache.StageCache | None = None,
+        tile_executor: str = "process",
+    ) -> None:
+        if tile_executor not in ("thread", "process"):
+            raise ValueError("tile_executor must be 'thread' or 'process'")
         self.config = config or PipelineConfig()
         self.config.output_dir.mkdir(parents=True, exist_ok=True)
+        self._vectorized = _load_vectorized() if self.config.backend == "numpy" else None
+        if cache is None and (self.config.cache_entries > 0 or self.config.cache_dir is not None):
+            cache = stage_cache.StageCache(
+                max_entries=self.config.cache_entries or 64, directory=self.config.cache_dir
+            )
+        self.cache = cache
+        self._tile_pool_kind = tile_executor
+        self._tile_executor: Executor | None = None
+        self._tile_pool_finalizer: weakref.finalize | None = None
+        self.profiler: profiling.StageProfiler | None = None
+        self._export_profiler: profiling.StageProfiler | None = None
+        if self.config.profile or self.config.profile_memory or self.config.cprofile_stage:
+            stage = self.config.cprofile_stage
+            output = self.config.cprofile_output
+            if stage is not None and output is None:
+                output = self.config.output_dir / f"{stage}.prof"
+            background = self.config.export_queue > 0
+            self.profiler = profiling.StageProfiler(
+                trace_memory=self.config.profile_memory,
+                cprofile_stage=None if background and stage == "export" else stage,
+                cprofile_output=output,
+            )
+            self._export_profiler = self.profiler
+            if background:
+                # Queued exports run on the export thread while the main thread
+                # profiles the next session, so they get their own profiler.
+                # tracemalloc is process-wide, so it cannot attribute their
+                # memory and they record no peak.
+                self._export_profiler = profiling.StageProfiler(
+                    cprofile_stage="export" if stage == "export" else None,
+                    cprofile_output=output,
+                    cpu_clock=time.thread_time,
+                )
 
     def run(self, source: Path, *, export_name: str = "session") -> Path:
         """Execute the full pipeline for a given media source."""
 
-        artifacts = self.create_session(source)
-        export_path = export.export_session(
-            export.DirectoryWriter(self.config.output_dir),
-            export_name,
-            artifacts.processed_frame,
-            artifacts.edge_map,
-            artifacts.course,
-            artifacts.simulation,
-            artifacts.overlay,
-        )
-        return export_path
+        try:
+            artifacts = self.create_session(source)
+            return self.export_session(artifacts, export_name)
+        finally:
+            self._flush_profile()
 
-    def batch_run(self, sources: Iterable[Path]) -> List[Path]:
-        """Run the pipeline for multiple sources, returning output paths."""
+    def batch_run(self, sources: Iterable[Path], *, workers: int = 1) -> BatchReport:
+        """Run the pipeline for multiple sources, reporting each outcome.
 
-        results: List[Path] = []
-        for idx, source in enumerate(sources):
-            name = f"session_{idx:02d}"
-            results.append(self.run(source, export_name=name))
-        return results
+        With ``workers > 1`` sources are spread over a process pool whose
+        workers build their pipeline once.  Otherwise, a positive
+        ``config.export_queue`` writes each session on a background thread
+        while the next source is processed, with at most that many sessions
+        waiting on disk.  Results keep the input order and
+        ``session_{idx:02d}`` naming either way, and a failing source (or
+        export) is recorded in the report instead of aborting the batch.
+        """
+
+        sources = list(sources)
+        names = [f"session_{idx:02d}" for idx in range(len(sources))]
+        if workers > 1 and len(sources) > 1:
+            outcomes = self._parallel_outcomes(sources, names, workers)
+        elif self.config.export_queue:
+            outcomes = self._queued_outcomes(sources, names)
+        else:
+            outcomes = [_run_source(self, source, name) for source, name in zip(sources, names)]
+        self._flush_profile()
+        return BatchReport(
+            results=[
+                SourceResult(index=idx, source=source, output=output, error=error, profile=profile)
+                for idx, (source, (output, error, profile)) in enumerate(zip(sources, outcomes))
+            ]
+        )
 
     def create_session(self, source: Path) -> SessionArtifacts:
-        """Return in-memory artifacts for a media source without exporting."""
+        """Return in-memory artifacts for a media source without exporting.
+
+        When a stage cache is configured, preprocessing, edge detection and
+        course generation are looked up by source content and the config
+        fields each stage reads, so only stages downstream of a changed
+        setting are recomputed.
+        """
+
+        self._begin_profile()
+        if self.cache is None:
+            frame = self._timed("load", source, lambda: media.MediaLoader().load_frame(source))
+            return self._process(frame)
+        config = self.config
+        preprocess_key = stage_cache.stage_key(
+            stage_cache.source_key(source),
+            "preprocess",
+            config.target_resolution,
+            config.denoise_strength,
+            config.resample,
+            config.backend,
+        )
+
+        def load_and_preprocess() -> List[List[float]]:
+            frame = self._timed("load", source, lambda: media.MediaLoader().load_frame(source))
+            return as_rows(self._timed("preprocess", frame, lambda: self.preprocess(frame)))
+
+        processed = self.cache.fetch("preprocess", preprocess_key, load_and_preprocess)
+        edges_key = stage_cache.stage_key(preprocess_key, "edges", config.edge_mode, config.edge_threshold)
+        edges = self.cache.fetch(
+            "edges", edges_key, lambda: as_rows(self._timed("edges", processed, lambda: self.detect_edges(processed)))
+        )
+        course_key = stage_cache.stage_key(
+            edges_key, "course", config.smoothing_factor, config.course_spacing, config.course_strategy
+        )
+        course = self.cache.fetch(
+            "course", course_key, lambda: self._timed("course", edges, lambda: self.build_course(edges))
+        )
+        return self._assemble(processed, edges, course)
+
+    def stream(
+        self, frames: Path | Iterable[Any], *, incremental: bool = False
+    ) -> Iterator[SessionArtifacts]:
+        """Yield artifacts for each frame of a sequence as it is processed.
+
+        ``frames`` is either an iterable of frames or a path understood by
+        :meth:`MediaLoader.iter_frames`.  Frames are pulled one at a time and
+        no reference is kept once their artifacts are yielded, so long clips
+        run in constant memory.  With ``incremental`` set, edge detection and
+        component labelling only revisit regions that changed since the
+        previous frame and each artifact reports the work skipped.
+        """
+
+        if isinstance(frames, (str, Path)):
+            frames = media.MediaLoader().iter_frames(Path(frames))
+        temporal = None
+        if incremental:
+            temporal = _TemporalState(
+                edges=edge_detection.IncrementalEdgeDetector(threshold=self.config.edge_threshold)
+                if self.config.edge_mode == "sobel"
+                else None,
+                components=course_generation.IncrementalComponentTracker()
+                if self.config.course_strategy == "largest"
+                else None,
+            )
+        for frame in frames:
+            yield self.process_frame(frame, temporal=temporal)
+        self._flush_profile()
+
+    def stream_run(
+        self, source: Path, *, export_name: str = "session", incremental: bool = False
+    ) -> BatchReport:
+        """Stream a frame sequence, exporting one session per frame.
+
+        The report lists each frame's output and profile; it iterates over
+        the output paths like the list this method used to return.  With a
+        positive ``config.export_queue`` frames are written in the
+        background; the first failed write is raised once all have finished.
+        """
 
-        frame = media.MediaLoader().load_frame(source)
-        processed = preprocessing.preprocess_frame(
+        frames = enumerate(self.stream(source, incremental=incremental))
+        if not self.config.export_queue:
+            results = [
+                SourceResult(
+                    index=idx,
+                    source=Path(source),
+                    output=self.export_session(artifacts, f"{export_name}_{idx:04d}"),
+                    profile=artifacts.profile,
+                    reuse=artifacts.reuse,
+                )
+                for idx, artifacts in frames
+            ]
+            self._flush_profile()
+            return BatchReport(results=results)
+        with export.ExportQueue(max_pending=self.config.export_queue) as queue:
+            pending = [
+                (
+                    idx,
+                    artifacts.profile,
+                    artifacts.reuse,
+                    queue.submit(functools.partial(self.export_session, artifacts, f"{export_name}_{idx:04d}")),
+                )
+                for idx, artifacts in frames
+            ]
+        self._flush_profile()
+        return BatchReport(
+            results=[
+                SourceResult(
+                    index=idx, source=Path(source), output=future.result(), profile=profile, reuse=reuse
+                )
+                for idx, profile, reuse, future in pending
+            ]
+        )
+
+    def process_frame(self, frame: Any, *, temporal: _TemporalState | None = None) -> SessionArtifacts:
+        """Return in-memory artifacts for an already loaded frame."""
+
+        self._begin_profile()
+        return self._process(frame, temporal=temporal)
+
+    def preprocess(self, frame: Any) -> Any:
+        """Resize and denoise ``frame`` with the configured backend.
+
+        The result is in the backend's native form (rows of floats, or a
+        numpy array); :func:`as_rows` converts it for the list-based stages.
+        """
+
+        backend = self._vectorized or preprocessing
+        return backend.preprocess_frame(
             frame,
             target_resolution=self.config.target_resolution,
             denoise_strength=self.config.denoise_strength,
+            resample=self.config.resample,
         )
-        edges = edge_detection.detect_edges(processed, threshold=self.config.edge_threshold)
-        course = course_generation.generate_course(edges, smoothing=self.config.smoothing_factor)
-        simulation = physics.simulate_run(
+
+    def detect_edges(self, processed: Any) -> Any:
+        """Edge map of a preprocessed frame, in the backend's native form."""
+
+        if self.config.edge_mode == "canny":
+            return (self._vectorized or edge_detection).detect_edges_canny(processed)
+        if self._vectorized is None and self.config.edge_workers > 1:
+            return edge_detection.detect_edges_tiled(
+                processed,
+                threshold=self.config.edge_threshold,
+                executor=self._tile_pool(),
+            )
+        backend = self._vectorized or edge_detection
+        return backend.detect_edges(processed, threshold=self.config.edge_threshold)
+
+    def build_course(self, edges: List[List[float]]) -> course_generation.Course:
+        """Course following an edge map with the configured strategy."""
+
+        return course_graph.build_course(
+            edges,
+            strategy=self.config.course_strategy,
+            smoothing=self.config.smoothing_factor,
+            spacing=self.config.course_spacing,
+        )
+
+    def export_session(self, artifacts: SessionArtifacts, export_name: str) -> Path:
+        """Write ``artifacts`` under ``config.output_dir`` as ``export_name``."""
+
+        writer = export.DirectoryWriter(self.config.output_dir)
+
+        def write() -> Path:
+            return export.stage_session(
+                writer,
+                export_name,
+                artifacts.processed_frame,
+                artifacts.edge_map,
+                artifacts.course,
+                artifacts.simulation,
+                artifacts.overlay,
+                format=self.config.export_format,
+            )
+
+        profiler = self._export_profiler
+        if profiler is None or artifacts.profile is None:
+            return writer.publish(write(), export_name)
+        # Exports may run after other sessions began (or on the export
+        # thread), so time them into the artifacts' own profile, which is
+        # written into the staging directory so it is published with it.
+        staging = profiler.measure("export", artifacts.simulation, write, into=artifacts.profile)
+        try:
+            profiling.write_profile(staging / "profile.json", artifacts.profile)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        return writer.publish(staging, export_name)
+
+    def _process(self, frame: Any, *, temporal: _TemporalState | None = None) -> SessionArtifacts:
+        reuse = None
+        if temporal is not None:
+            processed = as_rows(self._timed("preprocess", frame, lambda: self.preprocess(frame)))
+            detector = temporal.edges
+            if detector is None:
+                edges = as_rows(self._timed("edges", processed, lambda: self.detect_edges(processed)))
+            else:
+                edges = self._timed("edges", processed, lambda: detector.update(processed))
+            tracker = temporal.components
+            if tracker is None:
+                course = self._timed("course", edges, lambda: self.build_course(edges))
+            else:
+                course = self._timed(
+                    "course",
+                    edges,
+                    lambda: course_generation.course_from_component(
+                        tracker.update(edges),
+                        smoothing=self.config.smoothing_factor,
+                        spacing=self.config.course_spacing,
+                    ),
+                )
+            reuse = ReuseStats(
+                edge_tiles_skipped=detector.skipped_fraction if detector is not None else 0.0,
+                component_pixels_skipped=tracker.skipped_fraction if tracker is not None else 0.0,
+            )
+        else:
+            preprocessed = self._timed("preprocess", frame, lambda: self.preprocess(frame))
+            edges = as_rows(self._timed("edges", preprocessed, lambda: self.detect_edges(preprocessed)))
+            processed = as_rows(preprocessed)
+            course = self._timed("course", edges, lambda: self.build_course(edges))
+        return self._assemble(processed, edges, course, reuse=reuse)
+
+    def _assemble(
+        self,
+        processed: List[List[float]],
+        edges: List[List[float]],
+        course: course_generation.Course,
+        *,
+        reuse: ReuseStats | None = None,
+    ) -> SessionArtifacts:
+        simulation = self._timed(
+            "simulate",
             course,
-            base_speed=self.config.base_speed,
-            trick_interval=self.config.trick_interval,
+            lambda: physics.simulate_run(
+                course,
+                base_speed=self.config.base_speed,
+                trick_interval=self.config.trick_interval,
+                frame_rate=self.config.frame_rate,
+            ),
         )
-        overlay = rendering.render_overlay(processed, simulation.path)
+        overlay = self._timed("render", simulation, lambda: rendering.render_overlay(processed, simulation.path))
         return SessionArtifacts(
             processed_frame=processed,
             edge_map=edges,
             course=course,
             simulation=simulation,
             overlay=overlay,
+            reuse=reuse,
+            profile=self.profiler.current if self.profiler is not None else None,
         )
+
+    def _parallel_outcomes(
+        self, sources: List[Path], names: List[str], workers: int
+    ) -> List[_Outcome]:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(sources)),
+            initializer=_init_worker,
+            initargs=(self.config,),
+        ) as pool:
+            futures = [pool.submit(_run_in_worker, source, name) for source, name in zip(sources, names)]
+            return [_future_outcome(future) for future in futures]
+
+    def _queued_outcomes(self, sources: List[Path], names: List[str]) -> List[_Outcome]:
+        futures: List[Future] = []
+        with export.ExportQueue(max_pending=self.config.export_queue) as queue:
+            for source, name in zip(sources, names):
+                try:
+                    artifacts = self.create_session(source)
+                except Exception as exc:  # reported per source
+                    failed: Future = Future()
+                    failed.set_result((None, format_error(exc), None))
+                    futures.append(failed)
+                    continue
+                futures.append(queue.submit(functools.partial(_export_outcome, self, artifacts, name)))
+        return [_future_outcome(future) for future in futures]
+
+    def close(self) -> None:
+        """Shut down the tiled edge-detection pool, if one was started."""
+
+        if self._tile_pool_finalizer is not None:
+            self._tile_pool_finalizer()
+        self._tile_executor = None
+        self._tile_pool_finalizer = None
+
+    def __enter__(self) -> EdgeSkatePipeline:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _tile_pool(self) -> Executor:
+        # One pool serves every frame; pipelines inside batch workers use
+        # threads so they do not nest process pools.
+        if self._tile_executor is None:
+            pool_type = ProcessPoolExecutor if self._tile_pool_kind == "process" else ThreadPoolExecutor
+            self._tile_executor = pool_type(max_workers=self.config.edge_workers)
+            self._tile_pool_finalizer = weakref.finalize(self, self._tile_executor.shutdown)
+        return self._tile_executor
+
+    def _flush_profile(self) -> None:
+        # cProfile statistics are cumulative, so they are written once per
+        # run rather than after every profiled stage.
+        for profiler in (self.profiler, self._export_profiler):
+            if profiler is not None:
+                profiler.flush()
+
+    def _begin_profile(self) -> None:
+        if self.profiler is not None:
+            self.profiler.begin()
+
+    def _timed(self, stage: str, source: Any, compute: Callable[[], T]) -> T:
+        if self.profiler is None:
+            return compute()
+        return self.profiler.measure(stage, source, compute)
+
+
+_Outcome = Tuple[Optional[Path], Optional[str], Optional[profiling.SessionProfile]]
+
+_WORKER_PIPELINE: EdgeSkatePipeline | None = None
+
+
+def _run_source(pipeline: EdgeSkatePipeline, source: Path, name: str) -> _Outcome:
+    try:
+        artifacts = pipeline.create_session(source)
+    except Exception as exc:  # reported per source
+        return None, format_error(exc), None
+    return _export_outcome(pipeline, artifacts, name)
+
+
+def _export_outcome(pipeline: EdgeSkatePipeline, artifacts: SessionArtifacts, name: str) -> _Outcome:
+    try:
+        return pipeline.export_session(artifacts, name), None, artifacts.profile
+    except Exception as exc:  # reported per source
+        return None, format_error(exc), None
+
+
+def format_error(exc: BaseException) -> str:
+    """One-line description of an error, as recorded in :class:`SourceResult`."""
+
+    return f"{type(exc).__name__}: {exc}"
+
+
+def _init_worker(config: PipelineConfig) -> None:
+    global _WORKER_PIPELINE
+    if config.cprofile_stage is not None:
+        # Give each worker its own cProfile dump instead of racing on one file.
+        output = config.cprofile_output or config.output_dir / f"{config.cprofile_stage}.prof"
+        config = dataclasses.replace(config, cprofile_output=output.with_name(f"{output.name}.{os.getpid()}"))
+    _WORKER_PIPELINE = EdgeSkatePipeline(config, tile_executor="thread")
+    # Workers never see the end of a batch; write their statistics when the
+    # pool shuts them down.
+    multiprocessing.util.Finalize(_WORKER_PIPELINE, _WORKER_PIPELINE._flush_profile, exitpriority=10)
+
+
+def _run_in_worker(source: Path, name: str) -> _Outcome:
+    assert _WORKER_PIPELINE is not None, "worker pipeline not initialised"
+    return _run_source(_WORKER_PIPELINE, source, name)
+
+
+def _future_outcome(future: Future) -> _Outcome:
+    try:
+        return future.result()
+    except Exception as exc:  # e.g. a worker process died
+        return None, format_error(exc), None
+
+
+def as_rows(frame: Any) -> List[List[float]]:
+    """Convert backend arrays to the list-of-rows form used downstream."""
+
+    return frame.tolist() if hasattr(frame, "tolist") else frame
+
+
+def _load_vectorized() -> Any:
+    try:
+        from . import vectorized
+    except ImportError as exc:
+        raise ImportError(
+            "The 'numpy' backend requires numpy; install edge-skate[fast]"
+        ) from exc
+    return vectorized
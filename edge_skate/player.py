@@ -5,44 +5,58 @@ import sys
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterator, TextIO
+from typing import Iterator, TextIO, Tuple
 
 from .pipeline import EdgeSkatePipeline, PipelineConfig, SessionArtifacts
 from .physics import TrickEvent
-from .rendering import render_overlay
+from .rendering import OverlayCanvas
 
 
 @dataclass
 class PlaybackFrame:
-    """Represents a single playback step."""
+    """Represents a single playback step.
+
+    ``lines`` holds the overlay rows and ``changed_rows`` the indices that
+    differ from the previous frame, so writers can redraw only those.
+    """
 
     index: int
-    overlay: str
+    lines: Tuple[str, ...]
     velocity: float | None = None
     trick_event: TrickEvent | None = None
+    changed_rows: Tuple[int, ...] = ()
+
+    @property
+    def overlay(self) -> str:
+        return "\n".join(self.lines)
 
 
-def iter_playback_frames(artifacts: SessionArtifacts) -> Iterator[PlaybackFrame]:
+def iter_playback_frames(
+    artifacts: SessionArtifacts, *, max_width: int | None = None
+) -> Iterator[PlaybackFrame]:
     """Yield ASCII overlays to animate the simulated run."""
 
+    canvas = OverlayCanvas(artifacts.processed_frame, max_width=max_width)
     path = artifacts.simulation.path
     if not path:
-        yield PlaybackFrame(index=0, overlay=render_overlay(artifacts.processed_frame, []))
+        yield PlaybackFrame(index=0, lines=canvas.lines, changed_rows=tuple(range(canvas.height)))
         return
 
     trick_lookup = {event.frame: event for event in artifacts.simulation.trick_events}
+    # Velocities are sampled alongside the path, one per point.
     velocities = artifacts.simulation.velocities
-    for idx in range(1, len(path) + 1):
-        segment = path[:idx]
-        overlay = render_overlay(artifacts.processed_frame, segment)
-        velocity = None
-        if velocities:
-            velocity = velocities[min(idx - 1, len(velocities) - 1)]
+    for idx, point in enumerate(path, start=1):
+        changed = canvas.stamp(point)
+        if idx == 1:
+            changed_rows = tuple(range(canvas.height))
+        else:
+            changed_rows = () if changed is None else (changed,)
         yield PlaybackFrame(
             index=idx,
-            overlay=overlay,
-            velocity=velocity,
+            lines=canvas.lines,
+            velocity=velocities[idx - 1] if velocities else None,
             trick_event=trick_lookup.get(idx),
+            changed_rows=changed_rows,
         )
 
 
@@ -53,37 +67,54 @@ def play(
     frame_delay: float = 0.15,
     stream: TextIO | None = None,
     clear_between_frames: bool = True,
+    max_width: int | None = None,
 ) -> SessionArtifacts:
-    """Run the pipeline for a source and stream a simple ASCII playback."""
+    """Run the pipeline for a source and stream a simple ASCII playback.
+
+    Playback frames are the simulation's fixed-timestep samples, so a
+    ``frame_delay`` of ``1 / config.frame_rate`` plays the run in real time.
+    """
 
     pipeline = EdgeSkatePipeline(config)
     artifacts = pipeline.create_session(source)
     target_stream = stream or sys.stdout
 
-    for frame in iter_playback_frames(artifacts):
-        _write_frame(target_stream, frame, clear_between_frames)
-        _sleep_for_frame(frame_delay, frame.velocity)
+    first = True
+    for frame in iter_playback_frames(artifacts, max_width=max_width):
+        if clear_between_frames:
+            _write_frame_diff(target_stream, frame, full=first)
+        else:
+            _write_frame(target_stream, frame)
+        first = False
+        if frame_delay > 0:
+            time.sleep(frame_delay)
 
     return artifacts
 
 
-def _write_frame(stream: TextIO, frame: PlaybackFrame, clear: bool) -> None:
-    if clear:
-        stream.write("\x1b[2J\x1b[H")
+def _write_frame(stream: TextIO, frame: PlaybackFrame) -> None:
     stream.write(frame.overlay)
     stream.write("\n")
+    _write_status(stream, frame)
+
+
+def _write_frame_diff(stream: TextIO, frame: PlaybackFrame, *, full: bool) -> None:
+    """Redraw only changed rows using cursor addressing."""
+
+    if full:
+        stream.write("\x1b[2J\x1b[H")
+        stream.write(frame.overlay)
+        stream.write("\n")
+    else:
+        for row in frame.changed_rows:
+            stream.write(f"\x1b[{row + 1};1H{frame.lines[row]}")
+        stream.write(f"\x1b[{len(frame.lines) + 1};1H\x1b[J")
+    _write_status(stream, frame)
+
+
+def _write_status(stream: TextIO, frame: PlaybackFrame) -> None:
     if frame.velocity is not None:
         stream.write(f"velocity: {frame.velocity:.2f}\n")
     if frame.trick_event:
         stream.write(f"trick: {frame.trick_event.name} (frame {frame.trick_event.frame})\n")
     stream.flush()
-
-
-def _sleep_for_frame(base_delay: float, velocity: float | None) -> None:
-    if base_delay <= 0:
-        return
-    delay = base_delay
-    if velocity and velocity > 0:
-        delay = base_delay / max(0.5, velocity)
-    time.sleep(delay)
-
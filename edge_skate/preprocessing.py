@@ -1,90 +1,153 @@
-"""Frame preprocessing mimicking noise removal and normalization."""
+"""Frame preprocessing mimicking noise removal and normalization.
+
+Preprocessing is fused into one streaming stage: the value range is taken
+from the source, each target row is resampled straight from the source with
+normalization folded in, and the Gaussian blur consumes those rows through a
+small ring buffer.  Only pixels that survive resampling are ever normalized,
+and peak memory stays close to one target-sized frame.
+"""
 from __future__ import annotations
 
 import math
-from typing import List
+from collections import deque
+from typing import Any, Deque, Iterator, List, Sequence, Tuple
 
 Matrix = List[List[float]]
 
+RESAMPLE_MODES = ("nearest", "area")
+
 
 def preprocess_frame(
     frame: Matrix,
     *,
     target_resolution: tuple[int, int],
     denoise_strength: float,
+    resample: str = "nearest",
 ) -> Matrix:
-    """Resize, normalize, and denoise the frame."""
+    """Resize, normalize, and denoise the frame.
 
-    normalized = _normalize(frame)
-    resized = _resize(normalized, target_resolution)
+    ``resample`` selects nearest-neighbour sampling or area averaging, which
+    gives better quality when downscaling.
+    """
+
+    if resample not in RESAMPLE_MODES:
+        raise ValueError(f"Unknown resample mode {resample!r}; expected one of {RESAMPLE_MODES}")
+    rows = _resampled_rows(frame, target_resolution, resample)
     if denoise_strength > 0:
         sigma = max(0.1, denoise_strength * 2)
-        return _gaussian_blur(resized, sigma)
-    return resized
+        return _blur_rows(rows, target_resolution[0], _gaussian_kernel(sigma))
+    return list(rows)
 
 
-def _normalize(frame: Matrix) -> Matrix:
+def _value_range(frame: Any) -> Tuple[float, float]:
     min_val = min(min(row) for row in frame)
     max_val = max(max(row) for row in frame)
-    if max_val - min_val < 1e-5:
-        return [[0.0 for _ in row] for row in frame]
-    scale = max_val - min_val
-    return [[(value - min_val) / scale for value in row] for row in frame]
+    return min_val, max_val
 
 
-def _resize(frame: Matrix, target_resolution: tuple[int, int]) -> Matrix:
+def _resampled_rows(frame: Any, target_resolution: tuple[int, int], resample: str) -> Iterator[List[float]]:
     target_h, target_w = target_resolution
     src_h = len(frame)
     src_w = len(frame[0]) if frame else 0
     if src_h == 0 or src_w == 0:
-        return [[0.0] * target_w for _ in range(target_h)]
-    scale_y = src_h / target_h
-    scale_x = src_w / target_w
-    resized: Matrix = []
-    for y in range(target_h):
-        src_y = min(src_h - 1, int(y * scale_y))
-        row: List[float] = []
-        for x in range(target_w):
-            src_x = min(src_w - 1, int(x * scale_x))
-            row.append(frame[src_y][src_x])
-        resized.append(row)
-    return resized
-
-
-def _gaussian_blur(frame: Matrix, sigma: float) -> Matrix:
+        for _ in range(target_h):
+            yield [0.0] * target_w
+        return
+    min_val, max_val = _value_range(frame)
+    if max_val - min_val < 1e-5:
+        for _ in range(target_h):
+            yield [0.0] * target_w
+        return
+    scale = max_val - min_val
+    if resample == "area":
+        row_bands = _area_bands(src_h, target_h)
+        col_bands = _area_bands(src_w, target_w)
+        for y0, y1 in row_bands:
+            column_sums = [float(value) for value in frame[y0]]
+            for y in range(y0 + 1, y1):
+                column_sums = [total + value for total, value in zip(column_sums, frame[y])]
+            prefix = [0.0]
+            for total in column_sums:
+                prefix.append(prefix[-1] + total)
+            count_y = y1 - y0
+            yield [
+                ((prefix[x1] - prefix[x0]) / (count_y * (x1 - x0)) - min_val) / scale
+                for x0, x1 in col_bands
+            ]
+        return
+    cols = _nearest_indices(src_w, target_w)
+    for src_y in _nearest_indices(src_h, target_h):
+        row = frame[src_y]
+        yield [(row[src_x] - min_val) / scale for src_x in cols]
+
+
+def _nearest_indices(src: int, target: int) -> List[int]:
+    scale = src / target
+    return [min(src - 1, int(idx * scale)) for idx in range(target)]
+
+
+def _area_bands(src: int, target: int) -> List[Tuple[int, int]]:
+    """Source index ranges averaged into each target index.
+
+    Band edges use integer arithmetic so the last band always ends at
+    ``src``; float scaling can land just short of it and drop a row.
+    """
+
+    bands = []
+    for idx in range(target):
+        start = idx * src // target
+        stop = max(start + 1, (idx + 1) * src // target)
+        bands.append((start, stop))
+    return bands
+
+
+def _blur_rows(rows: Iterator[List[float]], height: int, kernel: Sequence[float]) -> Matrix:
+    """Separable Gaussian blur over a row stream with clamped borders.
+
+    Only ``len(kernel)`` input rows are held at once.  Per pixel, the
+    vertical pass runs before the horizontal one and terms are accumulated
+    in kernel order, matching the classic two-pass convolution exactly.
+    """
+
+    radius = len(kernel) // 2
+    window: Deque[List[float]] = deque()
+    first_index = 0
+    last_row: List[float] = []
+    blurred: Matrix = []
+    for y in range(height):
+        needed = min(height - 1, y + radius)
+        while first_index + len(window) <= needed:
+            last_row = next(rows)
+            window.append(last_row)
+        while first_index < y - radius:
+            window.popleft()
+            first_index += 1
+        vertical = [0.0] * len(last_row)
+        for k, weight in enumerate(kernel):
+            src_y = min(height - 1, max(0, y + k - radius))
+            vertical = [total + value * weight for total, value in zip(vertical, window[src_y - first_index])]
+        blurred.append(_convolve_row(vertical, kernel))
+    return blurred
+
+
+def _convolve_row(row: List[float], kernel: Sequence[float]) -> List[float]:
+    radius = len(kernel) // 2
+    width = len(row)
+    if not width:
+        return []
+    padded = [row[0]] * radius + row + [row[-1]] * radius
+    result = [0.0] * width
+    for k, weight in enumerate(kernel):
+        result = [total + value * weight for total, value in zip(result, padded[k : k + width])]
+    return result
+
+
+def _gaussian_kernel(sigma: float) -> List[float]:
     radius = max(1, int(math.ceil(3 * sigma)))
     kernel = [_gaussian_value(x, sigma) for x in range(-radius, radius + 1)]
     norm = sum(kernel)
-    kernel = [value / norm for value in kernel]
-    vertical = _convolve1d(frame, kernel, axis=0)
-    return _convolve1d(vertical, kernel, axis=1)
+    return [value / norm for value in kernel]
 
 
 def _gaussian_value(x: int, sigma: float) -> float:
     return math.exp(-(x ** 2) / (2 * sigma ** 2))
-
-
-def _convolve1d(frame: Matrix, kernel: List[float], axis: int) -> Matrix:
-    height = len(frame)
-    width = len(frame[0]) if frame else 0
-    radius = len(kernel) // 2
-    result = [[0.0 for _ in range(width)] for _ in range(height)]
-    if axis == 0:
-        for y in range(height):
-            for x in range(width):
-                accum = 0.0
-                for k, weight in enumerate(kernel):
-                    offset = k - radius
-                    src_y = min(height - 1, max(0, y + offset))
-                    accum += frame[src_y][x] * weight
-                result[y][x] = accum
-    else:
-        for y in range(height):
-            for x in range(width):
-                accum = 0.0
-                for k, weight in enumerate(kernel):
-                    offset = k - radius
-                    src_x = min(width - 1, max(0, x + offset))
-                    accum += frame[y][src_x] * weight
-                result[y][x] = accum
-    return result
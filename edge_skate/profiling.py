@@ -0,0 +1,210 @@
+"""Per-stage timing and memory instrumentation for pipeline sessions."""
+from __future__ import annotations
+
+import cProfile
+import json
+import os
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, TypeVar
+
+T = TypeVar("T")
+
+STAGES = ("load", "preprocess", "edges", "course", "simulate", "render", "export")
+
+
+@dataclass
+class StageTiming:
+    """Measurements for one stage of one session (or a sum over sessions).
+
+    Sizes count elements: pixels for frames, points for courses and paths,
+    characters for overlays and bytes for files on disk.  ``peak_memory`` is
+    in bytes and only recorded when memory tracing is enabled.
+    """
+
+    stage: str
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    peak_memory: int | None = None
+    input_size: int = 0
+    output_size: int = 0
+    calls: int = 1
+
+
+@dataclass
+class SessionProfile:
+    """Stage timings of one session, in execution order."""
+
+    stages: List[StageTiming] = field(default_factory=list)
+
+    @property
+    def wall_time(self) -> float:
+        return sum(timing.wall_time for timing in self.stages)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"wall_time": self.wall_time, "stages": [asdict(timing) for timing in self.stages]}
+
+
+class StageProfiler:
+    """Record wall time, CPU time, peak memory and sizes for each stage.
+
+    ``trace_memory`` enables :mod:`tracemalloc` (noticeably slower), and
+    ``cprofile_stage`` runs every call of that stage under :mod:`cProfile`;
+    :meth:`flush` writes the cumulative statistics to ``cprofile_output``.
+    Memory tracing is only active while a stage runs, unless something else
+    already started :mod:`tracemalloc`.  A profiler is not
+    thread-safe; use one per thread.  ``cpu_clock`` defaults to process CPU
+    time; a profiler used off the main thread should pass
+    :func:`time.thread_time` so it does not count the main thread's work.
+    """
+
+    def __init__(
+        self,
+        *,
+        trace_memory: bool = False,
+        cprofile_stage: str | None = None,
+        cprofile_output: Path | None = None,
+        cpu_clock: Callable[[], float] = time.process_time,
+    ) -> None:
+        if cprofile_stage is not None and cprofile_output is None:
+            raise ValueError("cprofile_output is required when cprofile_stage is set")
+        self.trace_memory = trace_memory
+        self.cprofile_stage = cprofile_stage
+        self.cprofile_output = cprofile_output
+        self.cpu_clock = cpu_clock
+        self.current = SessionProfile()
+        self._cprofile = cProfile.Profile() if cprofile_stage else None
+        self._unflushed = False
+
+    def begin(self) -> SessionProfile:
+        """Start recording a new session and return its profile."""
+
+        self.current = SessionProfile()
+        return self.current
+
+    def measure(
+        self, stage: str, source: Any, compute: Callable[[], T], *, into: SessionProfile | None = None
+    ) -> T:
+        """Run ``compute`` and record its timing in ``into`` (default: the current session)."""
+
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        baseline = 0
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        profiler = self._cprofile if stage == self.cprofile_stage else None
+        wall_start = time.perf_counter()
+        cpu_start = self.cpu_clock()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            result = compute()
+            peak = tracemalloc.get_traced_memory()[1] - baseline if self.trace_memory else None
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                self._unflushed = True
+            if started_tracing:
+                tracemalloc.stop()
+        cpu_time = self.cpu_clock() - cpu_start
+        wall_time = time.perf_counter() - wall_start
+        (into or self.current).stages.append(
+            StageTiming(
+                stage=stage,
+                wall_time=wall_time,
+                cpu_time=cpu_time,
+                peak_memory=peak,
+                input_size=size_of(source),
+                output_size=size_of(result),
+            )
+        )
+        return result
+
+    def flush(self) -> None:
+        """Write cProfile statistics gathered since the last flush, if any."""
+
+        if self._cprofile is None or not self._unflushed:
+            return
+        assert self.cprofile_output is not None
+        Path(self.cprofile_output).parent.mkdir(parents=True, exist_ok=True)
+        self._cprofile.dump_stats(str(self.cprofile_output))
+        self._unflushed = False
+
+
+def size_of(obj: Any) -> int:
+    """Element count used for stage input/output sizes."""
+
+    if obj is None:
+        return 0
+    if isinstance(obj, Path):
+        if obj.is_dir():
+            return sum(child.stat().st_size for child in obj.iterdir() if child.is_file())
+        return obj.stat().st_size if obj.exists() else 0
+    shape = getattr(obj, "shape", None)
+    if isinstance(shape, tuple):
+        total = 1
+        for dim in shape:
+            total *= dim
+        return total
+    points = getattr(obj, "points", None)
+    if points is not None and not callable(points):
+        return len(points)
+    path = getattr(obj, "path", None)
+    if path is not None:
+        return len(path)
+    if isinstance(obj, (str, bytes)):
+        return len(obj)
+    try:
+        first = obj[0] if len(obj) else None
+    except TypeError:
+        return 0
+    if first is not None and hasattr(first, "__len__") and not isinstance(first, (str, tuple)):
+        return len(obj) * len(first)
+    return len(obj)
+
+
+def aggregate(profiles: Iterable[SessionProfile]) -> List[StageTiming]:
+    """Sum stage timings across sessions; peak memory keeps the maximum."""
+
+    totals: Dict[str, StageTiming] = {}
+    for profile in profiles:
+        for timing in profile.stages:
+            total = totals.get(timing.stage)
+            if total is None:
+                totals[timing.stage] = StageTiming(**asdict(timing))
+                continue
+            total.wall_time += timing.wall_time
+            total.cpu_time += timing.cpu_time
+            total.input_size += timing.input_size
+            total.output_size += timing.output_size
+            total.calls += timing.calls
+            if timing.peak_memory is not None:
+                total.peak_memory = max(total.peak_memory or 0, timing.peak_memory)
+    return list(totals.values())
+
+
+def format_summary(timings: Iterable[StageTiming]) -> str:
+    """Render stage timings as a fixed-width table."""
+
+    timings = list(timings)
+    total_wall = sum(timing.wall_time for timing in timings) or 1.0
+    lines = [f"{'stage':<11}{'calls':>6}{'wall s':>10}{'cpu s':>10}{'share':>8}{'peak KiB':>10}{'in':>10}{'out':>10}"]
+    for timing in timings:
+        peak = f"{timing.peak_memory / 1024:.1f}" if timing.peak_memory is not None else "-"
+        lines.append(
+            f"{timing.stage:<11}{timing.calls:>6}{timing.wall_time:>10.4f}{timing.cpu_time:>10.4f}"
+            f"{timing.wall_time / total_wall:>8.1%}{peak:>10}{timing.input_size:>10}{timing.output_size:>10}"
+        )
+    return "\n".join(lines)
+
+
+def write_profile(path: Path, profile: SessionProfile) -> None:
+    path = Path(path)
+    partial = path.with_name(f".{path.name}.tmp")
+    with partial.open("w", encoding="utf-8") as handle:
+        json.dump(profile.to_dict(), handle, indent=2)
+    os.replace(partial, path)
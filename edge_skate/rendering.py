@@ -1,7 +1,9 @@
 """Rendering helpers that produce ASCII overlays for the prototype."""
 from __future__ import annotations
 
-from typing import Iterable, List
+import math
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Tuple
 
 from .course_generation import Point
 
@@ -9,22 +11,105 @@ Matrix = List[List[float]]
 
 ASCII_MAP = list(" .:-=+*#%@")
 
+PATH_GLYPH = "S"
 
-def render_overlay(frame: Matrix, path: Iterable[Point]) -> str:
-    height = len(frame)
-    width = len(frame[0]) if frame else 0
-    display = [
-        [ASCII_MAP[_intensity_to_index(value)] for value in row]
-        for row in frame
-    ]
-    for x, y in path:
-        ix = min(width - 1, max(0, int(round(x)))) if width else 0
-        iy = min(height - 1, max(0, int(round(y)))) if height else 0
-        if height and width:
-            display[iy][ix] = "S"
-    return "\n".join("".join(row) for row in display)
-
-
-def _intensity_to_index(value: float) -> int:
-    clamped = max(0.0, min(1.0, value))
-    return min(int(clamped * (len(ASCII_MAP) - 1)), len(ASCII_MAP) - 1)
+# Glyph boundaries sit at multiples of 1/9, so quantizing intensities to
+# 1/252 steps (28 per glyph) lets one table lookup replace a per-pixel
+# clamp-multiply-index while picking exactly the same glyphs.
+_LUT_SCALE = 28 * (len(ASCII_MAP) - 1)
+_GLYPH_LUT = "".join(ASCII_MAP[min(level // 28, len(ASCII_MAP) - 1)] for level in range(_LUT_SCALE + 1))
+
+
+def render_overlay(frame: Matrix, path: Iterable[Point], *, max_width: int | None = None) -> str:
+    canvas = OverlayCanvas(frame, max_width=max_width)
+    for point in path:
+        canvas.stamp(point)
+    return canvas.render()
+
+
+class GlyphRenderer:
+    """Quantize frames into glyph rows through a lookup table, caching the result.
+
+    Background rows are cached per processed frame (by identity, holding a
+    reference so the identity stays valid) and per output step, so rendering
+    many overlays of one frame only stamps paths.  Frames must not be
+    mutated after they have been rendered.
+    """
+
+    def __init__(self, *, max_cached: int = 8) -> None:
+        self.max_cached = max_cached
+        self._cache: OrderedDict[Tuple[int, int], Tuple[Matrix, Tuple[str, ...]]] = OrderedDict()
+
+    def background(self, frame: Matrix, *, step: int = 1) -> Tuple[str, ...]:
+        key = (id(frame), step)
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] is frame:
+            self._cache.move_to_end(key)
+            return cached[1]
+        rows = tuple(_glyph_row(row[::step]) for row in frame[::step])
+        self._cache[key] = (frame, rows)
+        while len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+        return rows
+
+
+_DEFAULT_RENDERER = GlyphRenderer()
+
+
+class OverlayCanvas:
+    """ASCII overlay whose background is built once and stamped incrementally.
+
+    Each :meth:`stamp` marks one path cell and re-joins only the row it
+    touched, so animating a run costs O(width) per step rather than a full
+    redraw of the frame and path prefix.  With ``max_width`` the frame is
+    downsampled by a whole-pixel step so the overlay fits narrow terminals.
+    """
+
+    def __init__(
+        self,
+        frame: Matrix,
+        *,
+        max_width: int | None = None,
+        renderer: GlyphRenderer | None = None,
+    ) -> None:
+        source_width = len(frame[0]) if frame else 0
+        self.step = max(1, math.ceil(source_width / max_width)) if max_width else 1
+        lines = (renderer or _DEFAULT_RENDERER).background(frame, step=self.step)
+        self.height = len(lines)
+        self.width = len(lines[0]) if lines else 0
+        self._lines = list(lines)
+        self._cells: Dict[int, List[str]] = {}
+
+    @property
+    def lines(self) -> tuple[str, ...]:
+        return tuple(self._lines)
+
+    def stamp(self, point: Point) -> int | None:
+        """Mark ``point`` on the canvas, returning the row index if it changed."""
+
+        if not self.height or not self.width:
+            return None
+        x, y = point
+        ix = min(self.width - 1, max(0, int(round(x)) // self.step))
+        iy = min(self.height - 1, max(0, int(round(y)) // self.step))
+        row = self._cells.get(iy)
+        if row is None:
+            row = self._cells[iy] = list(self._lines[iy])
+        if row[ix] == PATH_GLYPH:
+            return None
+        row[ix] = PATH_GLYPH
+        self._lines[iy] = "".join(row)
+        return iy
+
+    def render(self) -> str:
+        return "\n".join(self._lines)
+
+
+def _glyph_row(row: Iterable[float]) -> str:
+    lut = _GLYPH_LUT
+    top = _LUT_SCALE
+    scale = float(_LUT_SCALE)
+    return "".join(
+        lut[int(value * scale)] if 0.0 <= value <= 1.0 else lut[0 if value < 0.0 else top]
+        for value in row
+    )
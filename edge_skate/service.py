@@ -0,0 +1,379 @@
+"""Long-running pipeline service speaking a JSON line protocol.
+
+``python -m edge_skate.cli serve`` reads one JSON request per line from
+stdin (or from each connection to ``--socket PATH``) and answers with one
+JSON line per request, in completion order::
+
+    {"id": 7, "source": "frame.json", "name": "upload_7", "config": {"edge_mode": "canny"}}
+    {"id": 7, "ok": true, "output": "output/upload_7", "error": null, "wait": 0.0, "run": 0.41, "latency": 0.41}
+
+``{"op": "stats"}`` reports queue depth, running jobs and latency
+percentiles.  An asyncio front end accepts requests while a worker pool
+runs them; each worker keeps warm :class:`EdgeSkatePipeline` instances (and
+their stage caches) per distinct ``config`` override, so repeated jobs skip
+interpreter startup, imports and pipeline construction.  Output, cache and
+profile paths belong to the service: requests cannot override them, and a
+job ``name`` must be a plain directory name inside ``--output``.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import dataclasses
+import itertools
+import json
+import sys
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, TextIO, Tuple
+
+from .export import EXPORT_FORMATS
+from .pipeline import BACKENDS, EdgeSkatePipeline, PipelineConfig, format_error
+
+# Where a job writes is fixed by the service, never by the client.
+_PATH_FIELDS = ("output_dir", "cache_dir", "cprofile_output")
+_CONFIG_FIELDS = frozenset(field.name for field in dataclasses.fields(PipelineConfig))
+
+# (output directory, error, seconds spent in the worker)
+_JobOutcome = Tuple[Optional[str], Optional[str], float]
+
+Response = Dict[str, Any]
+
+
+class PipelineService:
+    """Run pipeline jobs concurrently on a pool of warm pipelines.
+
+    ``workers`` above one uses a process pool; otherwise jobs run on a single
+    background thread.  At most ``workers`` jobs are handed to the pool at a
+    time, so jobs beyond that wait in the service and are counted as its
+    queue depth.
+    """
+
+    def __init__(
+        self,
+        config: PipelineConfig | None = None,
+        *,
+        workers: int = 1,
+        max_pipelines: int = 8,
+        history: int = 1000,
+    ) -> None:
+        self.config = config or PipelineConfig()
+        self.workers = max(1, workers)
+        self._executor: Executor
+        self._call: Callable[[str, str, str], _JobOutcome]
+        self._warm: _WarmPipelines | None = None
+        if self.workers > 1:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker, initargs=(self.config, max_pipelines)
+            )
+            self._call = _run_in_worker
+            # Start the workers now: forked lazily they would inherit open
+            # client sockets and keep those connections from closing.
+            self._executor.submit(_ready).result()
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+            self._warm = _WarmPipelines(self.config, max_pipelines)
+            self._call = self._warm.run
+        self._slots = asyncio.Semaphore(self.workers)
+        self._numbers = itertools.count()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._latencies: Deque[float] = deque(maxlen=history)
+
+    async def run_job(self, request: Dict[str, Any]) -> Response:
+        """Run one job request and describe its outcome.
+
+        Requests name a ``source`` and optionally an ``id`` to echo back, an
+        export ``name`` and ``config`` overrides of :class:`PipelineConfig`
+        fields other than paths.  Names must be a single path component
+        inside the service's output directory.  Invalid requests are answered
+        without being queued.
+        """
+
+        number = next(self._numbers)
+        job_id = request.get("id", number)
+        accepted = time.perf_counter()
+        try:
+            source = str(request["source"])
+            overrides = dict(request.get("config") or {})
+            _job_config(self.config, overrides)
+            name = _session_name(request.get("name") or f"job_{number:06d}")
+        except (KeyError, TypeError, ValueError) as exc:
+            self._failed += 1
+            return {"id": job_id, "ok": False, "output": None, "error": format_error(exc)}
+        key = json.dumps(overrides, sort_keys=True)
+        loop = asyncio.get_running_loop()
+        self._queued += 1
+        waiting = True
+        try:
+            async with self._slots:
+                self._queued -= 1
+                waiting = False
+                started = time.perf_counter()
+                self._running += 1
+                try:
+                    output, error, _ = await loop.run_in_executor(self._executor, self._call, key, source, name)
+                except Exception as exc:  # e.g. a worker process died
+                    output, error = None, format_error(exc)
+                finally:
+                    self._running -= 1
+        finally:
+            if waiting:
+                self._queued -= 1
+        finished = time.perf_counter()
+        latency = finished - accepted
+        self._latencies.append(latency)
+        if error is None:
+            self._completed += 1
+        else:
+            self._failed += 1
+        return {
+            "id": job_id,
+            "ok": error is None,
+            "output": output,
+            "error": error,
+            "wait": started - accepted,
+            "run": finished - started,
+            "latency": latency,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, job counts and latency percentiles over recent jobs."""
+
+        latencies = sorted(self._latencies)
+        return {
+            "queue_depth": self._queued,
+            "running": self._running,
+            "workers": self.workers,
+            "completed": self._completed,
+            "failed": self._failed,
+            "latency": {
+                "count": len(latencies),
+                "mean": sum(latencies) / len(latencies) if latencies else 0.0,
+                "p50": _percentile(latencies, 0.5),
+                "p95": _percentile(latencies, 0.95),
+                "max": latencies[-1] if latencies else 0.0,
+            },
+        }
+
+    async def handle_line(self, line: str) -> Response | None:
+        """Answer one protocol line; blank lines get no response."""
+
+        if not line.strip():
+            return None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Requests must be JSON objects")
+        except ValueError as exc:
+            self._failed += 1
+            return {"id": None, "ok": False, "output": None, "error": format_error(exc)}
+        if request.get("op") == "stats":
+            return {"id": request.get("id"), "ok": True, "stats": self.stats()}
+        return await self.run_job(request)
+
+    async def serve(
+        self, read_line: Callable[[], Awaitable[str]], write_line: Callable[[str], Awaitable[None]]
+    ) -> None:
+        """Handle lines until ``read_line`` returns ``""``, then drain running jobs."""
+
+        tasks: set[asyncio.Task] = set()
+
+        async def respond(line: str) -> None:
+            response = await self.handle_line(line)
+            if response is not None:
+                await write_line(json.dumps(response))
+
+        while True:
+            line = await read_line()
+            if not line:
+                break
+            task = asyncio.ensure_future(respond(line))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        if self._warm is not None:
+            self._warm.close()
+
+    def __enter__(self) -> PipelineService:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+async def serve_stdio(service: PipelineService, stdin: TextIO = sys.stdin, stdout: TextIO = sys.stdout) -> None:
+    loop = asyncio.get_running_loop()
+    # readline blocks, so it gets its own thread rather than the default pool.
+    reader = ThreadPoolExecutor(max_workers=1)
+
+    async def read_line() -> str:
+        return await loop.run_in_executor(reader, stdin.readline)
+
+    async def write_line(text: str) -> None:
+        stdout.write(text + "\n")
+        stdout.flush()
+
+    try:
+        await service.serve(read_line, write_line)
+    finally:
+        reader.shutdown(wait=False)
+
+
+async def serve_socket(service: PipelineService, path: Path) -> None:
+    """Serve the line protocol on a unix socket, one session per connection."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        lock = asyncio.Lock()
+
+        async def read_line() -> str:
+            return (await reader.readline()).decode("utf-8")
+
+        async def write_line(text: str) -> None:
+            async with lock:
+                writer.write(text.encode("utf-8") + b"\n")
+                await writer.drain()
+
+        try:
+            await service.serve(read_line, write_line)
+        finally:
+            writer.close()
+
+    server = await asyncio.start_unix_server(handle, path=str(path))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        Path(path).unlink(missing_ok=True)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="edge_skate.cli serve",
+        description="Run pipeline jobs sent as JSON lines on stdin or a unix socket",
+    )
+    parser.add_argument("--socket", type=Path, default=None, help="Listen on this unix socket instead of stdin")
+    parser.add_argument("--workers", type=int, default=1, help="Process pool size (1 runs jobs on a thread)")
+    parser.add_argument("--max-pipelines", type=int, default=8, help="Warm pipelines kept per worker")
+    parser.add_argument("--cache-entries", type=int, default=32, help="Stage cache entries per warm pipeline")
+    parser.add_argument("--output", type=Path, default=PipelineConfig.output_dir, help="Directory for exports")
+    parser.add_argument("--resolution", type=int, nargs=2, metavar=("H", "W"), default=(128, 128))
+    parser.add_argument("--export-format", choices=EXPORT_FORMATS, default="binary")
+    parser.add_argument("--backend", choices=BACKENDS, default="python", help="Frame-processing backend")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    config = PipelineConfig(
+        target_resolution=(args.resolution[0], args.resolution[1]),
+        output_dir=args.output,
+        backend=args.backend,
+        cache_entries=args.cache_entries,
+        export_format=args.export_format,
+    )
+    with PipelineService(config, workers=args.workers, max_pipelines=args.max_pipelines) as service:
+        try:
+            if args.socket is not None:
+                asyncio.run(serve_socket(service, args.socket))
+            else:
+                asyncio.run(serve_stdio(service))
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+class _WarmPipelines:
+    """Pipelines keyed by their config overrides, least recently used evicted."""
+
+    def __init__(self, base: PipelineConfig, max_pipelines: int, *, tile_executor: str = "process") -> None:
+        self.base = base
+        self.max_pipelines = max(1, max_pipelines)
+        self.tile_executor = tile_executor
+        self.pipelines: OrderedDict[str, EdgeSkatePipeline] = OrderedDict()
+
+    def get(self, key: str) -> EdgeSkatePipeline:
+        pipeline = self.pipelines.get(key)
+        if pipeline is not None:
+            self.pipelines.move_to_end(key)
+            return pipeline
+        pipeline = EdgeSkatePipeline(_job_config(self.base, json.loads(key)), tile_executor=self.tile_executor)
+        self.pipelines[key] = pipeline
+        while len(self.pipelines) > self.max_pipelines:
+            _, evicted = self.pipelines.popitem(last=False)
+            evicted.close()
+        return pipeline
+
+    def close(self) -> None:
+        for pipeline in self.pipelines.values():
+            pipeline.close()
+        self.pipelines.clear()
+
+    def run(self, key: str, source: str, name: str) -> _JobOutcome:
+        start = time.perf_counter()
+        try:
+            output = str(self.get(key).run(Path(source), export_name=name))
+        except Exception as exc:  # reported per job
+            return None, format_error(exc), time.perf_counter() - start
+        return output, None, time.perf_counter() - start
+
+
+_WORKER_PIPELINES: _WarmPipelines | None = None
+
+
+def _init_worker(base: PipelineConfig, max_pipelines: int) -> None:
+    global _WORKER_PIPELINES
+    # Service workers are pool processes already; tiled edge detection
+    # inside them uses threads, as in batch_run workers.
+    _WORKER_PIPELINES = _WarmPipelines(base, max_pipelines, tile_executor="thread")
+
+
+def _run_in_worker(key: str, source: str, name: str) -> _JobOutcome:
+    assert _WORKER_PIPELINES is not None, "worker pipelines not initialised"
+    return _WORKER_PIPELINES.run(key, source, name)
+
+
+def _ready() -> bool:
+    return True
+
+
+def _job_config(base: PipelineConfig, overrides: Dict[str, Any]) -> PipelineConfig:
+    """Apply JSON ``overrides`` to ``base``; path fields cannot be overridden."""
+
+    unknown = set(overrides) - _CONFIG_FIELDS
+    if unknown:
+        raise ValueError(f"Unknown config fields {sorted(unknown)}")
+    locked = set(overrides) & set(_PATH_FIELDS)
+    if locked:
+        raise ValueError(f"Config fields {sorted(locked)} are set by the service and cannot be overridden")
+    values = dict(overrides)
+    if "target_resolution" in values:
+        values["target_resolution"] = tuple(values["target_resolution"])
+    return dataclasses.replace(base, **values)
+
+
+def _session_name(name: Any) -> str:
+    """Validate a client-chosen session name as one component of the output directory."""
+
+    name = str(name)
+    if not name or "/" in name or "\\" in name or ".." in name or name.startswith("."):
+        raise ValueError(f"Invalid session name {name!r}; use a plain name without path separators")
+    return name
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
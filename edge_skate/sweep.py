@@ -0,0 +1,363 @@
+"""Parameter sweeps that share upstream pipeline stages between combinations.
+
+``python -m edge_skate.cli sweep SOURCE --threshold 0.1:0.4:0.1 --smoothing 0.2,0.5``
+evaluates every combination of the given values.  Combinations form a tree
+by stage: each preprocessing setting runs once per source, and each edge
+setting runs once per preprocessed frame (with one component labelling)
+before fanning out to the course settings.  Both levels of the tree run on
+a process pool, one job per (source, preprocessing setting) and then one
+per (preprocessed frame, edge setting).  Preprocessing jobs receive the
+source path and load the frame themselves, since loaded frames may be
+memory-mapped and cannot be sent to another process.  Each process builds
+one pipeline per distinct stage setting and reuses it for every source.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import dataclasses
+import itertools
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple, TypeVar
+
+from . import course_generation, course_graph, edge_detection, media
+from .pipeline import BACKENDS, EdgeSkatePipeline, PipelineConfig, as_rows, format_error
+from .preprocessing import RESAMPLE_MODES
+
+T = TypeVar("T")
+
+PREPROCESS_FIELDS = ("denoise_strength", "resample")
+EDGE_FIELDS = ("edge_mode", "edge_threshold")
+COURSE_FIELDS = ("smoothing_factor", "course_spacing", "course_strategy")
+SWEEP_FIELDS = PREPROCESS_FIELDS + EDGE_FIELDS + COURSE_FIELDS
+
+Params = Dict[str, Any]
+
+
+@dataclass
+class SweepResult:
+    """One parameter combination for one source.
+
+    ``runtime`` is what the combination would cost on its own: the time of
+    every stage on its path, including stages shared with other rows.
+    """
+
+    source: Path
+    params: Params
+    course_length: float = 0.0
+    course_points: int = 0
+    component_size: int = 0
+    runtime: float = 0.0
+    error: str | None = None
+
+
+@dataclass
+class _Preprocessed:
+    params: Params
+    frame: List[List[float]] | None
+    elapsed: float
+    error: str | None = None
+
+
+@dataclass
+class _EdgeJob:
+    config: PipelineConfig
+    frame: List[List[float]]
+    course_params: List[Params]
+    elapsed: float = 0.0
+
+
+@dataclass
+class _CourseOutcome:
+    params: Params
+    length: float
+    points: int
+    component_size: int
+    elapsed: float
+
+
+@dataclass
+class _EdgeOutcome:
+    courses: List[_CourseOutcome] = field(default_factory=list)
+    error: str | None = None
+
+
+def parse_values(text: str) -> List[float]:
+    """Parse ``a,b,c`` or an inclusive ``start:stop:step`` range."""
+
+    if ":" not in text:
+        return [float(value) for value in text.split(",") if value.strip()]
+    parts = [float(value) for value in text.split(":")]
+    if len(parts) != 3 or parts[2] <= 0 or parts[1] < parts[0]:
+        raise ValueError(f"Range {text!r} must be start:stop:step with step > 0 and stop >= start")
+    start, stop, step = parts
+    count = int((stop - start) / step + 1e-9) + 1
+    return [round(start + idx * step, 10) for idx in range(count)]
+
+
+def run_sweep(
+    sources: Sequence[Path],
+    grid: Dict[str, Sequence[Any]],
+    *,
+    config: PipelineConfig | None = None,
+    workers: int = 1,
+) -> List[SweepResult]:
+    """Evaluate every combination in ``grid`` for each source.
+
+    ``grid`` maps :data:`SWEEP_FIELDS` to candidate values; missing fields
+    keep the value from ``config``.  Results are ordered by source, then by
+    the combinations in field order.
+    """
+
+    unknown = set(grid) - set(SWEEP_FIELDS)
+    if unknown:
+        raise ValueError(f"Cannot sweep {sorted(unknown)}; expected fields from {SWEEP_FIELDS}")
+    base = config or PipelineConfig()
+    preprocess_params = _combinations(base, grid, PREPROCESS_FIELDS)
+    edge_params = _combinations(base, grid, EDGE_FIELDS)
+    course_params = _combinations(base, grid, COURSE_FIELDS)
+    for params in itertools.product(preprocess_params, edge_params, course_params):
+        # Validate every combination up front rather than inside a worker.
+        dataclasses.replace(base, **_merge(*params))
+
+    results: List[SweepResult] = []
+    try:
+        with _pool(workers) as pool:
+            done = iter(
+                pool.map(
+                    _preprocess_variant,
+                    [(base, source, params) for source in sources for params in preprocess_params],
+                )
+            )
+            preprocessed = [[next(done) for _ in preprocess_params] for _ in sources]
+            jobs = [
+                # Edge detection only reads the edge settings, so variants share pipelines.
+                _EdgeJob(dataclasses.replace(base, **edges), variant.frame, course_params, variant.elapsed)
+                for variants in preprocessed
+                for variant in variants
+                if variant.frame is not None
+                for edges in edge_params
+            ]
+            outcomes = iter(pool.map(_detect_and_route, jobs))
+            for source, variants in zip(sources, preprocessed):
+                for variant in variants:
+                    for edges in edge_params:
+                        outcome = next(outcomes) if variant.frame is not None else None
+                        results.extend(_rows(source, variant, edges, course_params, outcome))
+    finally:
+        _release_pipelines()
+    return results
+
+
+def format_table(results: Iterable[SweepResult]) -> str:
+    """Render sweep results as a fixed-width table."""
+
+    lines = [
+        f"{'source':<24}{'denoise':>8}{'resample':>9}{'edges':>7}{'thresh':>8}{'smooth':>8}{'spacing':>8}"
+        f"{'strategy':>10}{'length':>9}{'points':>7}{'comp':>7}{'ms':>9}"
+    ]
+    for result in results:
+        params = result.params
+        spacing = "-" if params["course_spacing"] is None else f"{params['course_spacing']:g}"
+        prefix = (
+            f"{result.source.name:<24}{params['denoise_strength']:>8g}{params['resample']:>9}"
+            f"{params['edge_mode']:>7}{params['edge_threshold']:>8g}{params['smoothing_factor']:>8g}{spacing:>8}"
+            f"{params['course_strategy']:>10}"
+        )
+        if result.error is not None:
+            lines.append(f"{prefix}  {result.error}")
+            continue
+        lines.append(
+            f"{prefix}{result.course_length:>9.1f}{result.course_points:>7}"
+            f"{result.component_size:>7}{result.runtime * 1000:>9.1f}"
+        )
+    return "\n".join(lines)
+
+
+def write_csv(path: Path, results: Sequence[SweepResult]) -> None:
+    columns = ["source", *SWEEP_FIELDS, "course_length", "course_points", "component_size", "runtime", "error"]
+    with Path(path).open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(columns)
+        for result in results:
+            writer.writerow(
+                [
+                    str(result.source),
+                    *(result.params[name] for name in SWEEP_FIELDS),
+                    result.course_length,
+                    result.course_points,
+                    result.component_size,
+                    result.runtime,
+                    result.error or "",
+                ]
+            )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="edge_skate.cli sweep",
+        description="Evaluate combinations of pipeline settings, sharing upstream stages",
+    )
+    parser.add_argument("sources", nargs="+", type=Path, help="Frame files to sweep over")
+    parser.add_argument("--output", type=Path, default=PipelineConfig.output_dir, help="Directory for sweep.csv")
+    parser.add_argument("--resolution", type=int, nargs=2, metavar=("H", "W"), default=(128, 128))
+    parser.add_argument("--denoise", type=parse_values, default=None, help="Values or start:stop:step")
+    parser.add_argument("--resample", choices=RESAMPLE_MODES, nargs="+", default=None)
+    parser.add_argument("--edge-mode", choices=edge_detection.EDGE_MODES, nargs="+", default=None)
+    parser.add_argument("--threshold", type=parse_values, default=None, help="Values or start:stop:step")
+    parser.add_argument("--smoothing", type=parse_values, default=None, help="Values or start:stop:step")
+    parser.add_argument("--spacing", type=parse_values, default=None, help="Values or start:stop:step")
+    parser.add_argument("--strategy", choices=course_graph.COURSE_STRATEGIES, nargs="+", default=None)
+    parser.add_argument("--workers", type=int, default=1, help="Process pool size")
+    parser.add_argument("--backend", choices=BACKENDS, default="python", help="Frame-processing backend")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    config = PipelineConfig(
+        target_resolution=(args.resolution[0], args.resolution[1]),
+        output_dir=args.output,
+        backend=args.backend,
+    )
+    candidates = {
+        "denoise_strength": args.denoise,
+        "resample": args.resample,
+        "edge_mode": args.edge_mode,
+        "edge_threshold": args.threshold,
+        "smoothing_factor": args.smoothing,
+        "course_spacing": args.spacing,
+        "course_strategy": args.strategy,
+    }
+    grid = {name: values for name, values in candidates.items() if values}
+    results = run_sweep(args.sources, grid, config=config, workers=args.workers)
+    print(format_table(results))
+    args.output.mkdir(parents=True, exist_ok=True)
+    write_csv(args.output / "sweep.csv", results)
+    return 1 if any(result.error for result in results) else 0
+
+
+def _combinations(base: PipelineConfig, grid: Dict[str, Sequence[Any]], names: Sequence[str]) -> List[Params]:
+    values = [list(grid.get(name) or [getattr(base, name)]) for name in names]
+    return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+
+def _merge(*parts: Params) -> Params:
+    merged: Params = {}
+    for part in parts:
+        merged.update(part)
+    return merged
+
+
+def _rows(
+    source: Path,
+    variant: _Preprocessed,
+    edges: Params,
+    course_params: List[Params],
+    outcome: _EdgeOutcome | None,
+) -> Iterator[SweepResult]:
+    error = variant.error if outcome is None else outcome.error
+    if error is not None:
+        for course in course_params:
+            yield SweepResult(source=source, params=_merge(variant.params, edges, course), error=error)
+        return
+    assert outcome is not None
+    for course in outcome.courses:
+        yield SweepResult(
+            source=source,
+            params=_merge(variant.params, edges, course.params),
+            course_length=course.length,
+            course_points=course.points,
+            component_size=course.component_size,
+            runtime=course.elapsed,
+        )
+
+
+def _preprocess_variant(job: Tuple[PipelineConfig, Path, Params]) -> _Preprocessed:
+    base, source, params = job
+    try:
+        frame, load_time = _timed(lambda: media.MediaLoader().load_frame(source))
+        pipeline = _pipeline(dataclasses.replace(base, **params))
+        processed, elapsed = _timed(lambda: as_rows(pipeline.preprocess(frame)))
+    except Exception as exc:  # reported per combination
+        return _Preprocessed(params, None, 0.0, format_error(exc))
+    return _Preprocessed(params, processed, load_time + elapsed)
+
+
+def _detect_and_route(job: _EdgeJob) -> _EdgeOutcome:
+    try:
+        pipeline = _pipeline(job.config)
+        edges, detect_time = _timed(lambda: as_rows(pipeline.detect_edges(job.frame)))
+        table, label_time = _timed(lambda: course_generation.label_components(edges))
+        size = table.largest.size if table.largest is not None else 0
+        outcome = _EdgeOutcome()
+        for params in job.course_params:
+            course, course_time = _timed(
+                lambda: course_graph.build_course(
+                    edges,
+                    strategy=params["course_strategy"],
+                    smoothing=params["smoothing_factor"],
+                    spacing=params["course_spacing"],
+                    components=table,
+                )
+            )
+            outcome.courses.append(
+                _CourseOutcome(
+                    params=params,
+                    length=course.length(),
+                    points=len(course.points),
+                    component_size=size,
+                    elapsed=job.elapsed + detect_time + label_time + course_time,
+                )
+            )
+        return outcome
+    except Exception as exc:  # reported per combination
+        return _EdgeOutcome(error=format_error(exc))
+
+
+# Pipelines built by this process, keyed by config, until the sweep ends.
+_PIPELINES: Dict[str, EdgeSkatePipeline] = {}
+
+
+def _pipeline(config: PipelineConfig) -> EdgeSkatePipeline:
+    key = repr(config)
+    pipeline = _PIPELINES.get(key)
+    if pipeline is None:
+        pipeline = _PIPELINES[key] = EdgeSkatePipeline(config)
+    return pipeline
+
+
+def _release_pipelines() -> None:
+    for pipeline in _PIPELINES.values():
+        pipeline.close()
+    _PIPELINES.clear()
+
+
+def _timed(compute: Callable[[], T]) -> Tuple[T, float]:
+    start = time.perf_counter()
+    result = compute()
+    return result, time.perf_counter() - start
+
+
+class _SerialExecutor:
+    def map(self, func: Callable[..., T], items: Iterable[Any]) -> Iterator[T]:
+        return map(func, items)
+
+    def __enter__(self) -> _SerialExecutor:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+
+def _pool(workers: int) -> Executor | _SerialExecutor:
+    if workers <= 1:
+        return _SerialExecutor()
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
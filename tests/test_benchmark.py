@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from edge_skate.benchmark import GENERATORS, SIZES, compare, main, read_results, run_benchmarks
+
+
+def test_generators_are_deterministic() -> None:
+    for name, generator in GENERATORS.items():
+        first = generator(12, 20, seed=3)
+        assert first.shape == (12, 20), name
+        assert first.buffer.tobytes() == generator(12, 20, seed=3).buffer.tobytes(), name
+
+
+def test_benchmark_run_and_compare(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setitem(SIZES, "tiny", (24, 32))
+    baseline = tmp_path / "baseline.json"
+    argv = ["--sizes", "tiny", "--generators", "line_art", "--resolution", "16", "16", "--repeat", "1"]
+    assert main(argv + ["--output", str(baseline)]) == 0
+    results = read_results(baseline)
+    assert {result.stage for result in results} == {
+        "preprocess", "edges", "course", "simulate", "render", "export", "end_to_end"
+    }
+
+    slower = run_benchmarks(generators=["line_art"], sizes=["tiny"], repeat=1)
+    for result in slower:
+        result.best = 10.0
+    regressions = compare(slower, results, threshold=0.5)
+    assert len(regressions) == len(results)
+    assert main(argv + ["--compare", str(baseline), "--threshold", "1000"]) == 0
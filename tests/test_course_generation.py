@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import math
+import pickle
+import random
+
+import pytest
+
+from edge_skate.course_generation import Course, PointBuffer, _distance, label_components, order_points, resample_path
+from edge_skate.edge_detection import detect_edges
+
+
+def test_order_points_walks_non_convex_shape_without_jumps() -> None:
+    # A "U" shape three pixels thick, listed in shuffled order.
+    pixels = [(float(x), float(y)) for y in range(12) for x in range(12) if x < 3 or x > 8 or y > 8]
+    random.Random(7).shuffle(pixels)
+    ordered = order_points(pixels)
+    assert len(ordered) < len(pixels)
+    assert all(_distance(a, b) <= 2 ** 0.5 for a, b in zip(ordered[:-1], ordered[1:]))
+    ends = {ordered[0][1], ordered[-1][1]}
+    assert ends == {0.0}, "expected the spine to run from one arm tip to the other"
+    assert order_points(sorted(pixels)) == ordered
+
+
+def test_order_points_traces_closed_contours_all_the_way_round() -> None:
+    disk = [[1.0 if (x - 32) ** 2 + (y - 32) ** 2 <= 400 else 0.0 for x in range(64)] for y in range(64)]
+    ring = label_components(detect_edges(disk, threshold=0.25)).largest.points()
+    random.Random(3).shuffle(ring)
+    ordered = order_points(ring)
+    steps = [_distance(a, b) for a, b in zip(ordered[:-1], ordered[1:])]
+    assert ordered[0] == ordered[-1], "expected a closed loop"
+    assert all(step <= 2 ** 0.5 for step in steps)
+    assert sum(steps) == pytest.approx(2 * math.pi * 20, rel=0.05)
+    assert order_points(sorted(ring)) == ordered
+
+
+def test_label_components_reports_sizes_and_bounding_boxes() -> None:
+    edge_map = [
+        [1, 1, 0, 0, 1],
+        [0, 0, 1, 0, 1],
+        [1, 0, 0, 0, 1],
+        [1, 0, 1, 1, 0],
+    ]
+    table = label_components(edge_map)
+    assert [(c.size, c.bbox) for c in table.components] == [
+        (3, (0, 0, 2, 1)),
+        (5, (2, 0, 4, 3)),
+        (2, (0, 2, 0, 3)),
+    ]
+    assert table.largest is table.components[1]
+    assert sorted(table.largest.points()) == [(2.0, 3.0), (3.0, 3.0), (4.0, 0.0), (4.0, 1.0), (4.0, 2.0)]
+
+
+def test_resample_path_normalizes_point_density() -> None:
+    dense = [(x * 0.1, 0.0) for x in range(101)] + [(10.0, y * 0.1) for y in range(1, 51)]
+    resampled = resample_path(dense, 0.5)
+    assert len(resampled) == 31
+    assert resampled[0] == dense[0] and resampled[-1] == dense[-1]
+    gaps = [_distance(a, b) for a, b in zip(resampled[:-1], resampled[1:])]
+    assert all(abs(gap - 0.5) < 1e-6 for gap in gaps)
+
+
+def test_point_grid_queries_match_brute_force() -> None:
+    rng = random.Random(3)
+    points = [(float(i), 10.0 * ((i // 7) % 2) + rng.uniform(-1, 1)) for i in range(60)]
+    course = Course(points=points)
+    grid = course.index()
+    assert course.index() is grid
+    for _ in range(50):
+        query = (rng.uniform(-20, 80), rng.uniform(-20, 30))
+        expected = min(range(len(points)), key=lambda idx: (_distance(query, points[idx]), idx))
+        assert grid.nearest(query) == expected
+        radius = rng.uniform(0, 8)
+        assert grid.within(query, radius) == [
+            idx for idx, point in enumerate(points) if _distance(query, point) <= radius
+        ]
+    assert grid.crossing((20.5, -5.0), (20.5, 15.0)) == [20]
+    assert grid.crossing((-5.0, 30.0), (70.0, 30.0)) == []
+
+
+def test_point_buffer_behaves_like_a_point_list() -> None:
+    points = [(0.0, 0.0), (3.0, 4.0), (3.0, 10.0), (6.5, 10.0)]
+    course = Course(points=points)
+    assert isinstance(course.points, PointBuffer)
+    assert course.points == points
+    assert list(course.points) == points
+    assert course.points[-1] == (6.5, 10.0)
+    assert course.points[1:3] == points[1:3]
+    assert course.points[::-2] == points[::-2]
+    assert course.length() == 14.5
+    assert pickle.loads(pickle.dumps(course)).points == points
+    view = PointBuffer.wrap(memoryview(course.points.data.tobytes()).cast("f"))
+    assert view == course.points
+    assert len(course.points.data) * course.points.data.itemsize == 8 * len(points)
+
+
+def test_point_buffer_compares_with_points_at_float32_precision() -> None:
+    points = [(0.1, 0.2), (1.0 / 3.0, 2.7)]
+    buffer = PointBuffer(points)
+    assert buffer == points and buffer == tuple(points)
+    assert list(buffer) != points, "iteration yields the stored float32 values"
+    assert buffer != [(0.1, 0.2), (1.0 / 3.0, 2.8)]
+    assert buffer != points[:1] and buffer != [(0.1, 0.2, 0.0), (1.0 / 3.0, 2.7)]
+    assert buffer != [(0.1, 0.2), "xy"]
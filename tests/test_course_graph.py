@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import pytest
+
+from edge_skate.course_generation import label_components
+from edge_skate.course_graph import build_course, build_course_graph
+
+
+def _blank(height: int, width: int) -> list[list[float]]:
+    return [[0.0] * width for _ in range(height)]
+
+
+def test_graph_bridges_nearby_endpoints_into_one_route() -> None:
+    edge_map = _blank(12, 40)
+    for x in range(0, 10):
+        edge_map[2][x] = 1.0
+    for x in range(13, 25):
+        edge_map[2][x] = 1.0
+    for y in range(4, 11):
+        edge_map[y][28] = 1.0
+    graph = build_course_graph(label_components(edge_map))
+    bridges = [edge for edge in graph.edges if edge.spine is None]
+    assert [(graph.node_point(edge.a), graph.node_point(edge.b)) for edge in bridges] == [
+        ((9.0, 2.0), (13.0, 2.0))
+    ]
+    route = graph.route("longest")
+    assert {route[0], route[-1]} == {(0.0, 2.0), (24.0, 2.0)}
+    longest = build_course(edge_map, strategy="longest", smoothing=0.3)
+    largest = build_course(edge_map, strategy="largest", smoothing=0.3)
+    assert longest.length() == pytest.approx(24.0)
+    assert largest.length() == pytest.approx(11.0)
+
+
+def test_smoothest_prefers_straight_spines_over_longer_zigzags() -> None:
+    edge_map = _blank(32, 40)
+    for x in range(2, 24):
+        edge_map[2][x] = 1.0
+    for y in range(6, 30):
+        phase = (y - 6) % 12
+        edge_map[y][2 + (phase if phase < 6 else 12 - phase)] = 1.0
+    graph = build_course_graph(label_components(edge_map), bridge_distance=0)
+    straight, zigzag = (edge for edge in graph.edges if edge.spine is not None)
+    assert zigzag.length > straight.length
+    assert zigzag.smooth_weight < straight.smooth_weight
+    assert all(y >= 6.0 for _, y in graph.route("longest"))
+    assert all(y == 2.0 for _, y in graph.route("smoothest"))
+
+
+def test_graph_route_scales_to_many_components() -> None:
+    edge_map = _blank(64, 256)
+    for row in range(2, 64, 4):
+        for col in range(0, 256, 8):
+            for x in range(col, col + 5):
+                edge_map[row][x] = 1.0
+    graph = build_course_graph(label_components(edge_map))
+    assert len(graph.spines) == 16 * 32
+    route = graph.route("longest")
+    assert len(route) > 32 * 5
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from edge_skate.edge_detection import detect_edges, detect_edges_canny, detect_edges_tiled
+
+
+def _ripple_frame(height: int, width: int) -> list[list[float]]:
+    return [[math.sin(x * 0.7) * math.cos(y * 0.4) + (x * y) % 7 * 0.05 for x in range(width)] for y in range(height)]
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+@pytest.mark.parametrize("tile_size", [1, 5, 16, 64])
+def test_tiled_detection_is_bit_identical(executor: str, tile_size: int) -> None:
+    frame = _ripple_frame(23, 31)
+    expected = detect_edges(frame, threshold=0.3)
+    tiled = detect_edges_tiled(frame, threshold=0.3, tile_size=tile_size, workers=2, executor=executor)
+    assert tiled == expected
+
+
+def _disk_frame(size: int, radius: float) -> list[list[float]]:
+    centre = (size - 1) / 2
+    return [
+        [1.0 if math.hypot(x - centre, y - centre) <= radius else 0.0 for x in range(size)] for y in range(size)
+    ]
+
+
+def test_canny_edges_are_single_pixel_wide() -> None:
+    step = [[0.0] * 10 + [1.0] * 10 for _ in range(12)]
+    assert all(row.count(1.0) == 1 for row in detect_edges_canny(step))
+
+    edges = detect_edges_canny(_disk_frame(32, 9.5))
+    assert sum(map(sum, edges)) > 40
+    for y in range(31):
+        for x in range(31):
+            assert edges[y][x] + edges[y][x + 1] + edges[y + 1][x] + edges[y + 1][x + 1] < 4
+
+
+def test_canny_hysteresis_links_fading_edges_and_ignores_flat_frames() -> None:
+    # Contrast fades down the frame; rows below the high threshold survive
+    # because they connect to the strong rows above.
+    fading = [[0.0] * 8 + [1.0 - y / 20] * 8 for y in range(16)]
+    assert all(row.count(1.0) == 1 for row in detect_edges_canny(fading))
+    assert detect_edges_canny([[0.5] * 8 for _ in range(8)]) == [[0.0] * 8 for _ in range(8)]
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from edge_skate.export import DirectoryWriter, ExportQueue, _pack_bits, _unpack_bits, load_session
+from edge_skate.pipeline import EdgeSkatePipeline, PipelineConfig
+
+
+def test_binary_export_round_trips_through_memory_map(tmp_path: Path) -> None:
+    config = PipelineConfig(target_resolution=(13, 11), trick_interval=5, output_dir=tmp_path)
+    pipeline = EdgeSkatePipeline(config)
+    artifacts = pipeline.create_session(Path("samples/sample_frame.json"))
+    target = pipeline.run(Path("samples/sample_frame.json"), export_name="binary")
+
+    assert not (target / "frame.json").exists()
+    session = load_session(target)
+    assert session.shape == (13, 11)
+    assert session.edge_map() == artifacts.edge_map
+    rows = session.frame_rows()
+    for row, expected in zip(rows, artifacts.processed_frame):
+        assert list(row) == pytest.approx(expected, rel=1e-6)
+    assert _flat(session.points()) == pytest.approx(_flat(artifacts.course.points), rel=1e-6)
+    assert _flat(session.points("path")) == pytest.approx(_flat(artifacts.simulation.path), rel=1e-6)
+    assert list(session.velocities) == pytest.approx(list(artifacts.simulation.velocities), rel=1e-6)
+    assert list(session.times) == pytest.approx(list(artifacts.simulation.times), rel=1e-6)
+    assert session.header["course"]["length"] == pytest.approx(artifacts.course.length())
+    assert len(session.header["trick_events"]) == len(artifacts.simulation.trick_events)
+
+
+def _flat(points: list[tuple[float, float]]) -> list[float]:
+    return [value for point in points for value in point]
+
+
+def test_bit_packing_matches_numpy_and_round_trips() -> None:
+    np = pytest.importorskip("numpy")
+    edges = [[float((x * 7 + y * 3) % 5 > 2) - 0.5 * (x == y) for x in range(13)] for y in range(7)]
+    packed = _pack_bits(edges)
+    assert len(packed) == (7 * 13 + 7) // 8
+    assert packed == _pack_bits(np.array(edges)) == np.packbits(np.array(edges) > 0).tobytes()
+    assert _unpack_bits(packed, 7 * 13) == [1.0 if value > 0 else 0.0 for row in edges for value in row]
+    assert _pack_bits([]) == b""
+
+
+def test_export_queue_applies_back_pressure_and_reports_errors() -> None:
+    queue = ExportQueue(max_pending=1)
+    release = threading.Event()
+    first = queue.submit(lambda: release.wait(5))
+    second = []
+    blocked = threading.Thread(target=lambda: second.append(queue.submit(lambda: 1 / 0)))
+    blocked.start()
+    blocked.join(0.2)
+    assert blocked.is_alive()
+    release.set()
+    blocked.join(5)
+    queue.close()
+    assert first.result() is True
+    assert isinstance(second[0].exception(), ZeroDivisionError)
+
+
+def test_directory_writer_prepare_returns_the_session_directory(tmp_path: Path) -> None:
+    writer = DirectoryWriter(tmp_path / "out")
+    target = writer.prepare("session")
+    assert target == tmp_path / "out" / "session" and target.is_dir()
+    (target / "keep.txt").write_text("kept", encoding="utf-8")
+    assert writer.prepare("session") == target and (target / "keep.txt").exists()
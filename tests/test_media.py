@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+import struct
+from pathlib import Path
+
+import pytest
+
+from edge_skate.media import FrameBuffer, MediaLoader, write_raw_frame
+from edge_skate.pipeline import EdgeSkatePipeline, PipelineConfig
+
+SAMPLE = Path("samples/sample_frame.json")
+
+
+def _sample_bytes() -> list[list[int]]:
+    frame = json.loads(SAMPLE.read_text(encoding="utf-8"))
+    return [[int(round(value * 255)) for value in row] for row in frame]
+
+
+def _write_npy(path: Path, frame: list[list[int]]) -> None:
+    header = f"{{'descr': '|u1', 'fortran_order': False, 'shape': ({len(frame)}, {len(frame[0])}), }}"
+    header += " " * (-(len(header) + 11) % 64) + "\n"
+    payload = bytes(value for row in frame for value in row)
+    path.write_bytes(b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode("latin1") + payload)
+
+
+def _write_pgm(path: Path, frame: list[list[int]], *, ascii_body: bool = False, maxval: int = 255) -> None:
+    height, width = len(frame), len(frame[0])
+    if ascii_body:
+        body = "\n".join(" ".join(str(value) for value in row) for row in frame).encode("ascii")
+        path.write_bytes(f"P2\n# sample\n{width} {height}\n{maxval}\n".encode("ascii") + body)
+    elif maxval > 255:
+        body = b"".join(struct.pack(">H", value * 257) for row in frame for value in row)
+        path.write_bytes(f"P5\n{width} {height}\n{maxval}\n".encode("ascii") + body)
+    else:
+        body = bytes(value for row in frame for value in row)
+        path.write_bytes(f"P5 {width} {height} {maxval}\n".encode("ascii") + body)
+
+
+def test_binary_formats_load_as_zero_copy_frames(tmp_path: Path) -> None:
+    frame = _sample_bytes()
+    write_raw_frame(tmp_path / "frame.raw", frame, typecode="B")
+    _write_npy(tmp_path / "frame.npy", frame)
+    _write_pgm(tmp_path / "frame.pgm", frame)
+    _write_pgm(tmp_path / "ascii.pgm", frame, ascii_body=True)
+    _write_pgm(tmp_path / "deep.pgm", frame, maxval=65535)
+    (tmp_path / "sniffed").write_bytes((tmp_path / "frame.npy").read_bytes())
+
+    loader = MediaLoader()
+    for name in ("frame.raw", "frame.npy", "frame.pgm", "ascii.pgm", "sniffed"):
+        loaded = loader.load_frame(tmp_path / name)
+        assert isinstance(loaded, FrameBuffer)
+        assert loaded.shape == (10, 10)
+        assert [list(row) for row in loaded] == frame
+    deep = loader.load_frame(tmp_path / "deep.pgm")
+    assert [list(row) for row in deep] == [[value * 257 for value in row] for row in frame]
+
+
+def test_ppm_is_converted_to_luminance(tmp_path: Path) -> None:
+    path = tmp_path / "color.ppm"
+    path.write_bytes(b"P6\n2 1\n255\n" + bytes([255, 0, 0, 0, 0, 255]))
+    loaded = MediaLoader().load_frame(path)
+    assert list(loaded[0]) == pytest.approx([0.299 * 255, 0.114 * 255], rel=1e-6)
+
+
+def test_raw_frames_feed_the_pipeline(tmp_path: Path) -> None:
+    frame = json.loads(SAMPLE.read_text(encoding="utf-8"))
+    write_raw_frame(tmp_path / "frame.raw", frame, typecode="d")
+    pipeline = EdgeSkatePipeline(PipelineConfig(target_resolution=(16, 16), output_dir=tmp_path))
+    expected = pipeline.create_session(SAMPLE)
+    assert pipeline.create_session(tmp_path / "frame.raw").edge_map == expected.edge_map
+
+
+def test_frame_buffer_validates_shape() -> None:
+    with pytest.raises(ValueError):
+        FrameBuffer(memoryview(bytes(6)), (2, 2))
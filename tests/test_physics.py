@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import pytest
+
+from edge_skate.course_generation import Course, _distance
+from edge_skate.physics import Rider, RiderBatch, build_trajectory, simulate_run
+
+
+def test_samples_follow_duration_and_frame_rate() -> None:
+    course = Course(points=[(0.0, 0.0), (30.0, 0.0), (30.0, 10.0), (30.0, 10.0), (0.0, 10.0)])
+    result = simulate_run(course, base_speed=20.0, trick_interval=4, frame_rate=10.0)
+    trajectory = result.trajectory
+    assert len(result.path) == len(result.velocities) == len(result.times)
+    assert trajectory.arc_lengths[-1] == pytest.approx(70.0)
+    assert len(result.times) == int(trajectory.duration * 10.0) + 2
+    assert result.times[1] == pytest.approx(0.1)
+    assert result.times[-1] == trajectory.duration
+    assert result.path[0] == (0.0, 0.0)
+    assert result.path[-1] == pytest.approx((0.0, 10.0))
+    for t, point, velocity in zip(result.times, result.path, result.velocities):
+        assert trajectory.position_at(t) == pytest.approx(point)
+        assert trajectory.velocity_at(t) == velocity
+    assert [event.frame for event in result.trick_events] == list(range(4, len(result.path), 4))
+    for event in result.trick_events:
+        snapped = course.points[event.course_index]
+        assert all(
+            _distance(result.path[event.frame], snapped) <= _distance(result.path[event.frame], point)
+            for point in course.points
+        )
+
+    doubled = simulate_run(course, base_speed=20.0, trick_interval=4, frame_rate=20.0)
+    assert len(doubled.path) == pytest.approx(2 * len(result.path), abs=2)
+
+
+def test_position_at_interpolates_within_a_segment() -> None:
+    trajectory = build_trajectory(Course(points=[(0.0, 0.0), (10.0, 0.0)]), base_speed=5.0)
+    assert trajectory.duration == pytest.approx(10.0 / trajectory.speeds[0])
+    assert trajectory.position_at(trajectory.duration / 2) == pytest.approx((5.0, 0.0))
+    assert trajectory.position_at(-1.0) == (0.0, 0.0)
+    assert trajectory.position_at(trajectory.duration + 1.0) == (10.0, 0.0)
+
+
+def test_single_point_course_yields_one_sample() -> None:
+    result = simulate_run(Course(points=[(2.0, 3.0)]), base_speed=1.0, trick_interval=5)
+    assert result.path == [(2.0, 3.0)]
+    assert list(result.velocities) == [0.0]
+    assert list(result.times) == [0.0]
+
+
+def test_empty_course_has_no_position() -> None:
+    empty = Course(points=[])
+    trajectory = build_trajectory(empty, base_speed=2.0)
+    assert trajectory.position_at(0.0) is None
+    assert trajectory.velocity_at(0.0) == 0.0 and trajectory.duration == 0.0
+    assert len(simulate_run(empty, base_speed=2.0, trick_interval=5).path) == 0
+    assert RiderBatch(empty, [Rider(base_speed=1.0, trick_interval=5)]).positions_at(1.0) == []
+
+
+def test_rider_batch_matches_individual_runs() -> None:
+    course = Course(points=[(0.0, 0.0), (12.0, 5.0), (20.0, 5.0), (20.0, 30.0)])
+    riders = [Rider(speed, interval) for speed in (7.0, 15.0, 40.0) for interval in (0, 3)]
+    batch = RiderBatch(course, riders)
+    for rider, summary in zip(riders, batch.results(frame_rate=12.0)):
+        single = simulate_run(
+            course, base_speed=rider.base_speed, trick_interval=rider.trick_interval, frame_rate=12.0
+        )
+        assert summary.sample_count == len(single.path)
+        assert summary.trick_count == len(single.trick_events)
+        assert summary.duration == pytest.approx(single.trajectory.duration)
+        assert summary.top_speed == pytest.approx(max(single.velocities))
+
+    frames = list(batch.iter_positions(frame_rate=12.0))
+    slowest = simulate_run(course, base_speed=7.0, trick_interval=0, frame_rate=12.0)
+    assert len(frames) == len(slowest.path)
+    for positions, expected in zip(frames, slowest.path):
+        assert positions[0] == pytest.approx(expected)
+    assert all(position == pytest.approx((20.0, 30.0)) for position in frames[-1])
+    reference = simulate_run(course, base_speed=15.0, trick_interval=0).trajectory
+    assert batch.positions_at(0.5)[2] == pytest.approx(reference.position_at(0.5))
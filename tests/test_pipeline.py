@@ -1,7 +1,10 @@
 import json
+import tracemalloc
 from pathlib import Path
 
-from edge_skate.pipeline import EdgeSkatePipeline, PipelineConfig
+from edge_skate import profiling
+from edge_skate.pipeline import EdgeSkatePipeline, PipelineConfig, as_rows
+from edge_skate.profiling import SessionProfile
 
 
 def test_pipeline_generates_outputs(tmp_path: Path) -> None:
@@ -14,6 +17,7 @@ def test_pipeline_generates_outputs(tmp_path: Path) -> None:
         base_speed=2.5,
         trick_interval=5,
         output_dir=tmp_path,
+        export_format="json",
     )
     pipeline = EdgeSkatePipeline(config)
     result_dir = pipeline.run(source, export_name="test")
@@ -24,3 +28,214 @@ def test_pipeline_generates_outputs(tmp_path: Path) -> None:
     assert len(course_data["points"]) > 0
     simulation_data = json.loads((result_dir / "simulation.json").read_text(encoding="utf-8"))
     assert simulation_data["velocities"], "expected non-empty velocity sequence"
+
+
+def test_stream_yields_artifacts_per_frame(tmp_path: Path) -> None:
+    frame = json.loads(Path("samples/sample_frame.json").read_text(encoding="utf-8"))
+    container = tmp_path / "clip.jsonl"
+    container.write_text("\n".join(json.dumps(frame) for _ in range(3)), encoding="utf-8")
+    pipeline = EdgeSkatePipeline(PipelineConfig(target_resolution=(16, 16), output_dir=tmp_path / "out"))
+    expected = pipeline.create_session(Path("samples/sample_frame.json"))
+    artifacts = list(pipeline.stream(container))
+    assert len(artifacts) == 3
+    assert all(item.edge_map == expected.edge_map for item in artifacts)
+    exported = pipeline.stream_run(container, export_name="clip")
+    assert [path.name for path in exported] == ["clip_0000", "clip_0001", "clip_0002"]
+
+
+def test_stage_methods_compose_into_a_session(tmp_path: Path) -> None:
+    frame = json.loads(Path("samples/sample_frame.json").read_text(encoding="utf-8"))
+    pipeline = EdgeSkatePipeline(PipelineConfig(target_resolution=(16, 16), output_dir=tmp_path))
+    expected = pipeline.process_frame(frame)
+    processed = as_rows(pipeline.preprocess(frame))
+    edges = as_rows(pipeline.detect_edges(processed))
+    course = pipeline.build_course(edges)
+    assert processed == expected.processed_frame and edges == expected.edge_map
+    assert course.points == expected.course.points
+    assert pipeline.export_session(expected, "staged") == tmp_path / "staged"
+
+
+def _moving_square_clip(size: int, steps: int) -> list[list[list[float]]]:
+    frames = []
+    for step in range(steps):
+        frame = [[0.0] * size for _ in range(size)]
+        for y in range(4, 12):
+            for x in range(4 + step, 12 + step):
+                frame[y][x] = 1.0
+        frame[size - 5][size - 5] = 0.5
+        frames.append(frame)
+    frames.append(frames[-1])
+    return frames
+
+
+def test_incremental_stream_matches_full_processing(tmp_path: Path) -> None:
+    config = PipelineConfig(target_resolution=(48, 48), denoise_strength=0.0, output_dir=tmp_path)
+    pipeline = EdgeSkatePipeline(config)
+    clip = _moving_square_clip(48, 4)
+    full = list(pipeline.stream(clip))
+    incremental = list(pipeline.stream(clip, incremental=True))
+    for expected, actual in zip(full, incremental):
+        assert actual.edge_map == expected.edge_map
+        assert actual.course.points == expected.course.points
+    assert incremental[0].reuse.edge_tiles_skipped == 0.0
+    assert incremental[1].reuse.edge_tiles_skipped > 0.5
+    assert incremental[-1].reuse.edge_tiles_skipped == 1.0
+    assert incremental[-1].reuse.component_pixels_skipped == 1.0
+
+
+def test_canny_mode_recomputes_edges_in_incremental_streams(tmp_path: Path) -> None:
+    config = PipelineConfig(target_resolution=(48, 48), denoise_strength=0.0, edge_mode="canny", output_dir=tmp_path)
+    pipeline = EdgeSkatePipeline(config)
+    clip = _moving_square_clip(48, 3)
+    full = list(pipeline.stream(clip))
+    incremental = list(pipeline.stream(clip, incremental=True))
+    for expected, actual in zip(full, incremental):
+        assert actual.edge_map == expected.edge_map
+        assert actual.reuse.edge_tiles_skipped == 0.0
+    sobel = EdgeSkatePipeline(PipelineConfig(target_resolution=(48, 48), denoise_strength=0.0, output_dir=tmp_path))
+    assert sum(map(sum, full[0].edge_map)) < sum(map(sum, sobel.process_frame(clip[0]).edge_map))
+
+
+def test_parallel_batch_run_keeps_order_and_reports_failures(tmp_path: Path) -> None:
+    broken = tmp_path / "broken.json"
+    broken.write_text("[]", encoding="utf-8")
+    sample = Path("samples/sample_frame.json")
+    pipeline = EdgeSkatePipeline(PipelineConfig(target_resolution=(16, 16), output_dir=tmp_path / "out"))
+    report = pipeline.batch_run([sample, broken, sample], workers=2)
+    assert [result.index for result in report.results] == [0, 1, 2]
+    assert [path.name for path in report.outputs] == ["session_00", "session_02"]
+    assert [failure.source for failure in report.failures] == [broken]
+    assert "ValueError" in report.failures[0].error
+    # Still usable where batch_run returned the list of output paths.
+    assert list(report) == report.outputs and len(report) == 2 and report[-1].name == "session_02"
+
+
+def test_tiled_edge_detection_reuses_one_pool(tmp_path: Path) -> None:
+    sample = Path("samples/sample_frame.json")
+    serial = EdgeSkatePipeline(PipelineConfig(target_resolution=(32, 32), output_dir=tmp_path / "serial"))
+    expected = serial.create_session(sample).edge_map
+    config = PipelineConfig(target_resolution=(32, 32), output_dir=tmp_path / "tiled", edge_workers=2)
+    with EdgeSkatePipeline(config) as pipeline:
+        assert pipeline.create_session(sample).edge_map == expected
+        pool = pipeline._tile_executor
+        assert pool is not None
+        assert pipeline.create_session(sample).edge_map == expected
+        assert pipeline._tile_executor is pool
+        report = pipeline.batch_run([sample, sample], workers=2)
+    assert pipeline._tile_executor is None
+    assert not report.failures
+
+
+def test_stage_cache_recomputes_only_changed_stages(tmp_path: Path) -> None:
+    source = Path("samples/sample_frame.json")
+    config = PipelineConfig(target_resolution=(16, 16), output_dir=tmp_path, cache_dir=tmp_path / "cache")
+    first = EdgeSkatePipeline(config).create_session(source)
+
+    sweep = PipelineConfig(
+        target_resolution=(16, 16), output_dir=tmp_path, cache_dir=tmp_path / "cache", base_speed=4.0
+    )
+    pipeline = EdgeSkatePipeline(sweep)
+    second = pipeline.create_session(source)
+    assert second.course.points == first.course.points
+    assert {stage: (s.hits, s.misses) for stage, s in pipeline.cache.stats().items()} == {
+        "preprocess": (1, 0),
+        "edges": (1, 0),
+        "course": (1, 0),
+    }
+
+    pipeline.config.edge_threshold = 0.4
+    pipeline.create_session(source)
+    stats = pipeline.cache.stats()
+    assert (stats["preprocess"].hits, stats["edges"].misses, stats["course"].misses) == (2, 1, 1)
+
+
+def test_profiling_records_every_stage(tmp_path: Path) -> None:
+    source = Path("samples/sample_frame.json")
+    config = PipelineConfig(
+        target_resolution=(16, 16),
+        output_dir=tmp_path,
+        profile_memory=True,
+        cprofile_stage="edges",
+    )
+    report = EdgeSkatePipeline(config).batch_run([source, source])
+    stages = [timing.stage for timing in report.results[0].profile.stages]
+    assert stages == ["load", "preprocess", "edges", "course", "simulate", "render", "export"]
+    preprocess = report.results[0].profile.stages[1]
+    assert preprocess.output_size == 16 * 16 and preprocess.peak_memory > 0
+    written = json.loads((report.outputs[0] / "profile.json").read_text(encoding="utf-8"))
+    assert [stage["stage"] for stage in written["stages"]] == stages
+    totals = {timing.stage: timing for timing in report.stage_totals()}
+    assert totals["edges"].calls == 2
+    assert (tmp_path / "edges.prof").exists()
+    assert not tracemalloc.is_tracing()
+    regrouped = profiling.aggregate([SessionProfile(stages=report.stage_totals())] * 3)
+    assert {timing.stage: timing.calls for timing in regrouped}["edges"] == 6
+
+
+def test_profiling_without_cprofile_writes_no_stats_file(tmp_path: Path) -> None:
+    config = PipelineConfig(target_resolution=(16, 16), output_dir=tmp_path, profile=True)
+    EdgeSkatePipeline(config).run(Path("samples/sample_frame.json"))
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["session"]
+
+
+def test_queued_exports_report_per_session_errors(tmp_path: Path) -> None:
+    broken = tmp_path / "broken.json"
+    broken.write_text("[]", encoding="utf-8")
+    sample = Path("samples/sample_frame.json")
+    out = tmp_path / "out"
+    (out / "session_02").mkdir(parents=True)
+    (out / "session_02" / "stale.txt").write_text("old", encoding="utf-8")
+    config = PipelineConfig(
+        target_resolution=(16, 16), output_dir=out, export_queue=1, profile_memory=True, cprofile_stage="export"
+    )
+    report = EdgeSkatePipeline(config).batch_run([sample, broken, sample])
+    assert [path.name for path in report.outputs] == ["session_00", "session_02"]
+    assert [failure.index for failure in report.failures] == [1]
+    assert not (out / "session_02" / "stale.txt").exists()
+    assert sorted(path.name for path in out.iterdir()) == ["export.prof", "session_00", "session_02"]
+    stages = report.results[0].profile.stages
+    assert stages[-1].stage == "export" and stages[-1].peak_memory is None
+    assert stages[1].peak_memory > 0
+    written = json.loads((out / "session_00" / "profile.json").read_text(encoding="utf-8"))
+    assert written["stages"][-1]["stage"] == "export"
+
+
+def test_cli_runs_with_default_and_explicit_options(tmp_path: Path) -> None:
+    from edge_skate.cli import main
+
+    base = ["samples/sample_frame.json", "--resolution", "16", "16"]
+    assert main(base + ["--output", str(tmp_path / "default")]) == 0
+    assert (tmp_path / "default" / "session_00").is_dir()
+    explicit = ["--course-strategy", "longest", "--edge-mode", "canny", "--speed", "30", "--frame-rate", "24"]
+    assert main(base + explicit + ["--output", str(tmp_path / "explicit")]) == 0
+    assert (tmp_path / "explicit" / "session_00").is_dir()
+
+
+def test_cli_prints_profile_summary_for_streams(tmp_path: Path, capsys) -> None:
+    from edge_skate.cli import main
+
+    frame = json.loads(Path("samples/sample_frame.json").read_text(encoding="utf-8"))
+    clip = tmp_path / "clip.jsonl"
+    clip.write_text("\n".join(json.dumps(frame) for _ in range(3)), encoding="utf-8")
+    argv = [str(clip), "--stream", "--profile", "--resolution", "16", "16", "--output", str(tmp_path / "out")]
+    for queue in ("0", "2"):
+        assert main(argv + ["--export-queue", queue]) == 0
+        table = capsys.readouterr().out.splitlines()
+        assert table[0].startswith("stage")
+        calls = {line.split()[0]: int(line.split()[1]) for line in table[1:]}
+        assert calls["preprocess"] == 3 and calls["export"] == 3
+
+
+def test_cli_reports_incremental_reuse_per_clip(tmp_path: Path, capsys) -> None:
+    from edge_skate.cli import main
+
+    clip = tmp_path / "clip.jsonl"
+    clip.write_text("\n".join(json.dumps(frame) for frame in _moving_square_clip(48, 4)), encoding="utf-8")
+    argv = [str(clip), "--stream", "--resolution", "48", "48", "--denoise", "0", "--output", str(tmp_path / "out")]
+    assert main(argv) == 0
+    assert capsys.readouterr().out == ""
+    assert main(argv + ["--incremental"]) == 0
+    (line,) = capsys.readouterr().out.splitlines()
+    assert line.startswith(f"{clip}: 5 frames, skipped ") and "of edge tiles" in line
+    skipped = float(line.split("skipped ")[1].split("%")[0])
+    assert skipped > 0
@@ -41,3 +41,22 @@ def test_play_streams_ascii_without_sleep(tmp_path: Path) -> None:
     output = stream.getvalue()
     assert artifacts.overlay in output
     assert "velocity:" in output
+
+
+def test_iter_playback_frames_reports_changed_rows(tmp_path: Path) -> None:
+    pipeline = _build_pipeline(tmp_path)
+    artifacts = pipeline.create_session(Path("samples/sample_frame.json"))
+    frames = list(iter_playback_frames(artifacts))
+    assert len(frames[0].changed_rows) == len(artifacts.processed_frame)
+    for previous, current in zip(frames[:-1], frames[1:]):
+        differing = {row for row, (a, b) in enumerate(zip(previous.lines, current.lines)) if a != b}
+        assert differing == set(current.changed_rows)
+
+
+def test_play_redraws_only_changed_rows(tmp_path: Path) -> None:
+    pipeline = _build_pipeline(tmp_path)
+    stream = StringIO()
+    artifacts = play(Path("samples/sample_frame.json"), config=pipeline.config, frame_delay=0, stream=stream)
+    output = stream.getvalue()
+    assert output.count("\x1b[2J") == 1
+    assert len(output) < len(artifacts.overlay) * len(artifacts.simulation.path)
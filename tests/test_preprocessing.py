@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import math
+
+from edge_skate.preprocessing import _gaussian_kernel, preprocess_frame
+
+
+def _two_pass_reference(frame: list[list[float]], resolution: tuple[int, int], sigma: float) -> list[list[float]]:
+    low = min(min(row) for row in frame)
+    span = max(max(row) for row in frame) - low
+    normalized = [[(value - low) / span for value in row] for row in frame]
+    height, width = resolution
+    resized = [
+        [
+            normalized[min(len(frame) - 1, int(y * len(frame) / height))][
+                min(len(frame[0]) - 1, int(x * len(frame[0]) / width))
+            ]
+            for x in range(width)
+        ]
+        for y in range(height)
+    ]
+    kernel = _gaussian_kernel(sigma)
+    radius = len(kernel) // 2
+
+    def convolve(image: list[list[float]], axis: int) -> list[list[float]]:
+        result = []
+        for y in range(height):
+            row = []
+            for x in range(width):
+                accum = 0.0
+                for k, weight in enumerate(kernel):
+                    if axis == 0:
+                        accum += image[min(height - 1, max(0, y + k - radius))][x] * weight
+                    else:
+                        accum += image[y][min(width - 1, max(0, x + k - radius))] * weight
+                row.append(accum)
+            result.append(row)
+        return result
+
+    return convolve(convolve(resized, 0), 1)
+
+
+def test_fused_preprocessing_matches_two_pass_pipeline() -> None:
+    frame = [[math.sin(x * 0.4) + math.cos(y * 0.3) * 3 for x in range(45)] for y in range(33)]
+    for resolution in ((16, 16), (40, 9), (50, 60)):
+        fused = preprocess_frame(frame, target_resolution=resolution, denoise_strength=0.6)
+        assert fused == _two_pass_reference(frame, resolution, 1.2)
+
+
+def test_area_resampling_averages_source_blocks() -> None:
+    frame = [[float((x // 2 + y // 2) % 2) for x in range(8)] for y in range(8)]
+    frame[0][0] = 0.5
+    resized = preprocess_frame(frame, target_resolution=(4, 4), denoise_strength=0.0, resample="area")
+    assert resized[0][0] == 0.125
+    assert resized[1] == [1.0, 0.0, 1.0, 0.0]
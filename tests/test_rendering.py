@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import random
+
+from edge_skate.rendering import ASCII_MAP, GlyphRenderer, render_overlay
+
+
+def _reference_glyph(value: float) -> str:
+    clamped = max(0.0, min(1.0, value))
+    return ASCII_MAP[min(int(clamped * (len(ASCII_MAP) - 1)), len(ASCII_MAP) - 1)]
+
+
+def test_lookup_table_matches_direct_quantization() -> None:
+    rng = random.Random(5)
+    row = [rng.uniform(-0.2, 1.2) for _ in range(5000)] + [k / 9 for k in range(10)]
+    assert render_overlay([row], []) == "".join(_reference_glyph(value) for value in row)
+
+
+def test_background_rows_are_cached_per_frame() -> None:
+    renderer = GlyphRenderer()
+    frame = [[0.0, 0.5, 1.0], [1.0, 0.5, 0.0]]
+    first = renderer.background(frame)
+    assert renderer.background(frame) is first
+    assert renderer.background([list(row) for row in frame]) == first
+
+
+def test_overlay_downsamples_to_max_width() -> None:
+    frame = [[(x + y) / 20 for x in range(10)] for y in range(10)]
+    overlay = render_overlay(frame, [(9.0, 9.0)], max_width=4).split("\n")
+    assert [len(line) for line in overlay] == [4, 4, 4, 4]
+    assert overlay[3][3] == "S"
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from edge_skate.pipeline import PipelineConfig
+from edge_skate import service as service_module
+from edge_skate.service import PipelineService
+
+SAMPLE = "samples/sample_frame.json"
+
+
+def test_service_runs_jobs_concurrently_on_warm_pipelines(tmp_path: Path) -> None:
+    config = PipelineConfig(target_resolution=(16, 16), output_dir=tmp_path)
+    requests = [
+        {"id": "a", "source": SAMPLE, "name": "a"},
+        {"id": "b", "source": SAMPLE, "name": "b", "config": {"edge_mode": "canny"}},
+        {"id": "c", "source": SAMPLE, "name": "c"},
+        {"id": "d", "source": "missing.json"},
+        {"id": "e", "source": SAMPLE, "config": {"edge_mode": "laplace"}},
+    ]
+
+    async def scenario(service: PipelineService) -> list:
+        jobs = [asyncio.ensure_future(service.run_job(request)) for request in requests]
+        await asyncio.sleep(0)
+        depth = service.stats()["queue_depth"]
+        return [depth, *await asyncio.gather(*jobs)]
+
+    with PipelineService(config) as service:
+        depth, *responses = asyncio.run(scenario(service))
+        stats = service.stats()
+        assert service._warm is not None
+        warm = list(service._warm.pipelines)
+    assert depth == 3
+    assert [response["id"] for response in responses] == ["a", "b", "c", "d", "e"]
+    assert [response["ok"] for response in responses] == [True, True, True, False, False]
+    assert Path(responses[0]["output"]) == tmp_path / "a"
+    assert (tmp_path / "b").is_dir()
+    assert "edge mode" in responses[4]["error"]
+    assert all(response["latency"] >= response["run"] > 0 for response in responses[:4])
+    assert len(warm) == 2
+    assert stats["completed"] == 3 and stats["failed"] == 2
+    assert stats["queue_depth"] == 0 and stats["latency"]["count"] == 4
+
+
+def test_serve_subcommand_speaks_json_lines(tmp_path: Path) -> None:
+    lines = [
+        json.dumps({"id": 1, "source": SAMPLE, "name": "first"}),
+        "not json",
+        json.dumps({"id": 2, "source": SAMPLE, "name": "second"}),
+        "",
+    ]
+    completed = subprocess.run(
+        [sys.executable, "-m", "edge_skate.cli", "serve", "--output", str(tmp_path), "--resolution", "16", "16"],
+        input="\n".join(lines) + "\n",
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=True,
+    )
+    responses = [json.loads(line) for line in completed.stdout.splitlines()]
+    assert sorted(str(response["id"]) for response in responses) == ["1", "2", "None"]
+    assert sum(response["ok"] for response in responses) == 2
+    assert (tmp_path / "first").is_dir() and (tmp_path / "second").is_dir()
+
+
+def test_service_rejects_client_chosen_paths(tmp_path: Path) -> None:
+    elsewhere = tmp_path / "elsewhere"
+    victim = elsewhere / "victim"
+    victim.mkdir(parents=True)
+    (victim / "keep.txt").write_text("precious", encoding="utf-8")
+    config = PipelineConfig(target_resolution=(16, 16), output_dir=tmp_path / "out")
+    requests = [
+        {"source": SAMPLE, "name": "victim", "config": {"output_dir": str(elsewhere)}},
+        {"source": SAMPLE, "config": {"cache_dir": str(elsewhere)}},
+        {"source": SAMPLE, "config": {"cprofile_output": str(victim / "x.prof")}},
+        {"source": SAMPLE, "name": "../elsewhere/victim"},
+        {"source": SAMPLE, "name": "nested/victim"},
+        {"source": SAMPLE, "name": "..\\victim"},
+        {"source": SAMPLE, "name": ".hidden"},
+    ]
+
+    async def scenario(service: PipelineService) -> list:
+        return [await service.run_job(request) for request in requests]
+
+    with PipelineService(config) as service:
+        responses = asyncio.run(scenario(service))
+    assert not any(response["ok"] for response in responses)
+    assert all("cannot be overridden" in response["error"] for response in responses[:3])
+    assert all("Invalid session name" in response["error"] for response in responses[3:])
+    assert (victim / "keep.txt").read_text(encoding="utf-8") == "precious"
+    assert not (tmp_path / "out").exists() or not any((tmp_path / "out").iterdir())
+
+
+def test_warm_pipelines_close_evicted_pipelines_and_use_threads_in_workers(tmp_path: Path) -> None:
+    config = PipelineConfig(target_resolution=(16, 16), output_dir=tmp_path)
+    warm = service_module._WarmPipelines(config, 1)
+    first = warm.get(json.dumps({"edge_workers": 2}))
+    first._tile_pool()
+    warm.get(json.dumps({"edge_workers": 3}))
+    assert first._tile_executor is None and len(warm.pipelines) == 1
+    warm.close()
+    assert not warm.pipelines
+    service_module._init_worker(config, 2)
+    try:
+        worker_pipeline = service_module._WORKER_PIPELINES.get(json.dumps({"edge_workers": 2}))
+        assert worker_pipeline._tile_pool_kind == "thread"
+    finally:
+        service_module._WORKER_PIPELINES.close()
+        service_module._WORKER_PIPELINES = None
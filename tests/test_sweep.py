@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from edge_skate.cli import main
+from edge_skate.media import write_raw_frame
+from edge_skate.pipeline import EdgeSkatePipeline, PipelineConfig
+from edge_skate.sweep import parse_values, run_sweep
+
+
+def test_parse_values_accepts_lists_and_inclusive_ranges() -> None:
+    assert parse_values("0.1,0.3") == [0.1, 0.3]
+    assert parse_values("0.1:0.4:0.1") == [0.1, 0.2, 0.3, 0.4]
+    with pytest.raises(ValueError):
+        parse_values("0.4:0.1:0.1")
+
+
+def test_sweep_matches_individual_runs(tmp_path: Path) -> None:
+    sample = Path("samples/sample_frame.json")
+    broken = tmp_path / "broken.json"
+    broken.write_text("[]", encoding="utf-8")
+    base = PipelineConfig(target_resolution=(16, 16), output_dir=tmp_path)
+    grid = {"denoise_strength": [0.0, 0.3], "edge_threshold": [0.1, 0.3], "smoothing_factor": [0.2, 0.6]}
+    results = run_sweep([sample, broken], grid, config=base)
+    assert len(results) == 16
+    assert all(result.error for result in results[8:])
+    for result in results[:8]:
+        config = PipelineConfig(target_resolution=(16, 16), output_dir=tmp_path, **result.params)
+        course = EdgeSkatePipeline(config).create_session(sample).course
+        assert result.course_length == pytest.approx(course.length())
+        assert result.course_points == len(course.points)
+        assert result.component_size > 0
+        assert result.runtime > 0
+
+
+def test_parallel_sweep_loads_binary_sources_in_workers(tmp_path: Path) -> None:
+    sample = Path("samples/sample_frame.json")
+    raw = tmp_path / "frame.raw"
+    write_raw_frame(raw, json.loads(sample.read_text(encoding="utf-8")))
+    base = PipelineConfig(target_resolution=(16, 16), output_dir=tmp_path)
+    grid = {"denoise_strength": [0.0, 0.3], "edge_threshold": [0.2, 0.3]}
+    parallel = run_sweep([raw, tmp_path / "missing.raw"], grid, config=base, workers=2)
+    serial = run_sweep([sample], grid, config=base)
+    assert [result.course_length for result in parallel[:4]] == [result.course_length for result in serial]
+    assert all(result.error is None for result in parallel[:4])
+    assert all(result.error for result in parallel[4:])
+
+
+def test_cli_dispatches_sweep_subcommand(tmp_path: Path, capsys) -> None:
+    argv = ["sweep", "samples/sample_frame.json", "--resolution", "16", "16", "--threshold", "0.2,0.3"]
+    assert main(argv + ["--output", str(tmp_path), "--workers", "2"]) == 0
+    assert len((tmp_path / "sweep.csv").read_text(encoding="utf-8").splitlines()) == 3
+    assert "sample_frame.json" in capsys.readouterr().out
+
+
+def test_cli_runs_a_source_named_like_a_subcommand_after_separator(tmp_path: Path, monkeypatch) -> None:
+    shutil.copy("samples/sample_frame.json", tmp_path / "sweep")
+    monkeypatch.chdir(tmp_path)
+    assert main(["--", "sweep"]) == 0
+    assert (tmp_path / "output" / "session_00").is_dir()
+    assert not (tmp_path / "output" / "sweep.csv").exists()
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import math
+from pathlib import Path
+
+import pytest
+
+from edge_skate.edge_detection import detect_edges, detect_edges_canny
+from edge_skate.media import MediaLoader
+from edge_skate.pipeline import EdgeSkatePipeline, PipelineConfig
+from edge_skate.preprocessing import _area_bands, preprocess_frame
+
+np = pytest.importorskip("numpy")
+
+from edge_skate import vectorized  # noqa: E402
+
+
+def _wave_frame(height: int, width: int) -> list[list[float]]:
+    return [
+        [math.sin(x * 0.3) * math.cos(y * 0.2) * 40 + x * 0.5 for x in range(width)]
+        for y in range(height)
+    ]
+
+
+@pytest.mark.parametrize(
+    ("frame", "resolution"),
+    [
+        (MediaLoader().load_frame(Path("samples/sample_frame.json")), (16, 16)),
+        (_wave_frame(37, 53), (24, 20)),
+    ],
+)
+def test_vectorized_edges_match_reference(frame: list[list[float]], resolution: tuple[int, int]) -> None:
+    for denoise in (0.0, 0.3):
+        processed = preprocess_frame(frame, target_resolution=resolution, denoise_strength=denoise)
+        fast_processed = vectorized.preprocess_frame(
+            frame, target_resolution=resolution, denoise_strength=denoise
+        )
+        assert fast_processed.dtype == np.float32
+        assert np.allclose(fast_processed, processed, atol=1e-5)
+        for threshold in (0.2, 0.35):
+            expected = detect_edges(processed, threshold=threshold)
+            assert vectorized.detect_edges(fast_processed, threshold=threshold).tolist() == expected
+
+
+def test_pipeline_numpy_backend_matches_python(tmp_path: Path) -> None:
+    source = Path("samples/sample_frame.json")
+    base = dict(target_resolution=(16, 16), denoise_strength=0.2, edge_threshold=0.2, output_dir=tmp_path)
+    reference = EdgeSkatePipeline(PipelineConfig(**base)).create_session(source)
+    fast = EdgeSkatePipeline(PipelineConfig(backend="numpy", **base)).create_session(source)
+    assert fast.edge_map == reference.edge_map
+
+
+def test_vectorized_area_resampling_matches_reference() -> None:
+    frame = _wave_frame(41, 67)
+    for resolution in ((16, 16), (10, 25), (50, 70), (30, 11), (26, 23), (41, 66)):
+        expected = preprocess_frame(frame, target_resolution=resolution, denoise_strength=0.2, resample="area")
+        actual = vectorized.preprocess_frame(
+            frame, target_resolution=resolution, denoise_strength=0.2, resample="area"
+        )
+        assert np.allclose(actual, expected, atol=1e-5)
+
+
+@pytest.mark.parametrize(("src", "target"), [(15, 11), (26, 23), (30, 11), (49, 22), (7, 3), (5, 9)])
+def test_area_bands_cover_every_source_row(src: int, target: int) -> None:
+    frame = [[float(y * src + x) for x in range(src)] for y in range(src)]
+    expected = preprocess_frame(frame, target_resolution=(target, target), denoise_strength=0.0, resample="area")
+    actual = vectorized.preprocess_frame(
+        frame, target_resolution=(target, target), denoise_strength=0.0, resample="area"
+    )
+    assert np.allclose(actual, expected, atol=1e-5)
+    bands = _area_bands(src, target)
+    assert bands[0][0] == 0 and bands[-1][1] == src
+    if src >= target:
+        assert all(stop == start for (_, stop), (start, _) in zip(bands, bands[1:]))
+
+
+def test_vectorized_canny_matches_reference() -> None:
+    frame = MediaLoader().load_frame(Path("samples/sample_frame.json"))
+    processed = preprocess_frame(frame, target_resolution=(32, 32), denoise_strength=0.25)
+    expected = detect_edges_canny(processed)
+    fast = vectorized.detect_edges_canny(vectorized.as_array(processed))
+    assert fast.dtype == np.float32
+    assert fast.tolist() == expected